@@ -4,7 +4,12 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
 import gspread
-from google.oauth2.service_account import Credentials
+
+from beevent.connection import authorize
+from beevent.revenue_cube import add_margin_columns
+from beevent.tenants import TenantRegistry, tenants_from_config
+
+from beevent_app.auth import user_tenants
 
 # Page config
 st.set_page_config(
@@ -33,96 +38,100 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==================== GOOGLE SHEETS CONNECTION ====================
+# Spreadsheet báo cáo khi secrets chưa khai báo [dashboard_tenants] (mỗi chi nhánh một spreadsheet)
 SHEET_ID = "1xSvsEPHV1MzHa9UumzJtyzAY4LXaiSVKb8tmMcUZPeM"
+ALL_BRANCHES = "__all__"
+BRANCH_FETCH_TIMEOUT = 20  # giây chờ tối đa mỗi lượt đọc các chi nhánh
+
+DASHBOARD_SHEETS = ['revenue_monthly', 'sales_pipeline', 'projects', 'sales_performance']
+REVENUE_COLUMNS = ['Tháng', 'Nội bộ', 'Gov-Hiệp hội', 'Corporate', 'Tổng doanh thu', 'COGS', 'Lãi gộp', 'Tỷ lệ lãi gộp (%)', 'Chi phí gián tiếp', 'Lợi nhuận ròng', 'Tỷ lệ lợi nhuận (%)']
+RATIO_COLUMNS = ['Tỷ lệ lãi gộp (%)', 'Tỷ lệ lợi nhuận (%)']
+
+def authorize_client(tenant):
+    """Client gspread của chi nhánh trên kết nối dùng chung của service account `credentials`"""
+    return authorize(st.secrets[tenant.credentials], rate_limits=st.secrets.get("rate_limits"))
 
 @st.cache_resource
 def init_gsheet_connection():
-    """Initialize Google Sheets connection"""
+    """Initialize Google Sheets connection (registry các chi nhánh, client mở khi đọc lần đầu)"""
     try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        
-        scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            credentials_dict,
-            scopes=scopes
-        )
-        
-        client = gspread.authorize(credentials)
-        return client
+        tenants = tenants_from_config(st.secrets, section="dashboard_tenants",
+                                      default={"spreadsheet_key": st.secrets.get("dashboard_spreadsheet_key", SHEET_ID)})
+        return TenantRegistry(tenants, authorize_client)
     except Exception as e:
         st.error(f"❌ Lỗi kết nối Google Sheets: {str(e)}")
         return None
 
-@st.cache_data(ttl=60)
-def load_data_from_sheets(_client):
-    """Load all data from Google Sheets"""
-    try:
-        spreadsheet = _client.open_by_key(SHEET_ID)
-        
-        # ✅ LOAD REVENUE DATA
-        try:
-            revenue_sheet = spreadsheet.worksheet('revenue_monthly')
-            revenue_records = revenue_sheet.get_all_records()
-            if revenue_records:
-                revenue_data = pd.DataFrame(revenue_records)
-                revenue_data['Tháng'] = pd.to_datetime(revenue_data['Tháng'])
-                
-                # Kiểm tra và tính toán các cột nếu chưa có
-                if 'Tổng doanh thu' not in revenue_data.columns:
-                    revenue_data['Tổng doanh thu'] = revenue_data['Nội bộ'] + revenue_data['Gov-Hiệp hội'] + revenue_data['Corporate']
-                
-                if 'COGS' not in revenue_data.columns:
-                    revenue_data['COGS'] = revenue_data['Tổng doanh thu'] * 0.826
-                
-                if 'Lãi gộp' not in revenue_data.columns:
-                    revenue_data['Lãi gộp'] = revenue_data['Tổng doanh thu'] - revenue_data['COGS']
-                
-                if 'Tỷ lệ lãi gộp (%)' not in revenue_data.columns:
-                    revenue_data['Tỷ lệ lãi gộp (%)'] = (revenue_data['Lãi gộp'] / revenue_data['Tổng doanh thu'] * 100).fillna(0)
-                
-                if 'Chi phí gián tiếp' not in revenue_data.columns:
-                    revenue_data['Chi phí gián tiếp'] = revenue_data['Lãi gộp'] * 0.95
-                
-                if 'Lợi nhuận ròng' not in revenue_data.columns:
-                    revenue_data['Lợi nhuận ròng'] = revenue_data['Lãi gộp'] - revenue_data['Chi phí gián tiếp']
-                
-                if 'Tỷ lệ lợi nhuận (%)' not in revenue_data.columns:
-                    revenue_data['Tỷ lệ lợi nhuận (%)'] = (revenue_data['Lợi nhuận ròng'] / revenue_data['Tổng doanh thu'] * 100).fillna(0)
-            else:
-                revenue_data = pd.DataFrame(columns=['Tháng', 'Nội bộ', 'Gov-Hiệp hội', 'Corporate', 'Tổng doanh thu', 'COGS', 'Lãi gộp', 'Tỷ lệ lãi gộp (%)', 'Chi phí gián tiếp', 'Lợi nhuận ròng', 'Tỷ lệ lợi nhuận (%)'])
-        except Exception as e:
-            st.warning(f"⚠️ Lỗi load revenue: {str(e)}")
-            revenue_data = pd.DataFrame(columns=['Tháng', 'Nội bộ', 'Gov-Hiệp hội', 'Corporate', 'Tổng doanh thu', 'COGS', 'Lãi gộp', 'Tỷ lệ lãi gộp (%)', 'Chi phí gián tiếp', 'Lợi nhuận ròng', 'Tỷ lệ lợi nhuận (%)'])
-        
-        # Load pipeline data
+def read_dashboard_records(registry, tenant_id):
+    """Records các sheet dashboard của một chi nhánh (sheet chưa có thì rỗng)"""
+    records = {}
+    for name in DASHBOARD_SHEETS:
         try:
-            pipeline_sheet = spreadsheet.worksheet('sales_pipeline')
-            pipeline_records = pipeline_sheet.get_all_records()
-            pipeline_data = pd.DataFrame(pipeline_records) if pipeline_records else pd.DataFrame(columns=['Stage', 'Count', 'Value'])
-        except:
-            pipeline_data = pd.DataFrame(columns=['Stage', 'Count', 'Value'])
-        
-        # Load projects data
-        try:
-            projects_sheet = spreadsheet.worksheet('projects')
-            projects_records = projects_sheet.get_all_records()
-            projects = pd.DataFrame(projects_records) if projects_records else pd.DataFrame(columns=['Dự án', 'Doanh thu', 'Lợi nhuận %', 'Khách', 'Loại', 'CSAT'])
-        except:
-            projects = pd.DataFrame(columns=['Dự án', 'Doanh thu', 'Lợi nhuận %', 'Khách', 'Loại', 'CSAT'])
-        
-        # Load sales performance
-        try:
-            sales_sheet = spreadsheet.worksheet('sales_performance')
-            sales_records = sales_sheet.get_all_records()
-            sales_perf = pd.DataFrame(sales_records) if sales_records else pd.DataFrame(columns=['Nhân viên', 'Doanh thu', 'Số deal', 'Conversion %', 'Kênh'])
-        except:
-            sales_perf = pd.DataFrame(columns=['Nhân viên', 'Doanh thu', 'Số deal', 'Conversion %', 'Kênh'])
-        
-        return revenue_data, pipeline_data, projects, sales_perf
+            records[name] = registry.worksheet(tenant_id, name).get_all_records()
+        except gspread.exceptions.WorksheetNotFound:
+            records[name] = []
+    return records
+
+def build_dashboard_frames(branch_records):
+    """DataFrame các dashboard từ records của một hoặc nhiều chi nhánh ({tên chi nhánh: records})"""
+    combined = len(branch_records) > 1
+    
+    def rows(name):
+        return [{**r, 'Chi nhánh': branch} if combined else r
+                for branch, records in branch_records.items() for r in records[name]]
+    
+    # ✅ LOAD REVENUE DATA
+    try:
+        revenue_records = rows('revenue_monthly')
+        if revenue_records:
+            revenue_data = pd.DataFrame(revenue_records)
+            revenue_data['Tháng'] = pd.to_datetime(revenue_data['Tháng'])
+            if combined:
+                # Cộng số tiền các chi nhánh theo tháng; tỷ lệ tính lại trên tổng
+                revenue_data = (revenue_data.drop(columns=[c for c in RATIO_COLUMNS if c in revenue_data.columns])
+                                .groupby('Tháng', as_index=False).sum(numeric_only=True))
+            
+            # Tính các cột COGS/lãi gộp/lợi nhuận còn thiếu trong một lượt
+            revenue_data = add_margin_columns(revenue_data)
+        else:
+            revenue_data = pd.DataFrame(columns=REVENUE_COLUMNS)
+    except Exception as e:
+        st.warning(f"⚠️ Lỗi load revenue: {str(e)}")
+        revenue_data = pd.DataFrame(columns=REVENUE_COLUMNS)
+    
+    # Load pipeline data
+    try:
+        pipeline_records = rows('sales_pipeline')
+        pipeline_data = pd.DataFrame(pipeline_records) if pipeline_records else pd.DataFrame(columns=['Stage', 'Count', 'Value'])
+        if combined and len(pipeline_data) > 0:
+            pipeline_data = pipeline_data.groupby('Stage', as_index=False, sort=False).sum(numeric_only=True)
+    except:
+        pipeline_data = pd.DataFrame(columns=['Stage', 'Count', 'Value'])
+    
+    # Load projects data
+    projects_records = rows('projects')
+    projects = pd.DataFrame(projects_records) if projects_records else pd.DataFrame(columns=['Dự án', 'Doanh thu', 'Lợi nhuận %', 'Khách', 'Loại', 'CSAT'])
+    
+    # Load sales performance
+    sales_records = rows('sales_performance')
+    sales_perf = pd.DataFrame(sales_records) if sales_records else pd.DataFrame(columns=['Nhân viên', 'Doanh thu', 'Số deal', 'Conversion %', 'Kênh'])
+    
+    return revenue_data, pipeline_data, projects, sales_perf
+
+def load_data_from_sheets(registry, tenant_ids):
+    """
+    Load all data from Google Sheets: các chi nhánh đọc song song (giữ 60s); chi nhánh lỗi
+    quota/quá hạn không làm chậm chi nhánh khác và dùng dữ liệu lần trước nếu có.
+    """
+    try:
+        records, errors = registry.gather("dashboard", lambda tenant_id: read_dashboard_records(registry, tenant_id),
+                                          tenant_ids, max_age=60, timeout=BRANCH_FETCH_TIMEOUT)
+        for tenant_id, error in errors.items():
+            stale = " (đang hiển thị dữ liệu lần trước)" if tenant_id in records else ""
+            st.warning(f"⚠️ {registry.get(tenant_id).name}: {str(error)}{stale}")
+        if not records:
+            raise next(iter(errors.values()))
+        return build_dashboard_frames({registry.get(t).name: records[t] for t in tenant_ids if t in records})
     
     except Exception as e:
         st.error(f"❌ Lỗi load dữ liệu: {str(e)}")
@@ -135,11 +144,19 @@ st.sidebar.title("📊 BEEVENT DASHBOARD")
 st.sidebar.markdown("---")
 
 # Connect to Google Sheets
-client = init_gsheet_connection()
+registry = init_gsheet_connection()
 
-if client:
+if registry:
+    # Chi nhánh người dùng được xem: xem riêng một chi nhánh hoặc tổng hợp tất cả
+    tenant_ids = [t.id for t in user_tenants(registry)]
+    if len(tenant_ids) > 1:
+        branch = st.sidebar.selectbox("🏢 Chi nhánh:", [ALL_BRANCHES] + tenant_ids,
+                                      format_func=lambda t: "🌐 Tất cả chi nhánh" if t == ALL_BRANCHES else registry.get(t).name)
+        if branch != ALL_BRANCHES:
+            tenant_ids = [branch]
+    
     with st.spinner("⏳ Đang tải dữ liệu từ Google Sheets..."):
-        revenue_data, pipeline_data, projects, sales_perf = load_data_from_sheets(client)
+        revenue_data, pipeline_data, projects, sales_perf = load_data_from_sheets(registry, tenant_ids)
     
     if revenue_data is not None:
         st.sidebar.success("✅ Kết nối Google Sheets thành công!")
@@ -147,6 +164,7 @@ if client:
         # Refresh button
         if st.sidebar.button("🔄 Làm mới dữ liệu"):
             st.cache_data.clear()
+            registry.forget()
             st.rerun()
         
         st.sidebar.markdown("---")
@@ -4,10 +4,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import numpy as np
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import json
 
+from beevent.connection import authorize
+
 # ==================== CONFIG ====================
 st.set_page_config(
     page_title="Beevent Management System",
@@ -76,13 +76,7 @@ st.markdown("""
 def init_google_sheets():
     """Kết nối Google Sheets"""
     try:
-        creds_dict = st.secrets["gcp_service_account"]
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
+        client = authorize(st.secrets["gcp_service_account"], rate_limits=st.secrets.get("rate_limits"))
         spreadsheet_url = st.secrets.get("spreadsheet_url", None)
         
         if spreadsheet_url:
@@ -331,7 +325,7 @@ elif page == "📝 Quản lý Dự án":
             st.markdown(f"**Tìm thấy {len(filtered_df)} dự án**")
             st.dataframe(filtered_df, hide_index=True, use_container_width=True, height=400)
             
-            if st.button("📥 Xuất Excel"):
+            if st.button("📥 Xuất CSV"):
                 csv = filtered_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     "⬇️ Tải file",
@@ -705,7 +699,7 @@ elif page == "👨‍💼 Quản lý Nhân sự":
             st.markdown(f"**Tìm thấy {len(filtered_df)} nhân sự**")
             st.dataframe(filtered_df, hide_index=True, use_container_width=True, height=400)
             
-            if st.button("📥 Xuất Excel"):
+            if st.button("📥 Xuất CSV"):
                 csv = filtered_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     "⬇️ Tải file",
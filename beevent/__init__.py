@@ -0,0 +1,3 @@
+"""
+Beevent - các module xử lý dữ liệu dùng chung cho app Streamlit
+"""
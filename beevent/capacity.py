@@ -0,0 +1,79 @@
+"""
+Tải công việc của nhân sự theo ngày, tính bằng sweep-line trên Timeline.
+
+Mỗi task sinh hai sự kiện: +1 tại ngày bắt đầu và -1 sau ngày kết thúc của người
+phụ trách. Cộng dồn (cumsum) theo trục ngày cho ra số task đồng thời, nên chi phí
+là O(số task + số người x số ngày) thay vì bung từng ngày của từng task.
+"""
+import numpy as np
+import pandas as pd
+
+
+def staff_names(members_df, staff_df):
+    """Danh sách người từ Members ('Họ và tên') và Staff ('Họ tên'), bỏ trùng, giữ thứ tự"""
+    names = []
+    if len(members_df) > 0 and 'Họ và tên' in members_df.columns:
+        names += members_df['Họ và tên'].astype(str).tolist()
+    if len(staff_df) > 0 and 'Họ tên' in staff_df.columns:
+        names += staff_df['Họ tên'].astype(str).tolist()
+    return [n for n in dict.fromkeys(n.strip() for n in names) if n]
+
+
+def daily_load(timeline_df, start, end, people=None, include_done=False):
+    """
+    Số task đồng thời của mỗi người theo từng ngày trong [start, end].
+    Trả về DataFrame: index = người phụ trách, columns = ngày.
+    Người có task nhưng không có trong `people` được thêm vào cuối.
+    """
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    days = pd.date_range(start, end, freq='D')
+    n_days = len(days)
+    people = list(people or [])
+
+    if len(timeline_df) == 0 or n_days == 0:
+        return pd.DataFrame(0, index=pd.Index(people, name='Phụ trách'), columns=days)
+
+    tasks = timeline_df
+    if not include_done and 'Trạng thái' in tasks.columns:
+        tasks = tasks[tasks['Trạng thái'] != 'Hoàn thành']
+
+    person = tasks['Phụ trách'].astype(str).str.strip()
+    task_start = pd.to_datetime(tasks['Ngày bắt đầu'], errors='coerce')
+    task_end = pd.to_datetime(tasks['Ngày kết thúc'], errors='coerce')
+
+    # Offset theo ngày, cắt vào cửa sổ; sự kiện kết thúc nằm ở ngày sau ngày cuối
+    start_off = (task_start - start).dt.days.clip(0, n_days)
+    end_off = ((task_end - start).dt.days + 1).clip(0, n_days)
+    valid = task_start.notna() & task_end.notna() & (person != '') & (start_off < end_off)
+
+    person = person[valid]
+    people = people + [p for p in person.unique() if p not in set(people)]
+    rows = pd.Index(people).get_indexer(person)
+
+    width = n_days + 1
+    size = len(people) * width
+    starts = rows * width + start_off[valid].to_numpy(dtype=np.int64)
+    ends = rows * width + end_off[valid].to_numpy(dtype=np.int64)
+    events = np.bincount(starts, minlength=size) - np.bincount(ends, minlength=size)
+    load = events.reshape(len(people), width)[:, :-1].cumsum(axis=1)
+
+    return pd.DataFrame(load, index=pd.Index(people, name='Phụ trách'), columns=days)
+
+
+def overload_alerts(load_df, capacity):
+    """Người có ngày vượt `capacity` task: số ngày quá tải, đỉnh tải và ngày quá tải đầu tiên"""
+    load = load_df.to_numpy()
+    over = load > capacity
+    has_over = over.any(axis=1)
+    if not has_over.any():
+        return pd.DataFrame(columns=['Phụ trách', 'Số ngày quá tải', 'Tải đỉnh', 'Quá tải từ'])
+
+    first_day = load_df.columns[over.argmax(axis=1)]
+    alerts = pd.DataFrame({
+        'Phụ trách': load_df.index,
+        'Số ngày quá tải': over.sum(axis=1),
+        'Tải đỉnh': load.max(axis=1),
+        'Quá tải từ': first_day,
+    })[has_over]
+    return alerts.sort_values(['Số ngày quá tải', 'Tải đỉnh'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,56 @@
+"""
+Đồ thị tính toán lười cho dashboard.
+
+Mỗi node là một hàm nhận giá trị của các node phụ thuộc. Node chỉ được tính khi
+có dashboard yêu cầu (trực tiếp hoặc qua node khác) và được memo trong đồ thị, nên
+node dùng chung (vd. cube) chỉ tính một lần và node không ai cần thì không chạy.
+"""
+
+
+class ComputeGraph:
+    """Các node khai báo phụ thuộc, tính theo yêu cầu và memo kết quả"""
+
+    def __init__(self):
+        self._nodes = {}
+        self._values = {}
+        self._resolving = set()
+        self.computed = []   # thứ tự các node đã tính, phục vụ kiểm tra/debug
+
+    def add(self, name, func, deps=()):
+        """Khai báo node `name` = func(*giá trị các deps)"""
+        if name in self._nodes:
+            raise ValueError(f"Node '{name}' đã tồn tại")
+        self._nodes[name] = (func, tuple(deps))
+        return self
+
+    def node(self, name, deps=()):
+        """Decorator tương đương add()"""
+        def register(func):
+            self.add(name, func, deps)
+            return func
+        return register
+
+    def get(self, name):
+        """Giá trị của node, tính (cùng các phụ thuộc) nếu chưa có"""
+        if name in self._values:
+            return self._values[name]
+        if name not in self._nodes:
+            raise KeyError(f"Không có node '{name}'")
+        if name in self._resolving:
+            raise ValueError(f"Phụ thuộc vòng tại node '{name}'")
+
+        func, deps = self._nodes[name]
+        self._resolving.add(name)
+        try:
+            value = func(*(self.get(dep) for dep in deps))
+        finally:
+            self._resolving.discard(name)
+        self._values[name] = value
+        self.computed.append(name)
+        return value
+
+    __getitem__ = get
+
+    def resolve(self, names):
+        """Dict {tên: giá trị} cho các node được yêu cầu"""
+        return {name: self.get(name) for name in names}
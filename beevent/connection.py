@@ -0,0 +1,158 @@
+"""
+Kết nối Google API dùng chung trong process: mỗi service account một credential
+google-auth và một requests session (keep-alive, giữ sẵn pool kết nối).
+
+Mọi client gspread (app.py, app2.py, trang Nhập liệu, data_entry.py và các chi nhánh
+cùng service account) đi qua session này, nên chỉ có một token cần làm mới và các kết
+nối TLS được dùng lại giữa các lệnh. Worker nền làm mới token trước khi hết hạn
+REFRESH_MARGIN giây (sớm hơn ngưỡng tự làm mới của AuthorizedSession), nên lệnh gọi API
+khi render trang không phải chờ đổi token.
+
+Mỗi kết nối có một RateLimiter (beevent.rate_limit): lệnh gọi Sheets API lấy token đọc/ghi
+trước khi gửi, gặp 429 thì chờ theo backoff rồi gửi lại. Giới hạn đặt trong secrets:
+
+    [rate_limits]
+    read_per_minute = 60
+    write_per_minute = 60
+"""
+import threading
+from datetime import datetime, timezone
+
+import gspread
+import requests
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+from requests.adapters import HTTPAdapter
+
+from beevent.rate_limit import READ, WRITE, RateLimiter
+from beevent.write_queue import is_quota_error
+
+SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive',
+)
+REFRESH_MARGIN = 300.0   # giây trước khi token hết hạn thì làm mới
+RETRY_DELAY = 30.0       # làm mới lỗi (mạng) thì thử lại sau
+POOL_SIZE = 32           # kết nối giữ lại cho mỗi host, đủ cho đọc song song các chi nhánh
+SHEETS_HOST = 'sheets.googleapis.com'
+RATE_LIMIT_FIELDS = ('read_per_minute', 'write_per_minute', 'reserve')
+
+
+class RateLimitedHTTPClient(HTTPClient):
+    """HTTPClient của gspread: lệnh Sheets API lấy token của limiter trước khi gửi, 429 thì chờ rồi gửi lại"""
+
+    def __init__(self, auth, session, limiter):
+        super().__init__(auth, session=session)
+        self.limiter = limiter
+
+    def request(self, method, endpoint, *args, **kwargs):
+        if SHEETS_HOST not in endpoint:
+            # Drive API (mở theo tên, modifiedTime) có quota riêng
+            return super().request(method, endpoint, *args, **kwargs)
+        kind = READ if method.upper() == 'GET' else WRITE
+        attempt = 0
+        while True:
+            self.limiter.acquire(kind)
+            try:
+                return super().request(method, endpoint, *args, **kwargs)
+            except APIError as error:
+                if not is_quota_error(error) or attempt >= self.limiter.max_retries:
+                    raise
+                # Bucket bị chặn theo backoff: lần acquire sau chờ hết thời gian đó
+                self.limiter.backoff(kind, attempt)
+                attempt += 1
+
+
+class GoogleConnection:
+    """Credential và session dùng chung của một service account, token được làm mới nền"""
+
+    def __init__(self, service_account_info, scopes=SCOPES, pool_size=POOL_SIZE, refresh_margin=REFRESH_MARGIN,
+                 rate_limits=None):
+        self.service_account = service_account_info.get('client_email', '')
+        self.credentials = Credentials.from_service_account_info(dict(service_account_info), scopes=list(scopes))
+        self.limiter = RateLimiter(**{k: v for k, v in dict(rate_limits or {}).items() if k in RATE_LIMIT_FIELDS})
+        self.refresh_margin = refresh_margin
+        self.session = AuthorizedSession(self.credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        # Lệnh đổi token đi qua session riêng, không chiếm kết nối của lệnh API
+        self._token_request = Request(requests.Session())
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.last_error = None
+
+    def client(self):
+        """Client gspread trên session dùng chung (tạo client không mở kết nối hay lấy token mới)"""
+        return gspread.Client(self.credentials,
+                              http_client=lambda auth: RateLimitedHTTPClient(auth, self.session, self.limiter))
+
+    # ---------- Token ----------
+
+    def seconds_left(self):
+        """Số giây token hiện tại còn hiệu lực (0 nếu chưa có token)"""
+        if not self.credentials.token or self.credentials.expiry is None:
+            return 0.0
+        # google-auth lưu expiry dạng UTC không kèm múi giờ
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return max(0.0, (self.credentials.expiry - now).total_seconds())
+
+    def refresh(self, force=False):
+        """Làm mới token nếu sắp hết hạn (hoặc force)"""
+        with self._refresh_lock:
+            if force or self.seconds_left() <= self.refresh_margin:
+                self.credentials.refresh(self._token_request)
+
+    # ---------- Worker ----------
+
+    def start(self):
+        """Chạy worker làm mới token (một lần cho mỗi kết nối)"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='beevent-token-refresh', daemon=True)
+                self._worker.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+                self.last_error = None
+                delay = max(RETRY_DELAY, self.seconds_left() - self.refresh_margin)
+            except Exception as error:
+                # Lỗi mạng/xác thực: thử lại sớm; lệnh API vẫn tự làm mới nếu token đã hết hạn
+                self.last_error = error
+                delay = RETRY_DELAY
+            self._wake.wait(delay)
+            self._wake.clear()
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(service_account_info, scopes=SCOPES, rate_limits=None):
+    """
+    Kết nối dùng chung trong process cho mỗi service account, worker làm mới token đã chạy.
+    `rate_limits` ([rate_limits] trong secrets) áp dụng khi tạo kết nối.
+    """
+    key = (service_account_info['client_email'], tuple(scopes))
+    with _connections_lock:
+        connection = _connections.get(key)
+        if connection is None:
+            connection = _connections[key] = GoogleConnection(service_account_info, scopes, rate_limits=rate_limits).start()
+        return connection
+
+
+def connections():
+    """Các kết nối đang mở trong process (cho trang quản trị)"""
+    with _connections_lock:
+        return list(_connections.values())
+
+
+def authorize(service_account_info, scopes=SCOPES, rate_limits=None):
+    """Client gspread trên kết nối dùng chung của service account (thay cho gspread.authorize)"""
+    return get_connection(service_account_info, scopes, rate_limits).client()
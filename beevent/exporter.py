@@ -0,0 +1,71 @@
+"""
+Export một hoặc nhiều bảng dữ liệu ra CSV, Parquet hoặc Excel (XLSX) trong một file zip.
+
+Mỗi bảng được ghi thẳng vào entry của zip (nén trong lúc ghi): CSV ghi theo từng khối
+dòng, XLSX dùng workbook write-only của openpyxl (ghi từng dòng). Không dựng chuỗi
+CSV/Excel hoàn chỉnh trong bộ nhớ trước khi nén, nên bộ nhớ đỉnh không bị nhân đôi.
+"""
+import io
+import zipfile
+
+import pandas as pd
+
+EXPORT_FORMATS = {"CSV": "csv", "Parquet": "parquet", "Excel (XLSX)": "xlsx"}
+CSV_CHUNK_ROWS = 5000
+
+
+def _arrow_safe(df):
+    """Cột object lẫn kiểu (vd. số và chuỗi rỗng từ sheet) chuyển về chuỗi để ghi Parquet"""
+    mixed = [c for c in df.columns
+             if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True) not in ('string', 'empty')]
+    return df.astype({c: str for c in mixed}) if mixed else df
+
+
+def write_csv(df, stream):
+    """CSV UTF-8 có BOM (Excel đọc đúng tiếng Việt), ghi theo từng khối dòng"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    df.to_csv(text, index=False, chunksize=CSV_CHUNK_ROWS)
+    text.flush()
+    text.detach()
+
+
+def write_parquet(df, stream):
+    _arrow_safe(df).to_parquet(stream, index=False)
+
+
+def _cell(value):
+    """Giá trị ô Excel: NaN/NaT thành ô trống"""
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+def write_xlsx(frames, stream):
+    """Một workbook, mỗi bảng một tab, ghi từng dòng bằng chế độ write-only"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for name, df in frames.items():
+        worksheet = workbook.create_sheet(title=str(name)[:31])
+        worksheet.append([str(c) for c in df.columns])
+        for row in df.itertuples(index=False, name=None):
+            worksheet.append([_cell(v) for v in row])
+    workbook.save(stream)
+
+
+def export_archive(frames, fmt, buffer=None):
+    """
+    Ghi các bảng {tên: DataFrame} theo định dạng `fmt` ('csv' | 'parquet' | 'xlsx') vào một zip.
+    CSV/Parquet: mỗi bảng một file; XLSX: một workbook nhiều tab. Trả về buffer (đã seek về 0).
+    """
+    buffer = buffer or io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        if fmt == 'xlsx':
+            entry_name = f"{next(iter(frames))}.xlsx" if len(frames) == 1 else "Beevent.xlsx"
+            with archive.open(entry_name, 'w', force_zip64=True) as stream:
+                write_xlsx(frames, stream)
+        else:
+            writer = write_csv if fmt == 'csv' else write_parquet
+            for name, df in frames.items():
+                with archive.open(f"{name}.{fmt}", 'w', force_zip64=True) as stream:
+                    writer(df, stream)
+    buffer.seek(0)
+    return buffer
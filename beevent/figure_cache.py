@@ -0,0 +1,78 @@
+"""
+Cache figure Plotly giữa các lần rerun của dashboard.
+
+Khóa = (mã biểu đồ, fingerprint dữ liệu đầu vào, trạng thái bộ lọc). Figure đã dựng
+được giữ lại nguyên đối tượng và giới hạn số lượng theo LRU, nên rerun do một widget
+không liên quan không phải dựng lại biểu đồ. Figure trong cache dùng chung giữa các
+phiên: chỉ truyền thẳng vào st.plotly_chart, không sửa tiếp sau khi lấy ra.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(*parts):
+    """Fingerprint ổn định (theo nội dung) của DataFrame/Series và các giá trị thường"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            labels = list(part.columns) if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr((type(part).__name__, part.shape, labels)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(repr((part.dtype, part.shape)).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+def _freeze(value):
+    """Đưa trạng thái bộ lọc về dạng hashable (list -> tuple, dict -> tuple đã sắp xếp)"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, set) else tuple(items)
+    return value
+
+
+class FigureCache:
+    """LRU các figure đã dựng, khóa theo (chart_id, data_key, filters)"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chart_id, data_key, filters, build):
+        """Figure trong cache nếu có, ngược lại gọi build() rồi lưu lại"""
+        key = (chart_id, _freeze(data_key), _freeze(filters))
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure
+
+        figure = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
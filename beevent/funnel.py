@@ -0,0 +1,180 @@
+"""
+Funnel bán hàng từ lịch sử đổi trạng thái dự án (log chỉ ghi thêm).
+
+Mỗi sự kiện (Thời điểm, Project_ID, Từ trạng thái, Sang trạng thái) được quy về
+giai đoạn pipeline. Các sự kiện liên tiếp cùng giai đoạn gộp thành một lượt ở giai
+đoạn đó (visit) với thời điểm vào/ra. Vì log chỉ ghi thêm, engine chỉ xử lý các
+dòng mới kể từ lần trước; chuyển tiếp, tỷ lệ chuyển đổi và thời gian ở mỗi giai
+đoạn được tính bằng groupby trên bảng visit.
+"""
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from beevent.revenue_cube import PIPELINE_STAGES, pipeline_stage
+
+STATUS_EVENT_COLUMNS = ['Thời điểm', 'Project_ID', 'Từ trạng thái', 'Sang trạng thái']
+FUNNEL_STAGES = list(PIPELINE_STAGES)
+LOST_STAGE = 'Lost'
+LOST_STATUSES = ['Hủy', 'Lost', 'Thua']
+STAGE_ORDER = {stage: i for i, stage in enumerate(FUNNEL_STAGES)}
+VISIT_COLUMNS = ['Project_ID', 'Stage', 'Từ stage', 'Bắt đầu', 'Kết thúc']
+
+
+def status_stage(status):
+    """Giai đoạn funnel của một trạng thái: giai đoạn pipeline, 'Lost' hoặc None"""
+    status = str(status)
+    if any(s in status for s in LOST_STATUSES):
+        return LOST_STAGE
+    return pipeline_stage(status)
+
+
+def status_event(project_id, old_status, new_status, at=None):
+    """Một dòng sự kiện đổi trạng thái theo thứ tự STATUS_EVENT_COLUMNS"""
+    at = at or datetime.now()
+    return [at.strftime("%Y-%m-%d %H:%M:%S"), str(project_id), str(old_status or ''), str(new_status)]
+
+
+def baseline_events(projects_df):
+    """Sự kiện mốc cho các dự án đã có trước khi ghi log: trạng thái hiện tại tại 'Ngày tạo'"""
+    if 'Ngày tạo' in projects_df.columns:
+        created = pd.to_datetime(projects_df['Ngày tạo'], errors='coerce')
+    else:
+        created = pd.Series(pd.NaT, index=projects_df.index)
+    events = pd.DataFrame({
+        'Thời điểm': created.fillna(pd.Timestamp(datetime.now())).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        'Project_ID': projects_df['ID'].astype(str),
+        'Từ trạng thái': '',
+        'Sang trạng thái': projects_df['Trạng thái'].astype(str),
+    })
+    return events.sort_values('Thời điểm', kind='mergesort')
+
+
+class FunnelEngine:
+    """Bảng visit theo giai đoạn của từng dự án, mở rộng tăng dần khi log có sự kiện mới"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.n_events = 0
+        self.visits = pd.DataFrame({
+            'Project_ID': pd.Series(dtype='object'),
+            'Stage': pd.Series(dtype='object'),
+            'Từ stage': pd.Series(dtype='object'),
+            'Bắt đầu': pd.Series(dtype='datetime64[ns]'),
+            'Kết thúc': pd.Series(dtype='datetime64[ns]'),
+        })
+        self._open = pd.Series(dtype='int64')          # Project_ID -> vị trí visit đang mở
+        self._last_stage = pd.Series(dtype='object')   # Project_ID -> giai đoạn hiện tại
+
+    def extend(self, events_df):
+        """
+        Xử lý các sự kiện mới của log (các dòng từ vị trí n_events trở đi).
+        Log bị ghi lại ngắn hơn thì tính lại từ đầu. Trả về số sự kiện mới.
+        """
+        with self._lock:
+            if len(events_df) < self.n_events:
+                self._reset()
+            new = events_df.iloc[self.n_events:]
+            if len(new) == 0:
+                return 0
+            self.n_events = len(events_df)
+
+            events = pd.DataFrame({
+                'Project_ID': new['Project_ID'].astype(str),
+                'Stage': new['Sang trạng thái'].map(status_stage),
+                'Bắt đầu': pd.to_datetime(new['Thời điểm'], errors='coerce'),
+            }).dropna(subset=['Stage', 'Bắt đầu'])
+            events = events.sort_values(['Project_ID', 'Bắt đầu'], kind='mergesort')
+            if len(events) == 0:
+                return len(new)
+
+            # Giai đoạn trước đó: trong lô mới, hoặc giai đoạn đang mở của dự án
+            previous = events.groupby('Project_ID')['Stage'].shift()
+            carried = pd.Series(self._last_stage.reindex(events['Project_ID']).to_numpy(), index=events.index)
+            events['Từ stage'] = previous.where(previous.notna(), carried)
+            events = events[events['Stage'] != events['Từ stage']].copy()
+            if len(events) == 0:
+                return len(new)
+
+            events['Kết thúc'] = events.groupby('Project_ID')['Bắt đầu'].shift(-1)
+
+            # Đóng visit đang mở của các dự án vừa chuyển giai đoạn
+            entered = events.groupby('Project_ID')['Bắt đầu'].first()
+            closing = self._open.index.intersection(entered.index)
+            if len(closing) > 0:
+                self.visits.loc[self._open[closing].to_numpy(), 'Kết thúc'] = entered[closing].to_numpy()
+
+            offset = len(self.visits)
+            added = events[VISIT_COLUMNS]
+            self.visits = pd.concat([self.visits, added], ignore_index=True) if offset > 0 else added.reset_index(drop=True)
+            positions = pd.Series(np.arange(offset, len(self.visits)), index=events['Project_ID'].to_numpy())
+            self._open = positions.groupby(level=0).last().combine_first(self._open).astype('int64')
+            self._last_stage = events.groupby('Project_ID')['Stage'].last().combine_first(self._last_stage)
+            return len(new)
+
+    # ---------- Đọc funnel ----------
+
+    def _visits(self, project_ids=None):
+        visits = self.visits
+        if project_ids is not None:
+            visits = visits[visits['Project_ID'].isin(pd.Index(project_ids).astype(str))]
+        return visits
+
+    def transitions(self, project_ids=None):
+        """Số lần chuyển giữa các giai đoạn (Từ stage -> Stage), kể cả sang 'Lost'"""
+        visits = self._visits(project_ids)
+        visits = visits[visits['Từ stage'].notna()]
+        return visits.groupby(['Từ stage', 'Stage']).size().rename('Số dự án').reset_index()
+
+    def stage_summary(self, project_ids=None, now=None):
+        """
+        Mỗi giai đoạn: số dự án đã đạt, số sang giai đoạn sau, tỷ lệ chuyển đổi,
+        số bị mất (Lost) từ giai đoạn đó, số đang ở giai đoạn và thời gian TB (ngày).
+        """
+        visits = self._visits(project_ids)
+        now = pd.Timestamp(now or datetime.now())
+
+        furthest = visits['Stage'].map(STAGE_ORDER).groupby(visits['Project_ID']).max().dropna().astype(int)
+        at_furthest = np.bincount(furthest, minlength=len(FUNNEL_STAGES))
+        reached = at_furthest[::-1].cumsum()[::-1]
+        advanced = np.append(reached[1:], 0)
+
+        lost = visits.loc[visits['Stage'] == LOST_STAGE, 'Từ stage'].value_counts()
+        current = visits.groupby('Project_ID')['Stage'].last().value_counts()
+        # Won là giai đoạn cuối: không tính thời gian ở lại
+        staying = visits[visits['Stage'] != FUNNEL_STAGES[-1]]
+        days = (staying['Kết thúc'].fillna(now) - staying['Bắt đầu']).dt.total_seconds() / 86400
+        avg_days = days.groupby(staying['Stage']).mean()
+
+        summary = pd.DataFrame({
+            'Stage': FUNNEL_STAGES,
+            'Đã đạt': reached,
+            'Sang bước sau': advanced,
+            'Lost': lost.reindex(FUNNEL_STAGES, fill_value=0).to_numpy(),
+            'Đang ở giai đoạn': current.reindex(FUNNEL_STAGES, fill_value=0).to_numpy(),
+            'Thời gian TB (ngày)': avg_days.reindex(FUNNEL_STAGES).round(1).to_numpy(),
+        })
+        summary['Tỷ lệ chuyển đổi %'] = (summary['Sang bước sau'] / summary['Đã đạt'].replace(0, np.nan) * 100).round(1)
+        summary.loc[summary['Stage'] == FUNNEL_STAGES[-1], ['Sang bước sau', 'Tỷ lệ chuyển đổi %']] = np.nan
+        return summary
+
+    def win_rate(self, project_ids=None):
+        """Tỷ lệ % dự án vào funnel đi tới giai đoạn cuối (Won)"""
+        summary = self.stage_summary(project_ids)
+        entered = summary['Đã đạt'].iloc[0]
+        return float(summary['Đã đạt'].iloc[-1] / entered * 100) if entered > 0 else 0.0
+
+    def close_time(self, project_ids=None):
+        """Số ngày TB từ lúc vào funnel tới khi Won, NaN nếu chưa có dự án Won"""
+        visits = self._visits(project_ids)
+        first_seen = visits.groupby('Project_ID')['Bắt đầu'].min()
+        # Chỉ tính dự án chuyển vào Won từ giai đoạn khác (bỏ dự án có mốc ban đầu đã là Won)
+        won = visits[(visits['Stage'] == FUNNEL_STAGES[-1]) & visits['Từ stage'].notna()]
+        won_at = won.groupby('Project_ID')['Bắt đầu'].min()
+        days = (won_at - first_seen.reindex(won_at.index)).dt.total_seconds() / 86400
+        return float(days.mean()) if len(days) > 0 else float('nan')
@@ -0,0 +1,77 @@
+"""
+Báo cáo thời gian import khi khởi động một script Streamlit.
+
+Chạy các lệnh import ở cấp module của script (không chạy phần còn lại, không kết nối)
+trong một process Python mới với `-X importtime`, rồi tổng hợp:
+
+    python -m beevent.import_profile app2.py
+    python -m beevent.import_profile app2.py --top 20
+
+- "Import của script": từng lệnh import trực tiếp, thời gian cộng dồn (gồm các module con)
+- "Theo gói": thời gian tự thân cộng theo gói gốc (pandas, plotly, gspread...)
+
+Thư viện import trễ bằng beevent.lazy không xuất hiện vì chưa được dùng lúc khởi động.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def startup_imports(path):
+    """Mã các lệnh import ở cấp module của script"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(body=nodes, type_ignores=[]))
+
+
+def measure(code, cwd=None):
+    """Chạy `code` với -X importtime; trả về [(độ sâu, module, tự thân µs, cộng dồn µs)]"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import lỗi')
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def report(rows, top=15):
+    """Các dòng báo cáo từ kết quả measure"""
+    # Module ở độ sâu nhỏ nhất là import trực tiếp của script
+    top_level = min(depth for depth, _, _, _ in rows)
+    direct = [(name, cumulative) for depth, name, _, cumulative in rows if depth == top_level]
+    packages = defaultdict(int)
+    for _, name, self_us, _ in rows:
+        packages[name.split('.')[0]] += self_us
+    total = sum(cumulative for _, cumulative in direct)
+
+    lines = [f"Tổng thời gian import: {total / 1000:.0f} ms ({len(rows)} module)", "",
+             "Import của script (cộng dồn):"]
+    lines += [f"  {cumulative / 1000:8.1f} ms  {name}" for name, cumulative in sorted(direct, key=lambda r: -r[1])[:top]]
+    lines += ["", "Theo gói (tự thân):"]
+    lines += [f"  {self_us / 1000:8.1f} ms  {name}" for name, self_us in sorted(packages.items(), key=lambda r: -r[1])[:top]]
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Thời gian import khi khởi động script Streamlit")
+    parser.add_argument('script', help="vd. app2.py")
+    parser.add_argument('--top', type=int, default=15, help="số dòng mỗi bảng")
+    args = parser.parse_args(argv)
+
+    cwd = os.path.dirname(os.path.abspath(args.script))
+    rows = measure(startup_imports(args.script), cwd=cwd)
+    print("\n".join(report(rows, args.top)))
+
+
+if __name__ == '__main__':
+    main()
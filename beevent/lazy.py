@@ -0,0 +1,36 @@
+"""
+Import trễ cho các thư viện nặng (plotly, gspread...): module chỉ được import khi truy
+cập thuộc tính đầu tiên, nên lần chạy đầu của app (container vừa khởi động) vẽ được
+sidebar và trang không cần các thư viện đó sớm hơn.
+
+    px = lazy_import("plotly.express")   # chưa import
+    fig = px.bar(...)                    # import plotly.express ở đây
+
+Đo thời gian import của một script bằng `python -m beevent.import_profile app2.py`.
+"""
+import importlib
+import sys
+
+
+class LazyModule:
+    """Đại diện cho module `name`, import khi truy cập thuộc tính lần đầu"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # importlib.import_module có khóa theo module, gọi từ nhiều thread vẫn chỉ import một lần
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Module `name` nếu đã import, nếu chưa thì LazyModule của nó"""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -0,0 +1,234 @@
+"""
+Sổ cái tài chính: giao dịch Finance sắp theo ngày, đánh chỉ mục theo Project_ID.
+
+Số dư lũy kế được giữ dưới dạng mảng ngày đã sắp xếp + tổng cộng dồn (cho toàn
+công ty và từng dự án), nên tra số dư tại một ngày là một lần `searchsorted`
+(O(log n)). Lãi/lỗ theo dự án, thu/chi theo hạng mục và dòng tiền theo tháng được
+cộng dồn tăng dần khi có giao dịch mới thay vì groupby lại toàn bảng.
+
+Quy ước: giao dịch 'Từ chối' bị bỏ qua; 'Thu' là dòng tiền dương, 'Chi' là âm.
+Số dư sổ sách tính mọi giao dịch còn hiệu lực, số dư tiền mặt chỉ tính giao dịch
+'Đã thanh toán'. Giao dịch chưa thanh toán là công nợ phải thu (Thu) / phải trả (Chi).
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+REJECTED_STATUS = 'Từ chối'
+SETTLED_STATUS = 'Đã thanh toán'
+AGEING_BUCKETS = [(0, 30, '0-30 ngày'), (31, 60, '31-60 ngày'), (61, 90, '61-90 ngày'), (91, None, '>90 ngày')]
+LEDGER_COLUMNS = ['Key', 'ID', 'Project_ID', 'Loại', 'Hạng mục', 'Số tiền', 'Ngày', 'Trạng thái', 'Dòng tiền']
+
+
+def normalize_transactions(finance_df):
+    """Chuẩn hóa bảng Finance: kiểu dữ liệu, dòng tiền có dấu, khóa ID#thứ tự (phòng ID trùng)"""
+    df = finance_df
+    ids = df['ID'].astype(str)
+    amount = pd.to_numeric(df['Số tiền'], errors='coerce').fillna(0).astype(float)
+    kind = df['Loại'].astype(str)
+    tx = pd.DataFrame({
+        'Key': (ids + '#' + ids.groupby(ids).cumcount().astype(str)).to_numpy(),
+        'ID': ids.to_numpy(),
+        'Project_ID': df['Project_ID'].astype(str).to_numpy(),
+        'Loại': kind.to_numpy(),
+        'Hạng mục': df['Hạng mục'].astype(str).to_numpy(),
+        'Số tiền': amount.to_numpy(),
+        'Ngày': pd.to_datetime(df['Ngày'], errors='coerce').to_numpy(),
+        'Trạng thái': df['Trạng thái'].astype(str).to_numpy(),
+        'Dòng tiền': np.where(kind == 'Thu', amount, np.where(kind == 'Chi', -amount, 0.0)),
+    })
+    return tx
+
+
+class RunningBalance:
+    """Ngày đã sắp xếp + tổng cộng dồn; tra số dư tại ngày bằng searchsorted"""
+
+    def __init__(self, dates=None, amounts=None):
+        dates = np.asarray([] if dates is None else dates, dtype='datetime64[ns]')
+        amounts = np.asarray([] if amounts is None else amounts, dtype=float)
+        order = np.argsort(dates, kind='mergesort')
+        self.dates = dates[order]
+        self.cumulative = np.cumsum(amounts[order])
+
+    def insert(self, date, amount):
+        """Thêm một giao dịch; ngày mới nhất (trường hợp thường gặp) chỉ nối vào cuối"""
+        date = np.datetime64(pd.Timestamp(date), 'ns')
+        pos = int(np.searchsorted(self.dates, date, side='right'))
+        before = self.cumulative[pos - 1] if pos > 0 else 0.0
+        self.dates = np.insert(self.dates, pos, date)
+        self.cumulative = np.insert(self.cumulative, pos, before)
+        self.cumulative[pos:] += amount
+
+    def at(self, date=None):
+        """Số dư lũy kế tới hết ngày `date` (None = toàn bộ)"""
+        if len(self.cumulative) == 0:
+            return 0.0
+        if date is None:
+            return float(self.cumulative[-1])
+        date = np.datetime64(pd.Timestamp(date).normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns'), 'ns')
+        pos = int(np.searchsorted(self.dates, date, side='right'))
+        return float(self.cumulative[pos - 1]) if pos > 0 else 0.0
+
+
+class FinanceLedger:
+    """Sổ cái Finance với số dư lũy kế, P&L dự án, dòng tiền tháng và tuổi nợ"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build(normalize_transactions(pd.DataFrame(columns=['ID', 'Project_ID', 'Loại', 'Hạng mục', 'Số tiền', 'Ngày', 'Trạng thái'])))
+
+    # ---------- Xây dựng / cập nhật ----------
+
+    def _build(self, tx):
+        tx = tx[(tx['Trạng thái'] != REJECTED_STATUS) & tx['Ngày'].notna()]
+        self.tx = tx.sort_values('Ngày', kind='mergesort').reset_index(drop=True)
+        self._hashes = self._hash(self.tx)
+
+        settled = self.tx['Trạng thái'] == SETTLED_STATUS
+        self._book = RunningBalance(self.tx['Ngày'], self.tx['Dòng tiền'])
+        self._cash = RunningBalance(self.tx.loc[settled, 'Ngày'], self.tx.loc[settled, 'Dòng tiền'])
+        self._project_book = {
+            pid: RunningBalance(group['Ngày'], group['Dòng tiền'])
+            for pid, group in self.tx.groupby('Project_ID', sort=False)
+        }
+
+        self._pnl = self.tx.pivot_table(index='Project_ID', columns='Loại', values='Số tiền', aggfunc='sum', fill_value=0)
+        self._categories = self.tx.groupby(['Loại', 'Hạng mục'])['Số tiền'].sum()
+        months = self.tx['Ngày'].dt.to_period('M').dt.to_timestamp()
+        self._monthly = self.tx.pivot_table(index=months, columns='Loại', values='Số tiền', aggfunc='sum', fill_value=0)
+
+    @staticmethod
+    def _hash(tx):
+        if len(tx) == 0:
+            return pd.Series(dtype='uint64')
+        return pd.Series(pd.util.hash_pandas_object(tx.drop(columns='Key'), index=False).to_numpy(), index=tx['Key'].to_numpy())
+
+    @classmethod
+    def from_frame(cls, finance_df):
+        ledger = cls()
+        ledger.sync(finance_df)
+        return ledger
+
+    def sync(self, finance_df):
+        """
+        Đồng bộ với bảng Finance hiện tại. Chỉ có giao dịch mới thì thêm tăng dần;
+        có giao dịch bị sửa/xóa thì dựng lại. Trả về số giao dịch mới hoặc -1 nếu dựng lại.
+        """
+        if len(finance_df) == 0 or 'ID' not in finance_df.columns:
+            with self._lock:
+                if len(self.tx) > 0:
+                    self._build(self.tx.iloc[0:0])
+                    return -1
+            return 0
+
+        tx = normalize_transactions(finance_df)
+        tx = tx[(tx['Trạng thái'] != REJECTED_STATUS) & tx['Ngày'].notna()]
+        hashes = self._hash(tx)
+        with self._lock:
+            known = self._hashes.index.intersection(hashes.index)
+            changed = (hashes.loc[known].to_numpy() != self._hashes.loc[known].to_numpy()).any()
+            removed = len(self._hashes.index.difference(hashes.index)) > 0
+            if changed or removed:
+                self._build(tx)
+                return -1
+            new = tx[~tx['Key'].isin(self._hashes.index)]
+            # Thêm nhiều giao dịch một lúc (vd. import) thì dựng lại nhanh hơn chèn từng dòng
+            if len(new) > max(100, len(self.tx) // 10):
+                self._build(tx)
+                return len(new)
+            # Thêm trong cùng khóa: hai phiên đồng bộ cùng lúc không thêm một giao dịch hai lần
+            for row in new.to_dict('records'):
+                self._append_locked(row)
+        return len(new)
+
+    def append(self, transaction):
+        """Thêm một giao dịch (dict theo cột Finance) ngay sau khi lưu"""
+        row = normalize_transactions(pd.DataFrame([transaction])).iloc[0].to_dict()
+        if row['Trạng thái'] == REJECTED_STATUS or pd.isna(row['Ngày']):
+            return
+        with self._lock:
+            key = row['Key']
+            while key in self._hashes.index:
+                key = f"{row['ID']}#{int(key.rsplit('#', 1)[1]) + 1}"
+            row['Key'] = key
+            self._append_locked(row)
+
+    def _append_locked(self, row):
+        """Thêm một giao dịch đã chuẩn hóa (người gọi giữ self._lock); Key đã có thì bỏ qua"""
+        if row['Key'] in self._hashes.index:
+            return
+        date, kind, amount, pid = pd.Timestamp(row['Ngày']), row['Loại'], row['Số tiền'], row['Project_ID']
+        signed = row['Dòng tiền']
+
+        pos = int(np.searchsorted(self.tx['Ngày'].to_numpy(), np.datetime64(date, 'ns'), side='right'))
+        new_row = pd.DataFrame([row], columns=LEDGER_COLUMNS)
+        self.tx = pd.concat([self.tx.iloc[:pos], new_row, self.tx.iloc[pos:]], ignore_index=True)
+        self._hashes = pd.concat([self._hashes, self._hash(new_row)]) if len(self._hashes) > 0 else self._hash(new_row)
+
+        self._book.insert(date, signed)
+        if row['Trạng thái'] == SETTLED_STATUS:
+            self._cash.insert(date, signed)
+        self._project_book.setdefault(pid, RunningBalance()).insert(date, signed)
+
+        self._pnl.loc[pid, kind] = self._pnl.get(kind, pd.Series(dtype=float)).get(pid, 0) + amount
+        self._categories.loc[(kind, row['Hạng mục'])] = self._categories.get((kind, row['Hạng mục']), 0) + amount
+        month = date.to_period('M').to_timestamp()
+        self._monthly.loc[month, kind] = self._monthly.get(kind, pd.Series(dtype=float)).get(month, 0) + amount
+        self._pnl = self._pnl.fillna(0)
+        self._monthly = self._monthly.fillna(0).sort_index()
+
+    # ---------- Đọc sổ cái ----------
+
+    def balance(self, date=None, project_id=None, cash=False):
+        """Số dư lũy kế tới hết ngày `date`: toàn công ty hoặc một dự án; cash=True chỉ tính đã thanh toán"""
+        if project_id is not None:
+            book = self._project_book.get(str(project_id))
+            return book.at(date) if book is not None else 0.0
+        return (self._cash if cash else self._book).at(date)
+
+    def totals(self):
+        """Tổng thu, tổng chi của các giao dịch còn hiệu lực"""
+        return {kind: float(self._pnl[kind].sum()) if kind in self._pnl.columns else 0.0 for kind in ['Thu', 'Chi']}
+
+    def project_pnl(self):
+        """Thu, Chi, Lãi/Lỗ theo dự án"""
+        pnl = self._pnl.reindex(columns=['Thu', 'Chi'], fill_value=0).copy()
+        pnl['Lãi/Lỗ'] = pnl['Thu'] - pnl['Chi']
+        pnl.index.name = 'Project_ID'
+        pnl.columns.name = None
+        return pnl
+
+    def category_summary(self):
+        """Tổng số tiền theo (Loại, Hạng mục)"""
+        summary = self._categories.rename('Số tiền').reset_index()
+        return summary[summary['Số tiền'] != 0]
+
+    def monthly_cashflow(self):
+        """Thu, Chi, dòng tiền ròng và số dư lũy kế theo tháng"""
+        cashflow = self._monthly.reindex(columns=['Thu', 'Chi'], fill_value=0).copy()
+        cashflow['Ròng'] = cashflow['Thu'] - cashflow['Chi']
+        cashflow['Số dư lũy kế'] = cashflow['Ròng'].cumsum()
+        cashflow.index.name = 'Tháng'
+        cashflow.columns.name = None
+        return cashflow
+
+    def ageing(self, today=None):
+        """Tuổi công nợ chưa thanh toán: phải thu (Thu) / phải trả (Chi) theo nhóm số ngày"""
+        today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+        open_items = self.tx[(self.tx['Trạng thái'] != SETTLED_STATUS) & self.tx['Loại'].isin(['Thu', 'Chi'])]
+        labels = [label for _, _, label in AGEING_BUCKETS]
+        bins = [-np.inf] + [high for _, high, _ in AGEING_BUCKETS[:-1]] + [np.inf]
+        days = (today - open_items['Ngày']).dt.days
+        bucket = pd.cut(days, bins=bins, labels=labels)
+
+        ageing = open_items.pivot_table(index=open_items['Loại'].map({'Thu': 'Phải thu', 'Chi': 'Phải trả'}),
+                                        columns=bucket, values='Số tiền', aggfunc='sum', fill_value=0, observed=False)
+        ageing = ageing.reindex(index=['Phải thu', 'Phải trả'], columns=labels, fill_value=0)
+        ageing['Tổng'] = ageing.sum(axis=1)
+        ageing.index.name = 'Công nợ'
+        ageing.columns.name = None
+        return ageing
+
+    def __len__(self):
+        return len(self.tx)
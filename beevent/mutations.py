@@ -0,0 +1,100 @@
+"""
+Thay đổi cục bộ (optimistic) áp lên bảng đã cache.
+
+Khi form thêm/sửa/xóa một bản ghi, thay đổi được ghi vào log này cùng lúc với hàng đợi
+ghi; mỗi lần load, bảng đã cache được áp các thay đổi còn hiệu lực nên danh sách cập
+nhật ngay mà không phải tải lại sheet. Áp thay đổi là idempotent theo khóa (ID): bản
+đã có trên sheet thì "thêm" thành "sửa", nên bảng tải lại từ server không bị trùng dòng.
+
+Một thay đổi được bỏ khỏi log khi bảng cache đã được tải sau thời điểm thao tác ghi
+tương ứng hoàn tất (bản trên server đã chứa nó), hoặc khi thao tác bị bỏ khỏi hàng đợi.
+"""
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from beevent.shared_tables import editable
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class MutationLog:
+    """Các thay đổi cục bộ theo worksheet, áp lên DataFrame đã cache khi load"""
+
+    def __init__(self, key_column='ID'):
+        self.key_column = key_column
+        self._lock = threading.Lock()
+        self._mutations = {}   # worksheet -> [mutation], theo thứ tự thao tác
+
+    def _record(self, worksheet, op, key, values=None, entry_id=None):
+        mutation = {'op': op, 'key': str(key), 'values': dict(values or {}),
+                    'entry_id': entry_id, 'confirmed_at': None}
+        with self._lock:
+            self._mutations.setdefault(worksheet, []).append(mutation)
+        return mutation
+
+    def create(self, worksheet, record, entry_id=None):
+        return self._record(worksheet, CREATE, record[self.key_column], record, entry_id)
+
+    def update(self, worksheet, key, values, entry_id=None):
+        return self._record(worksheet, UPDATE, key, values, entry_id)
+
+    def delete(self, worksheet, key, entry_id=None):
+        return self._record(worksheet, DELETE, key, None, entry_id)
+
+    def confirm(self, worksheet, pending_ids, at=None):
+        """Đánh dấu đã lên sheet các thay đổi của worksheet không còn trong hàng đợi (pending_ids)"""
+        at = at if at is not None else datetime.now().timestamp()
+        pending_ids = set(pending_ids)
+        with self._lock:
+            for mutation in self._mutations.get(worksheet, []):
+                if mutation['confirmed_at'] is None and mutation['entry_id'] not in pending_ids:
+                    mutation['confirmed_at'] = at
+
+    def forget(self, entry_id):
+        """Bỏ thay đổi ứng với thao tác đã bị bỏ khỏi hàng đợi"""
+        with self._lock:
+            for worksheet, mutations in self._mutations.items():
+                self._mutations[worksheet] = [m for m in mutations if m['entry_id'] != entry_id]
+
+    def pending(self, worksheet):
+        with self._lock:
+            return list(self._mutations.get(worksheet, []))
+
+    def apply(self, worksheet, df, fetched_at):
+        """
+        Bảng `df` (tải lúc `fetched_at`) cộng các thay đổi còn hiệu lực.
+        Không có thay đổi thì trả về chính `df`.
+        """
+        with self._lock:
+            # Bản tải sau khi ghi xong đã chứa thay đổi: bỏ khỏi log
+            mutations = [m for m in self._mutations.get(worksheet, [])
+                         if m['confirmed_at'] is None or m['confirmed_at'] > fetched_at]
+            if worksheet in self._mutations:
+                self._mutations[worksheet] = mutations
+        if not mutations:
+            return df
+
+        key = self.key_column
+        df = editable(df)
+        if key not in df.columns:
+            df[key] = pd.Series(dtype=object)
+        for mutation in mutations:
+            mask = df[key].astype(str) == mutation['key']
+            if mutation['op'] == DELETE:
+                df = df[~mask]
+            elif mutation['op'] == CREATE and not mask.any():
+                row = pd.DataFrame([mutation['values']])
+                if len(df) == 0:
+                    df = row.reindex(columns=list(dict.fromkeys([*df.columns, *row.columns])), fill_value='')
+                else:
+                    df = pd.concat([df, row], ignore_index=True)
+            else:
+                for column, value in mutation['values'].items():
+                    if column not in df.columns:
+                        df[column] = ''
+                    df[column] = df[column].where(~mask, value)
+        return df.reset_index(drop=True)
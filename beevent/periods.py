@@ -0,0 +1,69 @@
+"""
+Kỳ báo cáo: năm tài chính, khoảng ngày và cắt lát dự án đã sắp xếp theo ngày bắt đầu.
+
+Bảng dự án được sắp xếp một lần theo 'Ngày bắt đầu' (NaT ở cuối), sau đó mọi
+khoảng thời gian được cắt bằng `searchsorted` (O(log n)) thay vì lọc toàn bảng.
+"""
+import numpy as np
+import pandas as pd
+
+DATE_COLUMN = 'Ngày bắt đầu'
+
+
+def month_floor(value):
+    """Ngày đầu tháng của `value`"""
+    return pd.Timestamp(value).to_period('M').to_timestamp()
+
+
+def month_ceil(value):
+    """Ngày cuối tháng của `value`"""
+    return pd.Timestamp(value).to_period('M').to_timestamp(how='end').normalize()
+
+
+def fiscal_year_range(year, start_month=1):
+    """(ngày đầu, ngày cuối) của năm tài chính `year`, bắt đầu từ tháng `start_month`"""
+    start = pd.Timestamp(year=int(year), month=int(start_month), day=1)
+    end = start + pd.DateOffset(years=1) - pd.Timedelta(days=1)
+    return start, end
+
+
+def fiscal_year_of(value, start_month=1):
+    """Năm tài chính chứa ngày `value` (đặt tên theo năm bắt đầu)"""
+    value = pd.Timestamp(value)
+    return value.year if value.month >= start_month else value.year - 1
+
+
+def fiscal_years(dates, start_month=1, include=None):
+    """Danh sách năm tài chính có dữ liệu, kèm các năm trong `include`"""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce').dropna()
+    years = set(include or [])
+    if len(dates) > 0:
+        shifted = dates - pd.DateOffset(months=start_month - 1)
+        years |= set(shifted.dt.year.unique().tolist())
+    return sorted(int(y) for y in years)
+
+
+def period_months(start, end):
+    """Các ngày đầu tháng nằm trong [start, end]"""
+    return pd.date_range(month_floor(start), month_floor(end), freq='MS')
+
+
+def sort_by_start(projects_df, column=DATE_COLUMN):
+    """Sắp xếp dự án theo ngày bắt đầu (đã parse datetime), NaT ở cuối"""
+    if len(projects_df) == 0 or column not in projects_df.columns:
+        return projects_df
+    return projects_df.sort_values(column, kind='mergesort', na_position='last').reset_index(drop=True)
+
+
+def slice_sorted(sorted_df, start=None, end=None, column=DATE_COLUMN):
+    """Các dòng có `column` trong [start, end] của bảng đã sort_by_start, dùng searchsorted"""
+    if len(sorted_df) == 0 or column not in sorted_df.columns:
+        return sorted_df
+
+    values = sorted_df[column].to_numpy(dtype='datetime64[ns]')
+    valid = len(values) - int(np.isnat(values).sum())
+    values = values[:valid]
+
+    lo = 0 if start is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(start)), side='left'))
+    hi = valid if end is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(end)), side='right'))
+    return sorted_df.iloc[lo:max(lo, hi)]
@@ -0,0 +1,137 @@
+"""
+Giới hạn tốc độ gọi Google Sheets API (token bucket), dùng chung trong process.
+
+Quota Sheets tính theo phút, riêng cho đọc và ghi (mặc định 60 lệnh/phút mỗi loại cho
+một service account). Mỗi lệnh HTTP của gspread lấy một token của bucket tương ứng
+trước khi gửi (GET: đọc, còn lại: ghi); hết token thì chờ bucket nạp lại thay vì nhận
+429 từ Google. Lệnh ưu tiên thấp (đồng bộ nền, số liệu phụ) chỉ lấy token khi bucket
+còn trên mức dự trữ, nên thao tác của người dùng luôn còn chỗ.
+
+429 vẫn có thể xảy ra (quota chung của project, process khác): bucket bị xả và tạm chặn
+theo backoff tăng dần, lệnh được gửi lại (xem beevent.connection).
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+READ = 'read'
+WRITE = 'write'
+
+NORMAL = 'normal'
+LOW = 'low'
+
+_local = threading.local()
+
+
+@contextmanager
+def priority(level):
+    """Các lệnh API gọi trong khối (cùng thread) có mức ưu tiên `level`"""
+    previous = getattr(_local, 'priority', NORMAL)
+    _local.priority = level
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority():
+    return getattr(_local, 'priority', NORMAL)
+
+
+class TokenBucket:
+    """Bucket `per_minute` token, nạp đều theo thời gian; LOW chỉ lấy khi còn trên mức dự trữ"""
+
+    def __init__(self, per_minute, reserve=0.25):
+        self._cond = threading.Condition()
+        self.reserve = reserve
+        self.set_rate(per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._recent = deque()     # thời điểm cấp token trong 60s gần nhất
+        self.granted = 0
+        self.deferred = 0          # số lần lệnh LOW phải nhường
+        self.waited = 0.0          # tổng giây các lệnh đã chờ
+        self.throttled = 0         # số lần nhận 429
+
+    def set_rate(self, per_minute):
+        with self._cond:
+            self.capacity = float(per_minute)
+            self.rate = self.capacity / 60.0
+            if getattr(self, 'tokens', 0) > self.capacity:
+                self.tokens = self.capacity
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        while self._recent and now - self._recent[0] > 60:
+            self._recent.popleft()
+
+    def acquire(self, level=NORMAL):
+        """Lấy một token, chờ nếu cần; trả về số giây đã chờ"""
+        floor = min(self.capacity * self.reserve, self.capacity - 1) if level == LOW else 0.0
+        started = time.monotonic()
+        with self._cond:
+            deferred = False
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self.tokens - 1 >= floor:
+                    self.tokens -= 1
+                    self._recent.append(now)
+                    self.granted += 1
+                    waited = now - started
+                    self.waited += waited
+                    return waited
+                if level == LOW and not deferred and self.tokens >= 1:
+                    deferred = True
+                    self.deferred += 1
+                self._cond.wait(max(self._blocked_until - now, (floor + 1 - self.tokens) / self.rate, 0.01))
+
+    def penalize(self, delay):
+        """Google báo 429: xả bucket và chặn `delay` giây"""
+        with self._cond:
+            self.tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.throttled += 1
+
+    def snapshot(self):
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'capacity': self.capacity, 'tokens': self.tokens, 'used_last_minute': len(self._recent),
+                'granted': self.granted, 'deferred': self.deferred, 'waited': self.waited,
+                'throttled': self.throttled, 'blocked_for': max(0.0, self._blocked_until - now),
+            }
+
+
+class RateLimiter:
+    """Bucket đọc và ghi của một service account, cùng backoff khi gặp 429"""
+
+    def __init__(self, read_per_minute=60, write_per_minute=60, reserve=0.25,
+                 max_retries=4, base_delay=2.0, max_delay=32.0):
+        self.buckets = {READ: TokenBucket(read_per_minute, reserve), WRITE: TokenBucket(write_per_minute, reserve)}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def acquire(self, kind):
+        return self.buckets[kind].acquire(current_priority())
+
+    def backoff(self, kind, attempt):
+        """Chờ trước lần gửi lại thứ attempt+1 sau 429 (mọi lệnh cùng loại cũng chờ)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        self.buckets[kind].penalize(delay)
+        return delay
+
+    def configure(self, read_per_minute=None, write_per_minute=None):
+        if read_per_minute:
+            self.buckets[READ].set_rate(read_per_minute)
+        if write_per_minute:
+            self.buckets[WRITE].set_rate(write_per_minute)
+
+    def snapshot(self):
+        return {kind: bucket.snapshot() for kind, bucket in self.buckets.items()}
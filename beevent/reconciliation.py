@@ -0,0 +1,96 @@
+"""
+Đối soát Finance với Projects: ngân sách (Doanh thu, Chi phí, Lợi nhuận % của dự án)
+so với thực tế (giao dịch Thu/Chi theo Project_ID).
+
+Giao dịch được gom một lần theo (Project_ID, Loại, Hạng mục); bảng theo dự án cộng
+từ bảng gom này (đã nhỏ) rồi merge một lần với Projects, nên chi phí chủ yếu là một
+groupby trên bảng giao dịch. Giao dịch 'Từ chối' không tính.
+"""
+import numpy as np
+import pandas as pd
+
+from beevent.ledger import REJECTED_STATUS, normalize_transactions
+
+# Chi phí thực tế vượt ngân sách quá ngưỡng này thì gắn cờ
+OVERRUN_TOLERANCE = 0.05
+FINANCE_FIELDS = ['ID', 'Project_ID', 'Loại', 'Hạng mục', 'Số tiền', 'Ngày', 'Trạng thái']
+CATEGORY_COLUMNS = ['Project_ID', 'Loại', 'Hạng mục', 'Số tiền', 'Số giao dịch', '% ngân sách']
+PROJECT_COLUMNS = [
+    'Project_ID', 'Tên dự án', 'Doanh thu KH', 'Doanh thu TT', 'Chênh lệch DT',
+    'Chi phí KH', 'Chi phí TT', 'Chênh lệch CP', 'Chênh lệch CP %',
+    'Lợi nhuận % KH', 'Lợi nhuận % TT', 'Có giao dịch', 'Vượt chi phí',
+]
+
+
+class ReconciliationReport:
+    """Kết quả đối soát: theo dự án, theo hạng mục và giao dịch không khớp dự án"""
+
+    def __init__(self, projects, categories, unmatched):
+        self.projects = projects
+        self.categories = categories
+        self.unmatched = unmatched
+
+    def overruns(self):
+        """Các dự án vượt chi phí, vượt nhiều nhất trước"""
+        return self.projects[self.projects['Vượt chi phí']].sort_values('Chênh lệch CP', ascending=False)
+
+    def cost_variance(self, project_ids=None):
+        """
+        Chênh lệch chi phí thực tế so với ngân sách (%) của các dự án đã có giao dịch
+        (có thể lọc theo project_ids), NaN nếu chưa dự án nào có giao dịch.
+        """
+        projects = self.projects[self.projects['Có giao dịch']]
+        if project_ids is not None:
+            projects = projects[projects['Project_ID'].isin(pd.Index(project_ids).astype(str))]
+        budget = projects['Chi phí KH'].sum()
+        if len(projects) == 0 or budget == 0:
+            return float('nan')
+        return float((projects['Chi phí TT'].sum() - budget) / budget * 100)
+
+
+def reconcile(projects_df, finance_df, tolerance=OVERRUN_TOLERANCE):
+    """Đối soát ngân sách dự án với giao dịch Finance"""
+    budgets = pd.DataFrame({
+        'Project_ID': projects_df['ID'].astype(str).to_numpy(),
+        'Tên dự án': projects_df['Tên dự án'].astype(str).to_numpy(),
+        'Doanh thu KH': pd.to_numeric(projects_df['Doanh thu'], errors='coerce').fillna(0).to_numpy(),
+        'Chi phí KH': pd.to_numeric(projects_df['Chi phí'], errors='coerce').fillna(0).to_numpy(),
+        'Lợi nhuận % KH': pd.to_numeric(projects_df['Lợi nhuận %'], errors='coerce').to_numpy(),
+    }).drop_duplicates('Project_ID')
+
+    tx = normalize_transactions(finance_df.reindex(columns=FINANCE_FIELDS))
+    tx = tx[(tx['Trạng thái'] != REJECTED_STATUS) & tx['Loại'].isin(['Thu', 'Chi'])]
+
+    # Một lần groupby trên bảng giao dịch
+    categories = (tx.groupby(['Project_ID', 'Loại', 'Hạng mục'])['Số tiền']
+                  .agg(['sum', 'size']).rename(columns={'sum': 'Số tiền', 'size': 'Số giao dịch'}))
+    actual = categories['Số tiền'].groupby(level=['Project_ID', 'Loại']).sum().unstack('Loại')
+    actual = actual.reindex(columns=['Thu', 'Chi']).fillna(0).rename(columns={'Thu': 'Doanh thu TT', 'Chi': 'Chi phí TT'})
+
+    # Một lần merge với ngân sách dự án
+    merged = budgets.merge(actual, left_on='Project_ID', right_index=True, how='outer', indicator=True)
+    unmatched_ids = merged.loc[merged['_merge'] == 'right_only', 'Project_ID']
+    projects = merged[merged['_merge'] != 'right_only'].drop(columns='_merge').reset_index(drop=True)
+
+    projects['Có giao dịch'] = projects['Doanh thu TT'].notna()
+    projects[['Doanh thu TT', 'Chi phí TT']] = projects[['Doanh thu TT', 'Chi phí TT']].fillna(0)
+    projects['Chênh lệch DT'] = projects['Doanh thu TT'] - projects['Doanh thu KH']
+    projects['Chênh lệch CP'] = projects['Chi phí TT'] - projects['Chi phí KH']
+    projects['Chênh lệch CP %'] = (projects['Chênh lệch CP'] / projects['Chi phí KH'].replace(0, np.nan) * 100).round(1)
+    projects['Lợi nhuận % TT'] = ((projects['Doanh thu TT'] - projects['Chi phí TT'])
+                                  / projects['Doanh thu TT'].replace(0, np.nan) * 100).round(1)
+    projects['Vượt chi phí'] = projects['Chi phí TT'] > projects['Chi phí KH'] * (1 + tolerance)
+    projects = projects[PROJECT_COLUMNS]
+
+    # Tỷ trọng từng hạng mục so với ngân sách cùng loại của dự án
+    categories = categories.reset_index()
+    budget_of = projects.set_index('Project_ID')
+    budget = np.where(categories['Loại'] == 'Thu',
+                      categories['Project_ID'].map(budget_of['Doanh thu KH']),
+                      categories['Project_ID'].map(budget_of['Chi phí KH']))
+    budget = pd.Series(budget, index=categories.index, dtype=float)
+    categories['% ngân sách'] = (categories['Số tiền'] / budget.replace(0, np.nan) * 100).round(1)
+    categories = categories[CATEGORY_COLUMNS]
+
+    unmatched = categories[categories['Project_ID'].isin(unmatched_ids)]
+    return ReconciliationReport(projects, categories[~categories['Project_ID'].isin(unmatched_ids)], unmatched)
@@ -0,0 +1,243 @@
+"""
+Cube doanh thu tính sẵn cho các dashboard: Tháng x Kênh x Loại x PIC x Trạng thái.
+
+Cube giữ lại phần đóng góp của từng dự án nên khi thêm/sửa/xóa dự án chỉ cần
+trừ phần cũ và cộng phần mới của các dòng thay đổi, không group lại toàn bộ.
+Các dashboard đọc bằng cách cắt lát cube (O(số ô)) thay vì groupby trên projects.
+`version` tăng mỗi khi số liệu trong cube thay đổi, dùng làm khóa cache cho kết quả.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+CHANNELS = ['Nội bộ', 'Gov-Hiệp hội', 'Corporate']
+DIMENSIONS = ['Tháng', 'Kênh', 'Loại', 'PIC', 'Trạng thái']
+MEASURES = ['Doanh thu', 'Chi phí', 'Số dự án', 'Số thắng', 'Tổng CSAT', 'Số CSAT', 'Số khách']
+
+# Trạng thái dự án -> giai đoạn pipeline (so khớp chuỗi con, theo thứ tự)
+PIPELINE_STAGES = {
+    'Lead': ['Lead', 'Mới'],
+    'Qualified': ['Đang đàm phán', 'Qualified'],
+    'Proposal': ['Đã gửi proposal', 'Đã ký HĐ'],
+    'Won': ['Hoàn thành', 'Đang thực hiện']
+}
+
+
+def classify_channel(projects_df):
+    """Phân loại kênh bán theo Loại dự án và tên khách hàng (vector hóa)"""
+    loai = projects_df.get('Loại', pd.Series('', index=projects_df.index)).astype(str).str.lower()
+    khach_hang = projects_df.get('Khách hàng', pd.Series('', index=projects_df.index)).astype(str).str.lower()
+
+    is_internal = loai.str.contains('nội bộ', regex=False) | khach_hang.str.contains('internal', regex=False)
+    is_gov = (loai.str.contains('gov', regex=False) | loai.str.contains('hiệp hội', regex=False) |
+              khach_hang.str.contains('chính phủ', regex=False))
+    return pd.Series(np.select([is_internal, is_gov], ['Nội bộ', 'Gov-Hiệp hội'], 'Corporate'),
+                     index=projects_df.index)
+
+
+def pipeline_stage(status):
+    """Giai đoạn pipeline của một trạng thái, None nếu không thuộc pipeline"""
+    status = str(status)
+    for stage, statuses in PIPELINE_STAGES.items():
+        if any(s in status for s in statuses):
+            return stage
+    return None
+
+
+def add_margin_columns(revenue_df, cogs_ratio=0.826, operating_ratio=0.95):
+    """Bổ sung các cột COGS, lãi gộp, chi phí gián tiếp, lợi nhuận ròng còn thiếu (một lượt vector), trả về bảng mới"""
+    df = revenue_df.copy()
+    if 'Tổng doanh thu' not in df.columns:
+        df['Tổng doanh thu'] = df[CHANNELS].sum(axis=1)
+    if 'COGS' not in df.columns:
+        df['COGS'] = df['Tổng doanh thu'] * cogs_ratio
+    if 'Lãi gộp' not in df.columns:
+        df['Lãi gộp'] = df['Tổng doanh thu'] - df['COGS']
+    if 'Chi phí gián tiếp' not in df.columns:
+        df['Chi phí gián tiếp'] = df['Lãi gộp'] * operating_ratio
+    if 'Lợi nhuận ròng' not in df.columns:
+        df['Lợi nhuận ròng'] = df['Lãi gộp'] - df['Chi phí gián tiếp']
+
+    total = df['Tổng doanh thu'].replace(0, np.nan)
+    if 'Tỷ lệ lãi gộp (%)' not in df.columns:
+        df['Tỷ lệ lãi gộp (%)'] = (df['Lãi gộp'] / total * 100).fillna(0)
+    if 'Tỷ lệ lợi nhuận (%)' not in df.columns:
+        df['Tỷ lệ lợi nhuận (%)'] = (df['Lợi nhuận ròng'] / total * 100).fillna(0)
+    return df
+
+
+class RevenueCube:
+    """Cube tổng hợp doanh thu/chi phí/số dự án, cập nhật tăng dần theo từng dự án"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.cells = self._empty_cells()
+        self._rows = pd.DataFrame(columns=DIMENSIONS + MEASURES)
+        self._hashes = pd.Series(dtype='uint64')
+
+    @classmethod
+    def from_projects(cls, projects_df):
+        cube = cls()
+        cube.sync(projects_df)
+        return cube
+
+    @staticmethod
+    def _empty_cells():
+        index = pd.MultiIndex.from_arrays([[] for _ in DIMENSIONS], names=DIMENSIONS)
+        return pd.DataFrame({m: pd.Series(dtype='float64') for m in MEASURES}, index=index)
+
+    @staticmethod
+    def _prepare(projects_df):
+        """Chuẩn hóa dự án thành các dòng đóng góp, index = ID#thứ tự (phòng ID trùng)"""
+        df = projects_df
+        ids = df['ID'].astype(str)
+        keys = ids + '#' + ids.groupby(ids).cumcount().astype(str)
+
+        start = pd.to_datetime(df['Ngày bắt đầu'], errors='coerce')
+        status = df['Trạng thái'].astype(str)
+        stages = {s: pipeline_stage(s) for s in status.unique()}
+        csat = pd.to_numeric(df.get('CSAT', pd.Series(np.nan, index=df.index)), errors='coerce')
+        guests = pd.to_numeric(df.get('Số khách', pd.Series(np.nan, index=df.index)), errors='coerce')
+        rows = pd.DataFrame({
+            'Tháng': start.dt.to_period('M').dt.to_timestamp(),
+            'Kênh': classify_channel(df),
+            'Loại': df.get('Loại', pd.Series('', index=df.index)).astype(str),
+            'PIC': df.get('PIC', pd.Series('', index=df.index)).astype(str),
+            'Trạng thái': status,
+            'Doanh thu': pd.to_numeric(df['Doanh thu'], errors='coerce').fillna(0).astype(float),
+            'Chi phí': pd.to_numeric(df['Chi phí'], errors='coerce').fillna(0).astype(float),
+            'Số dự án': 1.0,
+            'Số thắng': (status.map(stages) == 'Won').astype(float),
+            'Tổng CSAT': csat.fillna(0).astype(float),
+            'Số CSAT': csat.notna().astype(float),
+            'Số khách': guests.fillna(0).astype(float),
+        })
+        rows.index = keys.to_numpy()
+        return rows
+
+    @staticmethod
+    def _aggregate(rows, sign):
+        return rows.groupby(DIMENSIONS, dropna=False)[MEASURES].sum() * sign
+
+    def _apply(self, removed_rows, added_rows):
+        parts = [self._aggregate(r, s) for r, s in ((removed_rows, -1), (added_rows, 1)) if len(r) > 0]
+        if not parts:
+            return
+        delta = pd.concat(parts).groupby(level=DIMENSIONS, dropna=False).sum()
+        cells = self.cells.add(delta, fill_value=0) if len(self.cells) > 0 else delta
+        self.cells = cells[cells['Số dự án'] != 0]
+        self.version += 1
+
+    def sync(self, projects_df):
+        """
+        Đồng bộ cube với bảng Projects hiện tại.
+        So sánh hash từng dòng để chỉ cộng/trừ các dự án mới, bị sửa hoặc bị xóa.
+        Trả về số dòng thay đổi.
+        """
+        if len(projects_df) == 0 or 'ID' not in projects_df.columns:
+            rows = pd.DataFrame(columns=DIMENSIONS + MEASURES)
+            hashes = pd.Series(dtype='uint64')
+        else:
+            rows = self._prepare(projects_df)
+            hashes = pd.Series(pd.util.hash_pandas_object(rows, index=False).to_numpy(), index=rows.index)
+
+        with self._lock:
+            common = hashes.index.intersection(self._hashes.index)
+            changed = common[hashes.loc[common].to_numpy() != self._hashes.loc[common].to_numpy()]
+            removed = changed.union(self._hashes.index.difference(hashes.index))
+            added = changed.union(hashes.index.difference(self._hashes.index))
+
+            self._apply(self._rows.loc[removed], rows.loc[added])
+            self._rows = rows
+            self._hashes = hashes
+        return len(removed.union(added))
+
+    def upsert(self, project):
+        """Thêm hoặc sửa một dự án (dict theo cột Projects) ngay sau khi lưu"""
+        row = self._prepare(pd.DataFrame([project]))
+        key = row.index[0]
+        with self._lock:
+            old = self._rows.loc[[key]] if key in self._hashes.index else self._rows.iloc[0:0]
+            self._apply(old, row)
+            rows = self._rows.drop(index=old.index)
+            hashes = self._hashes.drop(index=old.index)
+            row_hash = pd.Series(pd.util.hash_pandas_object(row, index=False).to_numpy(), index=row.index)
+            self._rows = pd.concat([rows, row]) if len(rows) > 0 else row
+            self._hashes = pd.concat([hashes, row_hash]) if len(hashes) > 0 else row_hash
+
+    def remove(self, project_id):
+        """Bỏ phần đóng góp của một dự án vừa bị xóa"""
+        key = f"{project_id}#0"
+        with self._lock:
+            if key not in self._hashes.index:
+                return
+            self._apply(self._rows.loc[[key]], self._rows.iloc[0:0])
+            self._rows = self._rows.drop(index=key)
+            self._hashes = self._hashes.drop(index=key)
+
+    # ---------- Đọc cube ----------
+
+    def slice(self, start=None, end=None, **filters):
+        """Các ô thỏa khoảng tháng [start, end] và bộ lọc chiều, vd. Kênh=['Corporate']"""
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        if start is not None or end is not None:
+            months = cells.index.get_level_values('Tháng')
+            if start is not None:
+                mask &= months >= pd.Timestamp(start)
+            if end is not None:
+                mask &= months <= pd.Timestamp(end)
+        for dim, values in filters.items():
+            mask &= cells.index.get_level_values(dim).isin(values)
+        return cells[mask]
+
+    def total(self, measure='Doanh thu', **kwargs):
+        return float(self.slice(**kwargs)[measure].sum())
+
+    def by(self, dims, measure='Doanh thu', **kwargs):
+        """Tổng `measure` theo một hoặc nhiều chiều"""
+        return self.slice(**kwargs)[measure].groupby(level=dims, dropna=False).sum()
+
+    def revenue_by_channel(self, **kwargs):
+        """Doanh thu theo tháng, mỗi kênh một cột, kèm cột 'Tổng DT'"""
+        cells = self.slice(**kwargs)
+        cells = cells[cells.index.get_level_values('Tháng').notna()]
+        table = cells['Doanh thu'].groupby(level=['Tháng', 'Kênh']).sum().unstack(fill_value=0)
+        table = table.reindex(columns=CHANNELS, fill_value=0).sort_index()
+        table.columns.name = None
+        revenue_data = table.reset_index()
+        revenue_data['Tổng DT'] = revenue_data[CHANNELS].sum(axis=1)
+        return revenue_data
+
+    def pipeline(self, **kwargs):
+        """Số dự án và giá trị (triệu) theo giai đoạn pipeline"""
+        by_status = self.slice(**kwargs)[['Số dự án', 'Doanh thu']].groupby(level='Trạng thái').sum()
+        stages = by_status.index.map(pipeline_stage)
+        by_stage = by_status.groupby(stages).sum().reindex(list(PIPELINE_STAGES), fill_value=0)
+        return pd.DataFrame({
+            'Stage': list(PIPELINE_STAGES),
+            'Count': by_stage['Số dự án'].astype(int).to_numpy(),
+            'Value': (by_stage['Doanh thu'] / 1_000_000).to_numpy()
+        })
+
+    def pic_summary(self, **kwargs):
+        """Doanh thu, số deal, tỷ lệ thắng (won / tổng), CSAT TB và kênh chính theo PIC"""
+        cells = self.slice(**kwargs)
+        if len(cells) == 0:
+            return pd.DataFrame({'Nhân viên': [], 'Doanh thu': [], 'Số deal': [], 'Số thắng': [],
+                                 'Conversion %': [], 'CSAT TB': [], 'Kênh': []})
+
+        by_pic = cells[['Doanh thu', 'Số dự án', 'Số thắng', 'Tổng CSAT', 'Số CSAT']].groupby(level='PIC').sum()
+        deals_by_channel = cells['Số dự án'].groupby(level=['PIC', 'Kênh']).sum()
+        main_channel = deals_by_channel.groupby(level='PIC').idxmax().map(lambda key: key[1])
+        return pd.DataFrame({
+            'Nhân viên': by_pic.index,
+            'Doanh thu': by_pic['Doanh thu'].to_numpy(),
+            'Số deal': by_pic['Số dự án'].astype(int).to_numpy(),
+            'Số thắng': by_pic['Số thắng'].astype(int).to_numpy(),
+            'Conversion %': (by_pic['Số thắng'] / by_pic['Số dự án'] * 100).round(1).to_numpy(),
+            'CSAT TB': (by_pic['Tổng CSAT'] / by_pic['Số CSAT'].replace(0, np.nan)).round(2).to_numpy(),
+            'Kênh': main_channel.reindex(by_pic.index).to_numpy()
+        })
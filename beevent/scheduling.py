@@ -0,0 +1,268 @@
+"""
+Engine lập lịch cho Timeline: phụ thuộc giữa các task, ES/EF/LS/LF, slack và critical path.
+
+Mỗi dự án (Project_ID) là một đồ thị độc lập. Ngày được quy về số ngày tính từ
+ngày bắt đầu sớm nhất của dự án; EF/LF là mốc "kết thúc loại trừ" (task kéo dài
+`dur` ngày thì EF = ES + dur), nên task sau được bắt đầu ngay tại EF của task trước.
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+DEPENDENCY_COLUMN = "Phụ thuộc"
+
+
+class CycleError(ValueError):
+    """Các task phụ thuộc vòng tròn nên không thể lập lịch"""
+
+
+def parse_predecessors(value):
+    """Tách chuỗi 'TML0001, TML0003' thành danh sách ID task trước"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [p.strip() for p in str(value).replace(';', ',').split(',') if p.strip()]
+
+
+def format_predecessors(ids):
+    """Ghép danh sách ID task trước để lưu vào cột Phụ thuộc"""
+    return ", ".join(str(i) for i in ids)
+
+
+class ProjectSchedule:
+    """Lịch CPM của một dự án, hỗ trợ cập nhật tăng dần khi một task bị dời"""
+
+    def __init__(self, project_id, tasks):
+        self.project_id = project_id
+        self.ids = tasks['ID'].astype(str).tolist()
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        n = len(self.ids)
+
+        starts = pd.to_datetime(tasks['Ngày bắt đầu'], errors='coerce')
+        ends = pd.to_datetime(tasks['Ngày kết thúc'], errors='coerce')
+        self.origin = starts.min() if starts.notna().any() else pd.Timestamp.today().normalize()
+        starts = starts.fillna(self.origin)
+        ends = ends.where(ends >= starts, starts)
+
+        self.planned = (starts - self.origin).dt.days.astype(int).tolist()
+        self.duration = ((ends - starts).dt.days + 1).astype(int).tolist()
+
+        # Task đã xong thì không bao giờ bị coi là trễ
+        status = tasks['Trạng thái'].astype(str) if 'Trạng thái' in tasks.columns else pd.Series('', index=tasks.index)
+        progress = pd.to_numeric(tasks['Tiến độ %'], errors='coerce').fillna(0) if 'Tiến độ %' in tasks.columns else pd.Series(0, index=tasks.index)
+        self.done = ((status == 'Hoàn thành') | (progress >= 100)).to_numpy()
+
+        # Cạnh phụ thuộc; ID không thuộc dự án được ghi lại thay vì báo lỗi
+        self.preds = [[] for _ in range(n)]
+        self.succs = [[] for _ in range(n)]
+        self.missing = []
+        raw_deps = tasks[DEPENDENCY_COLUMN].tolist() if DEPENDENCY_COLUMN in tasks.columns else [None] * n
+        for i, value in enumerate(raw_deps):
+            for pred_id in dict.fromkeys(parse_predecessors(value)):
+                j = self.index.get(pred_id)
+                if j is None or j == i:
+                    self.missing.append((self.ids[i], pred_id))
+                    continue
+                self.preds[i].append(j)
+                self.succs[j].append(i)
+
+        self.order = self._topological_order()
+        self.position = [0] * n
+        for pos, i in enumerate(self.order):
+            self.position[i] = pos
+
+        self.es = [0] * n
+        self.ef = [0] * n
+        self.ls = [0] * n
+        self.lf = [0] * n
+        self._forward(self.order)
+        self.finish = max(self.ef) if n else 0
+        self._backward(reversed(self.order))
+
+    def _topological_order(self):
+        """Sắp xếp topo theo Kahn, O(V + E)"""
+        indegree = [len(p) for p in self.preds]
+        queue = deque(i for i, d in enumerate(indegree) if d == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for s in self.succs[i]:
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    queue.append(s)
+
+        if len(order) < len(self.ids):
+            cyclic = [self.ids[i] for i, d in enumerate(indegree) if d > 0]
+            raise CycleError(f"Vòng lặp phụ thuộc trong dự án {self.project_id}: {', '.join(cyclic)}")
+        return order
+
+    def _forward(self, nodes):
+        """Forward pass: ES = max(ngày dự kiến, EF của các task trước)"""
+        for i in nodes:
+            start = self.planned[i]
+            for p in self.preds[i]:
+                if self.ef[p] > start:
+                    start = self.ef[p]
+            self.es[i] = start
+            self.ef[i] = start + self.duration[i]
+
+    def _backward(self, nodes):
+        """Backward pass (nodes theo thứ tự topo ngược): LF = min(LS của các task sau)"""
+        for i in nodes:
+            finish = self.finish
+            for s in self.succs[i]:
+                if self.ls[s] < finish:
+                    finish = self.ls[s]
+            self.lf[i] = finish
+            self.ls[i] = finish - self.duration[i]
+
+    def _reachable(self, start, edges):
+        """Tập task đi tới được từ `start` theo danh sách cạnh (gồm cả `start`)"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j in edges[i]:
+                if j not in seen:
+                    seen.add(j)
+                    stack.append(j)
+        return seen
+
+    def move_task(self, task_id, start, end):
+        """
+        Dời một task sang ngày mới và lan truyền thay đổi.
+
+        Forward pass chỉ chạy lại trên các task phía sau task bị dời. Backward pass
+        chỉ chạy lại toàn dự án khi ngày kết thúc dự án đổi; nếu không thì chỉ
+        các task phía trước (khi thời lượng thay đổi). Trả về list ID bị ảnh hưởng.
+        """
+        i = self.index[str(task_id)]
+        start = pd.Timestamp(start)
+        end = max(pd.Timestamp(end), start)
+        new_duration = (end - start).days + 1
+        duration_changed = new_duration != self.duration[i]
+        self.planned[i] = (start - self.origin).days
+        self.duration[i] = new_duration
+
+        key = self.position.__getitem__
+        downstream = sorted(self._reachable(i, self.succs), key=key)
+        before = {j: (self.es[j], self.ls[j]) for j in downstream}
+        self._forward(downstream)
+
+        old_finish = self.finish
+        self.finish = max(self.ef)
+        if self.finish != old_finish:
+            upstream = list(reversed(self.order))
+        elif duration_changed:
+            upstream = sorted(self._reachable(i, self.preds), key=key, reverse=True)
+        else:
+            upstream = []
+        for j in upstream:
+            before.setdefault(j, (self.es[j], self.ls[j]))
+        self._backward(upstream)
+
+        return [self.ids[j] for j in sorted(before, key=key) if before[j] != (self.es[j], self.ls[j])]
+
+    def critical_path(self):
+        """Các task có slack = 0, theo thứ tự ES"""
+        critical = [i for i in self.order if self.ls[i] == self.es[i]]
+        return [self.ids[i] for i in sorted(critical, key=lambda i: (self.es[i], self.position[i]))]
+
+    def finish_date(self):
+        """Ngày kết thúc sớm nhất của cả dự án"""
+        return self.origin + pd.Timedelta(days=self.finish - 1)
+
+    def to_frame(self, today=None):
+        """Bảng ES/EF/LS/LF, slack và cờ trễ hạn (tính toán) của từng task"""
+        today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+        es, ef = np.array(self.es, dtype=np.int64), np.array(self.ef, dtype=np.int64)
+        ls, lf = np.array(self.ls, dtype=np.int64), np.array(self.lf, dtype=np.int64)
+        planned = np.array(self.planned, dtype=np.int64)
+        planned_end = planned + np.array(self.duration, dtype=np.int64)
+        slack = ls - es
+        today_offset = (today - self.origin).days
+
+        def to_date(offsets):
+            return self.origin + pd.to_timedelta(offsets, unit='D')
+
+        return pd.DataFrame({
+            'ID': self.ids,
+            'Project_ID': self.project_id,
+            'Thời lượng (ngày)': self.duration,
+            'ES': to_date(es),
+            'EF': to_date(ef - 1),
+            'LS': to_date(ls),
+            'LF': to_date(lf - 1),
+            'Slack (ngày)': slack,
+            'Critical': slack == 0,
+            'Trễ hạn': ~self.done & ((ef > planned_end) | (today_offset >= planned_end)),
+        })
+
+
+class ScheduleEngine:
+    """Lịch CPM cho toàn bộ Timeline, mỗi Project_ID là một đồ thị riêng"""
+
+    def __init__(self, timeline_df):
+        self.projects = {}
+        self.task_project = {}
+        self.errors = {}
+
+        if len(timeline_df) == 0 or 'Project_ID' not in timeline_df.columns:
+            return
+
+        for project_id, tasks in timeline_df.groupby('Project_ID', sort=False):
+            try:
+                schedule = ProjectSchedule(project_id, tasks)
+            except CycleError as e:
+                self.errors[project_id] = str(e)
+                continue
+            self.projects[project_id] = schedule
+            for task_id in schedule.ids:
+                self.task_project[task_id] = project_id
+
+    def move_task(self, task_id, start, end):
+        """Dời task, chỉ tính lại dự án chứa task đó"""
+        project_id = self.task_project[str(task_id)]
+        return self.projects[project_id].move_task(task_id, start, end)
+
+    def critical_path(self, project_id):
+        return self.projects[project_id].critical_path() if project_id in self.projects else []
+
+    def missing_dependencies(self):
+        """Danh sách (task, ID phụ thuộc) không tìm thấy trong cùng dự án"""
+        return [pair for schedule in self.projects.values() for pair in schedule.missing]
+
+    def to_frame(self, project_id=None, today=None):
+        if project_id is not None:
+            schedules = [self.projects[project_id]] if project_id in self.projects else []
+        else:
+            schedules = list(self.projects.values())
+
+        if not schedules:
+            return pd.DataFrame(columns=['ID', 'Project_ID', 'Thời lượng (ngày)', 'ES', 'EF', 'LS', 'LF',
+                                         'Slack (ngày)', 'Critical', 'Trễ hạn'])
+        return pd.concat([s.to_frame(today) for s in schedules], ignore_index=True)
+
+
+def validate_dependencies(timeline_df, task_id, project_id, predecessors):
+    """
+    Kiểm tra phụ thuộc mới của một task trước khi lưu.
+    Raise CycleError nếu tạo vòng lặp, ValueError nếu phụ thuộc nằm ngoài dự án.
+    """
+    tasks = timeline_df[timeline_df['Project_ID'] == project_id]
+    outside = [p for p in predecessors if p not in set(tasks['ID'].astype(str))]
+    if outside:
+        raise ValueError(f"Task phụ thuộc không thuộc dự án {project_id}: {', '.join(outside)}")
+
+    tasks = tasks.copy()
+    if DEPENDENCY_COLUMN not in tasks.columns:
+        tasks[DEPENDENCY_COLUMN] = ""
+    mask = tasks['ID'].astype(str) == str(task_id)
+    if mask.any():
+        tasks.loc[mask, DEPENDENCY_COLUMN] = format_predecessors(predecessors)
+    else:
+        new_task = pd.DataFrame([{'ID': str(task_id), 'Project_ID': project_id,
+                                  DEPENDENCY_COLUMN: format_predecessors(predecessors)}])
+        tasks = pd.concat([tasks, new_task], ignore_index=True)
+    ProjectSchedule(project_id, tasks)
@@ -0,0 +1,146 @@
+"""
+Bảng đã tải dùng chung giữa các phiên Streamlit (single-flight).
+
+Mỗi phiên chạy script trong thread riêng: mười người mở Dashboard cùng lúc là mười lệnh
+load cùng một worksheet. Ở đây các lệnh đồng thời cho cùng (spreadsheet, worksheet,
+version) dùng chung một lần đọc đang chạy, và mọi phiên nhận về cùng một DataFrame
+(không pickle/copy như st.cache_data), nên bộ nhớ không tăng theo số phiên.
+
+Bảng giữ ở đây đã qua `freeze`: cột chuỗi nằm trong buffer Arrow (bất biến, không giữ một
+đối tượng Python cho mỗi ô). Bảng trả về là chỉ đọc: không sửa tại chỗ (`df[col] = ...`);
+trang lọc/thêm cột bằng `df[mask]`, `.assign(...)` (với copy-on-write của pandas, cột không
+đổi vẫn dùng chung bộ nhớ), cần sửa thì lấy `editable(df)`. Ghi/đồng bộ xong thì
+`invalidate` tăng version của bảng: lần đọc sau tải bản mới, lần đọc cũ đang chạy không
+được giữ lại.
+"""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    # Chuỗi Arrow với NaN cho ô thiếu (như kiểu str mặc định của pandas 3): to_numeric,
+    # where, so sánh... trả về kiểu numpy như cột object
+    ARROW_STRING = pd.StringDtype('pyarrow', na_value=np.nan)
+except TypeError:  # pandas < 2.3
+    ARROW_STRING = pd.StringDtype('pyarrow_numpy')
+
+
+def freeze(df):
+    """Bảng để dùng chung: cột object toàn chuỗi chuyển sang chuỗi Arrow, cột khác giữ nguyên"""
+    strings = [column for column in df.columns
+               if df[column].dtype == object and pd.api.types.infer_dtype(df[column], skipna=False) == 'string']
+    return df.astype({column: ARROW_STRING for column in strings}) if strings else df
+
+
+def editable(df):
+    """Bản sửa được của bảng dùng chung; với copy-on-write chỉ cột bị sửa mới được chép"""
+    return df.copy(deep=not pd.get_option('mode.copy_on_write'))
+
+
+class _Call:
+    """Một lần đọc đang chạy, các thread cùng key chờ kết quả của nó"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Gộp các lệnh đồng thời cùng key thành một lần gọi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Gọi fn() cho key, hoặc chờ lần gọi cùng key đang chạy. Trả về (kết quả, dùng chung):
+        dùng chung = True nếu chỉ chờ kết quả của thread khác. Lỗi của lần gọi được báo cho
+        mọi thread đang chờ.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class SharedTables:
+    """Bảng đã tải theo (spreadsheet, worksheet), giữ `ttl` giây, một bản cho mọi phiên"""
+
+    def __init__(self, ttl=60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._versions = {}   # (spreadsheet, worksheet) -> version
+        self._tables = {}     # (spreadsheet, worksheet) -> (version, lúc tải, DataFrame)
+        self.fetches = 0      # số lần đọc thật
+        self.coalesced = 0    # số lệnh chờ lần đọc của phiên khác
+        self.hits = 0         # số lệnh lấy bảng đã có
+
+    def version(self, spreadsheet_id, worksheet):
+        with self._lock:
+            return self._versions.get((spreadsheet_id, worksheet), 0)
+
+    def get(self, spreadsheet_id, worksheet, fetch):
+        """Bảng hiện tại của worksheet; hết hạn hoặc đã invalidate thì fetch() (một lần cho mọi phiên)"""
+        key = (spreadsheet_id, worksheet)
+        with self._lock:
+            version = self._versions.setdefault(key, 0)
+            cached = self._tables.get(key)
+            if cached is not None and cached[0] == version and time.time() - cached[1] < self.ttl:
+                self.hits += 1
+                return cached[2]
+
+        df, shared = self._flight.do(key + (version,), lambda: self._fetch(key, version, fetch))
+        if shared:
+            with self._lock:
+                self.coalesced += 1
+        return df
+
+    def _fetch(self, key, version, fetch):
+        fetched_at = time.time()
+        df = fetch()
+        with self._lock:
+            self.fetches += 1
+            # Bị invalidate trong lúc đọc: bản này có thể thiếu thay đổi mới, không giữ lại
+            if self._versions[key] == version:
+                self._tables[key] = (version, fetched_at, df)
+        return df
+
+    def invalidate(self, spreadsheet_id=None, worksheet=None):
+        """Bỏ bảng đã giữ (theo spreadsheet và/hoặc worksheet, mặc định tất cả) và tăng version"""
+        with self._lock:
+            for key in list(self._versions):
+                if (spreadsheet_id is None or key[0] == spreadsheet_id) and (worksheet is None or key[1] == worksheet):
+                    self._versions[key] += 1
+                    self._tables.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'tables': len(self._tables), 'fetches': self.fetches, 'coalesced': self.coalesced,
+                    'hits': self.hits, 'in_flight': self._flight.in_flight()}
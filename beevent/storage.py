@@ -0,0 +1,328 @@
+"""
+Kho dữ liệu (repository) cho các bảng Projects, Staff, Timeline, Customers, Finance, Members.
+
+Cùng một giao diện load / insert / insert_many / update / delete / query / ids cho hai
+backend, chọn bằng `storage_backend` trong secrets:
+- SheetsRepository: Google Sheets; ghi qua hàng đợi write-behind (deferred = True), đọc
+  bằng get_all_records.
+- SQLiteRepository: file SQLite cục bộ; ghi ngay, có index trên ID, Project_ID và các
+  cột ngày, query lọc trong SQL nên không bị giới hạn quota/số ô của spreadsheet.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from beevent.importer import IMPORT_SCHEMAS, IMPORT_CHUNK_SIZE, append_in_chunks
+from beevent.lazy import lazy_import
+
+gspread = lazy_import('gspread')
+
+TABLES = {name: schema["headers"] for name, schema in IMPORT_SCHEMAS.items()}
+TABLES["Members"] = ['ID', 'Họ và tên', 'Chức vụ', 'Email', 'Số điện thoại', 'Ngày vào', 'Trạng thái']
+
+KEY_COLUMN = "ID"
+INDEXED_COLUMNS = ["ID", "Project_ID", "Ngày bắt đầu", "Ngày kết thúc", "Ngày", "Ngày vào"]
+
+# Loại thay đổi cục bộ được theo dõi
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+BACKENDS = ("sheets", "sqlite")
+DEFAULT_SQLITE_PATH = os.path.join('.beevent', 'beevent.sqlite3')
+
+
+def _filter_frame(df, filters=None, between=None):
+    """Lọc DataFrame: filters {cột: giá trị | list}, between {cột: (từ, đến)} (so sánh chuỗi, ngày ISO)"""
+    mask = pd.Series(True, index=df.index)
+    for column, value in (filters or {}).items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        mask &= df[column].astype(str).isin([str(v) for v in values])
+    for column, (low, high) in (between or {}).items():
+        text = df[column].astype(str)
+        if low is not None:
+            mask &= text >= str(low)
+        if high is not None:
+            mask &= text <= str(high)
+    return df[mask].reset_index(drop=True)
+
+
+class Repository:
+    """Giao diện chung của kho dữ liệu theo bảng"""
+
+    # True nếu ghi chạy nền (kết quả chưa có ngay khi load lại)
+    deferred = False
+
+    def load(self, table):
+        """Toàn bộ bảng dạng DataFrame (bảng trống vẫn có đủ cột)"""
+        raise NotImplementedError
+
+    def insert(self, table, record, label=None):
+        raise NotImplementedError
+
+    def insert_many(self, table, records, progress=None):
+        """Thêm nhiều bản ghi theo lô, gọi progress(đã ghi, tổng) sau mỗi lô"""
+        raise NotImplementedError
+
+    def update(self, table, key, values, label=None):
+        raise NotImplementedError
+
+    def delete(self, table, key, label=None):
+        raise NotImplementedError
+
+    def ids(self, table):
+        """Các ID đang có trong bảng"""
+        raise NotImplementedError
+
+    def counts(self, tables):
+        """Số bản ghi của từng bảng"""
+        return {table: len(self.load(table)) for table in tables}
+
+    def query(self, table, filters=None, between=None):
+        """Các dòng khớp filters {cột: giá trị | list} và between {cột: (từ, đến)}"""
+        return _filter_frame(self.load(table), filters, between)
+
+
+class SheetsRepository(Repository):
+    """Google Sheets: mỗi bảng một worksheet, ghi qua hàng đợi write-behind"""
+
+    deferred = True
+
+    def __init__(self, spreadsheet, write_queue):
+        self.spreadsheet = spreadsheet
+        self.write_queue = write_queue
+        write_queue.register(spreadsheet)
+
+    def _worksheet(self, table):
+        try:
+            return self.spreadsheet.worksheet(table)
+        except gspread.exceptions.WorksheetNotFound:
+            ws = self.spreadsheet.add_worksheet(title=table, rows="1000", cols="20")
+            ws.append_row(TABLES[table])
+            return ws
+
+    def load(self, table):
+        ws = self._worksheet(table)
+        data = ws.get_all_records()
+        header = list(data[0]) if data else ws.row_values(1)
+        # Sheet tạo trước khi bảng có thêm cột (vd. Phụ thuộc của Timeline): bổ sung header
+        # (cột ghi theo vị trí trước đây không có tên) rồi đọc lại để có cột đó
+        missing = [c for c in TABLES.get(table, ()) if c not in header]
+        if missing:
+            header = ws.row_values(1) + missing
+            ws.update([header], 'A1')
+            data = ws.get_all_records()
+        if not data:
+            return pd.DataFrame(columns=header)
+        return pd.DataFrame(data)
+
+    def insert(self, table, record, label=None):
+        return self.write_queue.append(self.spreadsheet, table, record=record, headers=TABLES[table], label=label)
+
+    def insert_many(self, table, records, progress=None):
+        # Import hàng loạt ghi trực tiếp theo lô (không qua hàng đợi) để báo tiến độ
+        ws = self._worksheet(table)
+        header = ws.row_values(1)
+        missing = [c for c in dict.fromkeys(c for r in records for c in r) if c not in header]
+        if missing:
+            header = header + missing
+            ws.update([header], 'A1')
+        rows = [[record.get(h, '') for h in header] for record in records]
+        return append_in_chunks(ws, rows, progress=progress)
+
+    def update(self, table, key, values, label=None):
+        return self.write_queue.update(self.spreadsheet, table, key, values, label=label)
+
+    def delete(self, table, key, label=None):
+        return self.write_queue.delete(self.spreadsheet, table, key, label=label)
+
+    def ids(self, table):
+        ws = self._worksheet(table)
+        header = ws.row_values(1)
+        return ws.col_values(header.index(KEY_COLUMN) + 1)[1:] if KEY_COLUMN in header else []
+
+    def counts(self, tables):
+        # Một lệnh đọc cột A của các bảng thay vì tải cả bảng
+        try:
+            ranges = self.spreadsheet.values_batch_get([f"'{table}'!A:A" for table in tables])['valueRanges']
+        except gspread.exceptions.APIError:
+            return super().counts(tables)
+        return {table: max(0, len(r.get('values', [])) - 1) for table, r in zip(tables, ranges)}
+
+
+def _sql_value(value):
+    """numpy scalar / ngày -> kiểu SQLite"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SQLiteRepository(Repository):
+    """
+    SQLite cục bộ. Cột không khai báo kiểu nên giá trị giữ nguyên kiểu khi ghi (số vẫn
+    là số, chuỗi vẫn là chuỗi) giống dữ liệu đọc từ sheet; cột mới được thêm khi cần.
+    track_changes=True: mỗi lần ghi lưu (bảng, ID, thời điểm) vào _changes để đồng bộ
+    hai chiều chỉ xét các dòng đã đổi (xem beevent.sync).
+    """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, track_changes=False):
+        self.path = path
+        self.track_changes = track_changes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute("CREATE TABLE IF NOT EXISTS _changes (tbl TEXT NOT NULL, id TEXT NOT NULL, "
+                         "op TEXT NOT NULL, modified_at REAL NOT NULL, PRIMARY KEY (tbl, id))")
+        self._lock = threading.Lock()
+        self._columns = {}
+        for table, headers in TABLES.items():
+            self._ensure_table(table, headers)
+
+    def _ensure_table(self, table, columns):
+        """Tạo bảng/index nếu chưa có và thêm các cột còn thiếu; trả về danh sách cột"""
+        with self._lock:
+            known = self._columns.get(table)
+            if known is None:
+                self._db.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({', '.join(_quote(c) for c in TABLES.get(table, columns))})")
+                known = [row[1] for row in self._db.execute(f"PRAGMA table_info({_quote(table)})")]
+            missing = [c for c in dict.fromkeys(columns) if c not in known]
+            for column in missing:
+                self._db.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+            if table not in self._columns or missing:
+                known = known + missing
+                for column in INDEXED_COLUMNS:
+                    if column in known:
+                        self._db.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table}_{column}')} "
+                                         f"ON {_quote(table)} ({_quote(column)})")
+                self._columns[table] = known
+            return known
+
+    def _read(self, sql, params=()):
+        # Đọc bằng cursor để giữ nguyên kiểu từng ô (không ép cả cột sang float khi có ô trống)
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            rows = cursor.fetchall()
+        columns = [c[0] for c in cursor.description]
+        return pd.DataFrame([['' if v is None else v for v in row] for row in rows], columns=columns)
+
+    def load(self, table):
+        self._ensure_table(table, TABLES.get(table, []))
+        return self._read(f"SELECT * FROM {_quote(table)} ORDER BY rowid")
+
+    def insert(self, table, record, label=None):
+        self.insert_many(table, [record])
+
+    def insert_many(self, table, records, progress=None):
+        columns = self._ensure_table(table, [c for r in records for c in r])
+        sql = f"INSERT INTO {_quote(table)} ({', '.join(map(_quote, columns))}) VALUES ({', '.join('?' * len(columns))})"
+        total = len(records)
+        for offset in range(0, total, IMPORT_CHUNK_SIZE):
+            chunk = records[offset:offset + IMPORT_CHUNK_SIZE]
+            with self._lock:
+                self._db.execute('BEGIN')
+                self._db.executemany(sql, [[_sql_value(r.get(c, '')) for c in columns] for r in chunk])
+                self._track(table, [r.get(KEY_COLUMN, '') for r in chunk], UPSERT)
+                self._db.execute('COMMIT')
+            if progress is not None:
+                progress(offset + len(chunk), total)
+        return total
+
+    def update(self, table, key, values, label=None):
+        self._ensure_table(table, list(values))
+        assignments = ', '.join(f"{_quote(c)} = ?" for c in values)
+        with self._lock:
+            self._db.execute(f"UPDATE {_quote(table)} SET {assignments} WHERE {_quote(KEY_COLUMN)} = ?",
+                             [_sql_value(v) for v in values.values()] + [str(key)])
+            self._track(table, [key], UPSERT)
+
+    def delete(self, table, key, label=None):
+        with self._lock:
+            self._db.execute(f"DELETE FROM {_quote(table)} WHERE {_quote(KEY_COLUMN)} = ?", (str(key),))
+            self._track(table, [key], DELETE)
+
+    # ---------- Theo dõi thay đổi (đồng bộ hai chiều) ----------
+
+    def _track(self, table, keys, op):
+        """Ghi nhận thay đổi cục bộ (gọi trong lock)"""
+        if self.track_changes:
+            now = time.time()
+            self._db.executemany("INSERT OR REPLACE INTO _changes (tbl, id, op, modified_at) VALUES (?, ?, ?, ?)",
+                                 [(table, str(k), op, now) for k in keys if str(k)])
+
+    def changes(self, table):
+        """{ID: (op, modified_at)} các dòng đã đổi cục bộ từ lần đồng bộ trước"""
+        with self._lock:
+            rows = self._db.execute("SELECT id, op, modified_at FROM _changes WHERE tbl = ?", (table,)).fetchall()
+        return {key: (op, modified_at) for key, op, modified_at in rows}
+
+    def clear_changes(self, table, changes):
+        """Bỏ các thay đổi đã đồng bộ (giữ lại nếu dòng bị sửa tiếp sau thời điểm đã đọc)"""
+        with self._lock:
+            self._db.executemany("DELETE FROM _changes WHERE tbl = ? AND id = ? AND modified_at <= ?",
+                                 [(table, key, modified_at) for key, (_, modified_at) in changes.items()])
+
+    def apply_remote(self, table, upserts, deletes):
+        """Áp thay đổi lấy từ nơi khác (không ghi nhận là thay đổi cục bộ): thay cả dòng theo ID, xóa theo ID"""
+        columns = self._ensure_table(table, [c for r in upserts for c in r])
+        keys = [str(r[KEY_COLUMN]) for r in upserts] + [str(k) for k in deletes]
+        insert = f"INSERT INTO {_quote(table)} ({', '.join(map(_quote, columns))}) VALUES ({', '.join('?' * len(columns))})"
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.executemany(f"DELETE FROM {_quote(table)} WHERE {_quote(KEY_COLUMN)} = ?", [(k,) for k in keys])
+            self._db.executemany(insert, [[_sql_value(r.get(c, '')) for c in columns] for r in upserts])
+            self._db.execute('COMMIT')
+
+    def ids(self, table):
+        with self._lock:
+            return [row[0] for row in self._db.execute(f"SELECT {_quote(KEY_COLUMN)} FROM {_quote(table)}")]
+
+    def counts(self, tables):
+        for table in tables:
+            self._ensure_table(table, TABLES.get(table, []))
+        with self._lock:
+            return {table: self._db.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0] for table in tables}
+
+    def query(self, table, filters=None, between=None):
+        columns = self._ensure_table(table, TABLES.get(table, []))
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            if column not in columns:
+                return self.load(table).iloc[0:0]
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params += [_sql_value(v) for v in values]
+        for column, (low, high) in (between or {}).items():
+            if low is not None:
+                clauses.append(f"{_quote(column)} >= ?")
+                params.append(_sql_value(low))
+            if high is not None:
+                clauses.append(f"{_quote(column)} <= ?")
+                params.append(_sql_value(high))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._read(f"SELECT * FROM {_quote(table)}{where} ORDER BY rowid", params)
+
+
+def copy_tables(source, target, tables=None, progress=None):
+    """
+    Chép các bảng từ kho này sang kho khác (vd. Google Sheets -> SQLite), bỏ qua ID đã có
+    ở kho đích nên chạy lại không tạo trùng. Trả về {bảng: số dòng đã chép}.
+    """
+    copied = {}
+    for table in tables or TABLES:
+        existing = set(map(str, target.ids(table)))
+        records = [r for r in source.load(table).to_dict('records') if str(r.get(KEY_COLUMN, '')) not in existing]
+        if records:
+            target.insert_many(table, records)
+        copied[table] = len(records)
+        if progress is not None:
+            progress(table, len(records))
+    return copied
@@ -0,0 +1,308 @@
+"""
+Đồng bộ hai chiều giữa kho SQLite cục bộ và Google Sheet.
+
+App đọc/ghi SQLite (nhanh, không tốn quota); nhân viên vẫn có thể sửa thẳng trên sheet.
+Mỗi lượt đồng bộ:
+- Kéo về: đọc tất cả các bảng bằng một lệnh `values_batch_get`, so hash từng dòng theo ID
+  với hash lần đồng bộ trước; chỉ các ID khác hash (thêm/sửa/xóa trên sheet) được áp vào
+  SQLite. Sheet không đổi từ lượt trước (modifiedTime của Drive) thì bỏ qua bước đọc.
+- Đẩy lên: các dòng đổi cục bộ (bảng _changes của SQLiteRepository) gửi theo lô: một
+  `batch_update` cho các dòng sửa, một `append_rows` cho dòng mới, một request xóa.
+- Xung đột (cùng ID đổi ở cả hai phía): bản có thời điểm sửa sau thắng. Phía cục bộ dùng
+  thời điểm ghi; phía sheet dùng cột "Cập nhật lúc" nếu người sửa cập nhật nó, không thì
+  coi như vừa sửa lúc phát hiện.
+
+Chi phí ghi (SQLite và API) tỉ lệ với số dòng thay đổi, không theo kích thước sheet.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from beevent.lazy import lazy_import
+from beevent.rate_limit import LOW, priority
+from beevent.storage import DELETE, KEY_COLUMN, TABLES
+
+gspread = lazy_import('gspread')
+
+MODIFIED_COLUMN = "Cập nhật lúc"
+MODIFIED_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_STATE_PATH = os.path.join('.beevent', 'sync_state.sqlite3')
+# Số ID mỗi lần query SQLite (giới hạn số tham số của một câu lệnh)
+QUERY_CHUNK = 900
+
+
+def _normalize(value):
+    """Giá trị ô về chuỗi so sánh được giữa sheet (UNFORMATTED_VALUE) và SQLite"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def row_hash(record):
+    """Hash nội dung một dòng: bỏ ô trống và cột thời điểm sửa, không phụ thuộc thứ tự cột"""
+    items = sorted((str(c), _normalize(v)) for c, v in record.items() if c != MODIFIED_COLUMN and _normalize(v) != '')
+    return hashlib.blake2b(repr(items).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _timestamp(value):
+    try:
+        return datetime.strptime(str(value), MODIFIED_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def _stamp(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime(MODIFIED_FORMAT)
+
+
+class SyncEngine:
+    """Đồng bộ các bảng giữa một SQLiteRepository (track_changes=True) và spreadsheet"""
+
+    def __init__(self, spreadsheet, local, state_path=DEFAULT_STATE_PATH, tables=None, interval=60.0):
+        self.spreadsheet = spreadsheet
+        self.local = local
+        self.tables = list(tables or TABLES)
+        self.interval = interval
+        self.last_report = None
+        self.last_error = None
+        self.last_synced_at = None
+
+        if os.path.dirname(state_path):
+            os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        self._db = sqlite3.connect(state_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("CREATE TABLE IF NOT EXISTS rows (tbl TEXT NOT NULL, id TEXT NOT NULL, "
+                         "hash TEXT NOT NULL, modified TEXT, PRIMARY KEY (tbl, id))")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._listeners = {}
+        self._worker = None
+        self._worksheets = None
+
+    def add_listener(self, callback, name=None):
+        """callback(report) sau lượt đồng bộ có kéo dữ liệu về (vd. xóa cache); cùng tên thì thay"""
+        self._listeners[name or callback.__qualname__] = callback
+
+    # ---------- Trạng thái lần đồng bộ trước ----------
+
+    def _meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _state(self, table):
+        return {key: (digest, modified) for key, digest, modified
+                in self._db.execute("SELECT id, hash, modified FROM rows WHERE tbl = ?", (table,))}
+
+    def _save_state(self, table, new_state):
+        self._db.execute('BEGIN')
+        self._db.executemany("DELETE FROM rows WHERE tbl = ? AND id = ?",
+                             [(table, key) for key, value in new_state.items() if value is None])
+        self._db.executemany("INSERT OR REPLACE INTO rows (tbl, id, hash, modified) VALUES (?, ?, ?, ?)",
+                             [(table, key, *value) for key, value in new_state.items() if value is not None])
+        self._db.execute('COMMIT')
+
+    # ---------- Sheet ----------
+
+    def _remote_version(self):
+        """modifiedTime của file (một request nhỏ qua Drive API), None nếu không lấy được"""
+        try:
+            return self.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    def _worksheet(self, table):
+        if self._worksheets is None:
+            self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+        if table not in self._worksheets:
+            ws = self.spreadsheet.add_worksheet(title=table, rows="1000", cols="20")
+            ws.append_row(TABLES[table])
+            self._worksheets[table] = ws
+        return self._worksheets[table]
+
+    def _read_remote(self):
+        """{bảng: (header, {ID: (số dòng, record)})} đọc bằng một request cho mọi bảng"""
+        for table in self.tables:
+            self._worksheet(table)
+        response = self.spreadsheet.values_batch_get(
+            [f"'{table}'" for table in self.tables],
+            params={'valueRenderOption': 'UNFORMATTED_VALUE', 'dateTimeRenderOption': 'FORMATTED_STRING'},
+        )
+        remote = {}
+        for table, value_range in zip(self.tables, response.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            header = [str(h) for h in values[0]] if values else list(TABLES[table])
+            rows = {}
+            for number, row in enumerate(values[1:], start=2):
+                record = {h: (row[i] if i < len(row) else '') for i, h in enumerate(header)}
+                key = _normalize(record.get(KEY_COLUMN, ''))
+                if key:
+                    rows[key] = (number, record)
+            remote[table] = (header, rows)
+        return remote
+
+    def _push(self, table, header, updates, appends, deletes):
+        """Ghi lên sheet theo lô: sửa dòng -> một batch_update, xóa -> một request, thêm -> một append_rows"""
+        if not (updates or appends or deletes):
+            return
+        ws = self._worksheet(table)
+        columns = [c for record in [r for _, r in updates] + appends for c in record]
+        missing = [c for c in dict.fromkeys(columns) if c not in header]
+        if missing:
+            header = header + missing
+            ws.update([header], 'A1')
+        if updates:
+            ws.batch_update([
+                {'range': f"{gspread.utils.rowcol_to_a1(number, 1)}:"
+                          f"{gspread.utils.rowcol_to_a1(number, len(header))}",
+                 'values': [[record.get(h, '') for h in header]]}
+                for number, record in updates
+            ])
+        if deletes:
+            self.spreadsheet.batch_update({'requests': [
+                {'deleteDimension': {'range': {'sheetId': ws.id, 'dimension': 'ROWS', 'startIndex': number - 1, 'endIndex': number}}}
+                for number in sorted(set(deletes), reverse=True)
+            ]})
+        if appends:
+            ws.append_rows([[record.get(h, '') for h in header] for record in appends])
+
+    # ---------- Đồng bộ ----------
+
+    def _local_rows(self, table, keys):
+        keys = list(keys)
+        rows = {}
+        for offset in range(0, len(keys), QUERY_CHUNK):
+            frame = self.local.query(table, filters={KEY_COLUMN: keys[offset:offset + QUERY_CHUNK]})
+            rows.update((_normalize(r[KEY_COLUMN]), r) for r in frame.to_dict('records'))
+        return rows
+
+    def _sync_table(self, table, header, remote_rows, now):
+        state = self._state(table)
+        local_changes = self.local.changes(table)
+        remote_changed = {key for key, (_, record) in remote_rows.items()
+                          if key not in state or row_hash(record) != state[key][0]}
+        remote_deleted = {key for key in state if key not in remote_rows}
+        candidates = remote_changed | remote_deleted | set(local_changes)
+        local_rows = self._local_rows(table, candidates)
+
+        pull_upserts, pull_deletes = [], []
+        push_updates, push_appends, push_deletes = [], [], []
+        new_state = {}
+        conflicts = pulled = 0
+
+        for key in candidates:
+            number, remote_record = remote_rows.get(key, (None, None))
+            local_record = local_rows.get(key)
+            local_op, local_at = local_changes.get(key, (None, None))
+            if local_op == DELETE:
+                local_record = None
+
+            if local_op is not None and (key in remote_changed or key in remote_deleted):
+                same = (local_record is None and remote_record is None) or (
+                    local_record is not None and remote_record is not None and row_hash(local_record) == row_hash(remote_record))
+                if same:
+                    new_state[key] = None if remote_record is None else (row_hash(remote_record), remote_record.get(MODIFIED_COLUMN, ''))
+                    continue
+                conflicts += 1
+                # Sheet sửa tay không cập nhật "Cập nhật lúc" (hoặc bị xóa): coi như sửa lúc phát hiện
+                remote_modified = remote_record.get(MODIFIED_COLUMN, '') if remote_record is not None else ''
+                remote_at = _timestamp(remote_modified) if remote_modified != state.get(key, (None, ''))[1] else None
+                local_wins = local_at > (remote_at if remote_at is not None else now)
+            else:
+                local_wins = local_op is not None
+
+            if local_wins:
+                if local_record is None:
+                    if number is not None:
+                        push_deletes.append(number)
+                    new_state[key] = None
+                    continue
+                stamp = _stamp(local_at)
+                record = {**(remote_record or {}), **local_record, MODIFIED_COLUMN: stamp}
+                pull_upserts.append(record)
+                if number is not None:
+                    push_updates.append((number, record))
+                else:
+                    push_appends.append(record)
+                new_state[key] = (row_hash(record), stamp)
+            elif remote_record is None:
+                if local_record is not None:
+                    pull_deletes.append(key)
+                    pulled += 1
+                new_state[key] = None
+            else:
+                pull_upserts.append(remote_record)
+                pulled += 1
+                new_state[key] = (row_hash(remote_record), remote_record.get(MODIFIED_COLUMN, ''))
+
+        self._push(table, header, push_updates, push_appends, push_deletes)
+        if pull_upserts or pull_deletes:
+            self.local.apply_remote(table, pull_upserts, pull_deletes)
+        self.local.clear_changes(table, local_changes)
+        self._save_state(table, new_state)
+        return {'pulled': pulled, 'pushed': len(push_updates) + len(push_appends) + len(push_deletes),
+                'conflicts': conflicts}
+
+    def sync(self, force=False):
+        """
+        Một lượt đồng bộ tất cả các bảng. Trả về {bảng: {'pulled', 'pushed', 'conflicts'}},
+        rỗng nếu sheet và kho cục bộ đều không đổi từ lượt trước.
+        """
+        with self._lock:
+            now = time.time()
+            version = self._remote_version()
+            local_dirty = any(self.local.changes(table) for table in self.tables)
+            if not force and not local_dirty and version is not None and version == self._meta('remote_version'):
+                self.last_synced_at = now
+                return {}
+
+            remote = self._read_remote()
+            report = {}
+            for table in self.tables:
+                header, rows = remote[table]
+                report[table] = self._sync_table(table, header, rows, now)
+
+            # Vừa ghi lên sheet thì modifiedTime đổi: lượt sau đọc lại để so hash
+            pushed = any(r['pushed'] for r in report.values())
+            self._set_meta('remote_version', None if pushed else version)
+            self.last_report, self.last_error, self.last_synced_at = report, None, now
+
+        if any(r['pulled'] for r in report.values()):
+            for callback in list(self._listeners.values()):
+                try:
+                    callback(report)
+                except Exception:
+                    pass
+        return report
+
+    # ---------- Worker ----------
+
+    def request_sync(self):
+        """Đồng bộ sớm ở vòng sau của worker (vd. vừa ghi cục bộ)"""
+        self._wake.set()
+
+    def start(self):
+        """Chạy worker đồng bộ định kỳ (một lần cho mỗi engine)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='beevent-sync', daemon=True)
+            self._worker.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                # Đồng bộ nền nhường quota cho thao tác của người dùng
+                with priority(LOW):
+                    self.sync()
+            except Exception as error:
+                # Lỗi mạng/quota: trạng thái chưa đổi, thử lại ở vòng sau
+                self.last_error = str(error)
+            self._wake.wait(self.interval)
+            self._wake.clear()
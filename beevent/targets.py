@@ -0,0 +1,164 @@
+"""
+Bảng kế hoạch (KH): giá trị mục tiêu theo tháng, kênh và chỉ tiêu.
+
+Dạng dài: mỗi dòng là (Tháng, Kênh, Chỉ tiêu, Giá trị). Kênh 'Tất cả' là mục
+tiêu toàn công ty; chỉ tiêu tiền tệ tính bằng triệu VNĐ (M). Nếu một chỉ tiêu có
+dòng theo từng kênh thì các dòng đó được dùng (cộng theo kênh đang lọc), ngược lại
+dùng dòng 'Tất cả'.
+"""
+import pandas as pd
+
+ALL_CHANNELS = 'Tất cả'
+TARGET_COLUMNS = ['Tháng', 'Kênh', 'Chỉ tiêu', 'Giá trị']
+
+# Chỉ tiêu năm mặc định (KH 2026) và đơn vị
+DEFAULT_ANNUAL_TARGETS = {
+    'Doanh thu': 80000,
+    'Lãi gộp': 13920,
+    'Chi phí VH': 13838,
+    'LNTT': 82,
+    'Số dự án': 120,
+    'CSAT TB': 4.2,
+}
+TARGET_KPIS = list(DEFAULT_ANNUAL_TARGETS)
+TARGET_UNITS = {'Doanh thu': 'M', 'Lãi gộp': 'M', 'Chi phí VH': 'M', 'LNTT': 'M', 'Số dự án': 'dự án', 'CSAT TB': 'điểm'}
+
+# Chỉ tiêu dạng trung bình (không cộng dồn theo tháng)
+AVERAGED_KPIS = {'CSAT TB'}
+
+# Hậu tố cột số ước tính (chưa có số thực tế) trong kết quả plan_vs_actual, vd. 'LNTT ước tính'
+ESTIMATE_SUFFIX = 'ước tính'
+
+
+def default_targets(year, annual_targets=None):
+    """Bảng KH theo tháng của một năm, chia đều chỉ tiêu năm cho 12 tháng"""
+    annual_targets = annual_targets or DEFAULT_ANNUAL_TARGETS
+    months = pd.date_range(f'{int(year)}-01-01', periods=12, freq='MS')
+    rows = [
+        (month, ALL_CHANNELS, kpi, value if kpi in AVERAGED_KPIS else value / 12)
+        for kpi, value in annual_targets.items()
+        for month in months
+    ]
+    return pd.DataFrame(rows, columns=TARGET_COLUMNS)
+
+
+def normalize_targets(targets_df):
+    """Chuẩn hóa kiểu dữ liệu của bảng KH đọc từ sheet"""
+    df = targets_df.reindex(columns=TARGET_COLUMNS).copy()
+    df['Tháng'] = pd.to_datetime(df['Tháng'], errors='coerce').dt.to_period('M').dt.to_timestamp()
+    df['Kênh'] = df['Kênh'].fillna('').astype(str).str.strip().replace('', ALL_CHANNELS)
+    df['Chỉ tiêu'] = df['Chỉ tiêu'].astype(str).str.strip()
+    df['Giá trị'] = pd.to_numeric(df['Giá trị'], errors='coerce').fillna(0)
+    return df[df['Tháng'].notna() & (df['Chỉ tiêu'] != '')].reset_index(drop=True)
+
+
+def _plan_rows(targets_df, start=None, end=None, channels=None):
+    """Các dòng KH dùng cho kỳ [start, end]: theo kênh nếu chỉ tiêu có KH theo kênh, ngược lại 'Tất cả'"""
+    df = targets_df
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['Tháng'] >= pd.Timestamp(start).to_period('M').to_timestamp()
+    if end is not None:
+        mask &= df['Tháng'] <= pd.Timestamp(end)
+    df = df[mask]
+
+    is_channel_row = df['Kênh'] != ALL_CHANNELS
+    has_channel_plan = is_channel_row.groupby(df['Chỉ tiêu']).transform('any')
+    keep = (has_channel_plan & is_channel_row) | (~has_channel_plan & ~is_channel_row)
+    if channels is not None:
+        keep &= ~is_channel_row | df['Kênh'].isin(channels)
+    return df[keep]
+
+
+def monthly_plan(targets_df, start=None, end=None, channels=None):
+    """KH theo tháng: index = Tháng, mỗi chỉ tiêu một cột"""
+    rows = _plan_rows(targets_df, start, end, channels)
+    summed = rows[~rows['Chỉ tiêu'].isin(AVERAGED_KPIS)].pivot_table(
+        index='Tháng', columns='Chỉ tiêu', values='Giá trị', aggfunc='sum')
+    averaged = rows[rows['Chỉ tiêu'].isin(AVERAGED_KPIS)].pivot_table(
+        index='Tháng', columns='Chỉ tiêu', values='Giá trị', aggfunc='mean')
+    plan = pd.concat([summed, averaged], axis=1)
+    plan.columns.name = None
+    return plan.sort_index()
+
+
+def monthly_targets(targets_df, kpi, start=None, end=None, channels=None):
+    """Giá trị KH theo tháng của một chỉ tiêu trong [start, end]"""
+    plan = monthly_plan(targets_df, start, end, channels)
+    return plan[kpi].dropna() if kpi in plan.columns else pd.Series(dtype='float64')
+
+
+def targets_for_period(targets_df, start=None, end=None, channels=None):
+    """Tổng KH của từng chỉ tiêu trong kỳ (trung bình với chỉ tiêu dạng điểm)"""
+    plan = monthly_plan(targets_df, start, end, channels)
+    return {
+        kpi: float(plan[kpi].mean() if kpi in AVERAGED_KPIS else plan[kpi].sum())
+        for kpi in plan.columns
+    }
+
+
+def plan_vs_actual(targets_df, actual_monthly, start, end, channels=None):
+    """
+    Ghép KH và TH theo tháng của kỳ bằng một phép join.
+    actual_monthly: index = Tháng, mỗi chỉ tiêu một cột.
+    Kết quả: index = Tháng (đủ các tháng trong kỳ), cột '<chỉ tiêu> KH' và '<chỉ tiêu> TH'.
+    """
+    months = pd.date_range(pd.Timestamp(start).to_period('M').to_timestamp(), pd.Timestamp(end), freq='MS')
+    plan = monthly_plan(targets_df, start, end, channels).reindex(months)
+    actual = actual_monthly.reindex(months)
+
+    joined = plan.add_suffix(' KH').join(actual.add_suffix(' TH'))
+    summed = [c for c in joined.columns if c.rsplit(' ', 1)[0] not in AVERAGED_KPIS]
+    joined[summed] = joined[summed].fillna(0)
+    joined.index.name = 'Tháng'
+    return joined
+
+
+def period_comparison(pva, kpis, plan_label='KH'):
+    """
+    Bảng so sánh KH vs TH cả kỳ từ kết quả plan_vs_actual. Chỉ tiêu chưa có TH mà có cột
+    ước tính thì dùng số ước tính và ghi rõ trong tên chỉ tiêu.
+    """
+    rows = []
+    for kpi in kpis:
+        label = kpi
+        plan = pva.get(f'{kpi} KH', pd.Series(dtype='float64'))
+        actual = pva.get(f'{kpi} TH')
+        if actual is None and f'{kpi} {ESTIMATE_SUFFIX}' in pva.columns:
+            actual = pva[f'{kpi} {ESTIMATE_SUFFIX}']
+            label = f'{kpi} ({ESTIMATE_SUFFIX})'
+        if actual is None:
+            actual = pd.Series(dtype='float64')
+        if kpi in AVERAGED_KPIS:
+            rows.append((label, plan.mean(), actual.mean(), TARGET_UNITS.get(kpi, '')))
+        else:
+            rows.append((label, plan.sum(), actual.sum(), TARGET_UNITS.get(kpi, '')))
+
+    comparison = pd.DataFrame(rows, columns=['Chỉ tiêu', plan_label, 'TH hiện tại', 'Đơn vị']).fillna(0)
+    comparison['% Hoàn thành'] = (comparison['TH hiện tại'] / comparison[plan_label].where(comparison[plan_label] != 0) * 100).round(1)
+    return comparison
+
+
+def to_wide(targets_df, year):
+    """KH của một năm dạng bảng nhập liệu: mỗi dòng (Tháng, Kênh), mỗi chỉ tiêu một cột"""
+    df = targets_df[targets_df['Tháng'].dt.year == int(year)]
+    if len(df) == 0:
+        df = default_targets(year)
+    wide = df.pivot_table(index=['Tháng', 'Kênh'], columns='Chỉ tiêu', values='Giá trị', aggfunc='sum')
+    wide = wide.reindex(columns=TARGET_KPIS + [c for c in wide.columns if c not in TARGET_KPIS])
+    wide.columns.name = None
+    wide = wide.reset_index()
+    wide['Tháng'] = wide['Tháng'].dt.strftime('%Y-%m')
+    return wide
+
+
+def from_wide(wide_df):
+    """Chuyển bảng nhập liệu (Tháng, Kênh, các chỉ tiêu) về dạng dài"""
+    long_df = wide_df.melt(id_vars=['Tháng', 'Kênh'], var_name='Chỉ tiêu', value_name='Giá trị')
+    return normalize_targets(long_df.dropna(subset=['Giá trị']))
+
+
+def replace_year(targets_df, year, year_targets):
+    """Thay toàn bộ KH của `year` bằng `year_targets`"""
+    keep = targets_df[targets_df['Tháng'].dt.year != int(year)]
+    return pd.concat([keep, year_targets], ignore_index=True).sort_values(['Tháng', 'Kênh', 'Chỉ tiêu'])
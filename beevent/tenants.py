@@ -0,0 +1,251 @@
+"""
+Chi nhánh (tenant): mỗi chi nhánh dùng một Google Spreadsheet riêng.
+
+Khai báo trong secrets, mỗi chi nhánh một bảng:
+
+    [tenants.hcm]
+    name = "Chi nhánh HCM"
+    spreadsheet_url = "https://docs.google.com/spreadsheets/d/..."   # hoặc spreadsheet_key / spreadsheet_name
+    users = ["an@beevent.vn"]                 # bỏ trống: mọi người dùng đều xem được
+    credentials = "gcp_service_account_hcm"   # tùy chọn, mặc định [gcp_service_account]
+    sqlite_path = ".beevent/hcm.sqlite3"      # tùy chọn, khi dùng kho SQLite
+
+`users` so với email người dùng đăng nhập (st.login): cần bật đăng nhập của Streamlit
+(Streamlit >= 1.42, Authlib, mục [auth] trong secrets), chưa đăng nhập thì chỉ thấy các chi nhánh không khai báo `users`.
+
+Không có [tenants] thì có một chi nhánh mặc định mở theo `spreadsheet_url` (hoặc
+`spreadsheet_key`, hoặc tên "Beevent_Database") như trước. Dashboard app.py đọc các
+spreadsheet báo cáo riêng nên khai báo chi nhánh ở [dashboard_tenants.<id>] cùng dạng.
+
+Registry giữ cho mỗi chi nhánh một client gspread (trên session dùng chung của service
+account, xem beevent.connection), spreadsheet và các worksheet đã mở (không gọi lại
+metadata), dùng chung giữa các lần rerun. Quota Google Sheets tính theo service account:
+chi nhánh khai báo service account riêng thì có quota riêng. Chi nhánh gặp lỗi quota (429) được tạm nghỉ với thời gian tăng dần; trong lúc nghỉ
+các lệnh đọc của nó báo lỗi ngay thay vì chờ, nên `fan_out`/`gather` (dashboard tổng hợp,
+đọc song song) vẫn trả kết quả các chi nhánh khác đúng hạn.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from beevent.storage import DEFAULT_SQLITE_PATH
+from beevent.sync import DEFAULT_STATE_PATH
+from beevent.write_queue import is_quota_error
+
+DEFAULT_TENANT = 'default'
+DEFAULT_SPREADSHEET_NAME = 'Beevent_Database'
+DEFAULT_CREDENTIALS = 'gcp_service_account'
+
+_TENANT_FIELDS = ('name', 'spreadsheet_key', 'spreadsheet_url', 'spreadsheet_name', 'users', 'credentials', 'sqlite_path')
+
+
+class TenantCoolingDown(Exception):
+    """Chi nhánh đang tạm nghỉ sau lỗi quota"""
+
+
+class Tenant:
+    """Một chi nhánh: spreadsheet của nó và những người dùng được xem"""
+
+    def __init__(self, tenant_id, name=None, spreadsheet_key=None, spreadsheet_url=None, spreadsheet_name=None,
+                 users=(), credentials=DEFAULT_CREDENTIALS, sqlite_path=None):
+        self.id = str(tenant_id)
+        self.name = name or self.id
+        self.spreadsheet_key = spreadsheet_key
+        self.spreadsheet_url = spreadsheet_url
+        self.spreadsheet_name = spreadsheet_name or DEFAULT_SPREADSHEET_NAME
+        self.users = {str(u).strip().lower() for u in users or () if str(u).strip()}
+        self.credentials = credentials or DEFAULT_CREDENTIALS
+        # Kho SQLite và trạng thái đồng bộ riêng; chi nhánh mặc định giữ đường dẫn cũ
+        if self.id == DEFAULT_TENANT:
+            self.sqlite_path = sqlite_path or DEFAULT_SQLITE_PATH
+            self.sync_state_path = DEFAULT_STATE_PATH
+        else:
+            self.sqlite_path = sqlite_path or os.path.join('.beevent', f'{self.id}.sqlite3')
+            self.sync_state_path = os.path.join('.beevent', f'sync_state_{self.id}.sqlite3')
+
+    def allows(self, user):
+        """Người dùng (email) được xem chi nhánh này"""
+        return not self.users or str(user or '').strip().lower() in self.users
+
+    def open(self, client):
+        """Mở spreadsheet của chi nhánh bằng client gspread"""
+        if self.spreadsheet_key:
+            return client.open_by_key(self.spreadsheet_key)
+        if self.spreadsheet_url:
+            return client.open_by_url(self.spreadsheet_url)
+        return client.open(self.spreadsheet_name)
+
+
+def tenants_from_config(config, section='tenants', default=None):
+    """
+    Danh sách chi nhánh từ secrets (mapping) `[<section>.<id>]` theo thứ tự khai báo. Không
+    khai báo thì một chi nhánh mặc định: tham số `default` của Tenant, hoặc mở theo
+    spreadsheet_url / spreadsheet_key / sqlite_path trong secrets.
+    """
+    sections = config.get(section) or {}
+    if not sections:
+        if default is None:
+            default = {'spreadsheet_url': config.get('spreadsheet_url'),
+                       'spreadsheet_key': config.get('spreadsheet_key'),
+                       'sqlite_path': config.get('sqlite_path')}
+        return [Tenant(DEFAULT_TENANT, **{'name': 'Beevent', **default})]
+    return [Tenant(tenant_id, **{k: v for k, v in dict(values).items() if k in _TENANT_FIELDS})
+            for tenant_id, values in sections.items()]
+
+
+class TenantRegistry:
+    """Client, spreadsheet và worksheet đã mở của từng chi nhánh; đọc song song nhiều chi nhánh"""
+
+    def __init__(self, tenants, client_factory, cooldown=30.0, max_cooldown=600.0, max_workers=8):
+        self._tenants = {t.id: t for t in tenants}
+        self._client_factory = client_factory      # tenant -> client gspread
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._tenant_locks = {tenant_id: threading.Lock() for tenant_id in self._tenants}
+        self._clients = {}
+        self._spreadsheets = {}
+        self._worksheets = {}                      # (tenant, title) -> worksheet
+        self._cooling_until = {}
+        self._strikes = {}
+        self._gathered = {}                        # (tenant, key) -> (lúc đọc, kết quả)
+        # Đủ worker để mỗi chi nhánh có luồng riêng kể cả khi một chi nhánh đang chậm
+        self._executor = ThreadPoolExecutor(max_workers=max(max_workers, 2 * len(self._tenants)),
+                                            thread_name_prefix='beevent-tenant')
+
+    # ---------- Chi nhánh ----------
+
+    @property
+    def tenants(self):
+        return list(self._tenants.values())
+
+    def get(self, tenant_id):
+        return self._tenants[tenant_id]
+
+    def find(self, spreadsheet_id):
+        """Chi nhánh của spreadsheet đã mở qua registry"""
+        for tenant_id, spreadsheet in list(self._spreadsheets.items()):
+            if spreadsheet.id == spreadsheet_id:
+                return self._tenants[tenant_id]
+        raise KeyError(spreadsheet_id)
+
+    def for_user(self, user=None):
+        """Các chi nhánh người dùng được xem"""
+        return [t for t in self._tenants.values() if t.allows(user)]
+
+    # ---------- Kết nối ----------
+
+    def client(self, tenant_id):
+        """Client gspread của chi nhánh (tạo một lần)"""
+        with self._tenant_locks[tenant_id]:
+            if tenant_id not in self._clients:
+                self._clients[tenant_id] = self._client_factory(self._tenants[tenant_id])
+            return self._clients[tenant_id]
+
+    def spreadsheet(self, tenant_id):
+        """Spreadsheet của chi nhánh (mở một lần)"""
+        spreadsheet = self._spreadsheets.get(tenant_id)
+        if spreadsheet is None:
+            client = self.client(tenant_id)
+            with self._tenant_locks[tenant_id]:
+                spreadsheet = self._spreadsheets.get(tenant_id)
+                if spreadsheet is None:
+                    spreadsheet = self._spreadsheets[tenant_id] = self._tenants[tenant_id].open(client)
+        return spreadsheet
+
+    def worksheet(self, tenant_id, title):
+        """Worksheet `title` của chi nhánh (giữ handle, không gọi lại metadata)"""
+        key = (tenant_id, title)
+        ws = self._worksheets.get(key)
+        if ws is None:
+            ws = self._worksheets[key] = self.spreadsheet(tenant_id).worksheet(title)
+        return ws
+
+    def invalidate(self, tenant_id=None):
+        """Bỏ kết nối đã mở (một chi nhánh hoặc tất cả) để lần sau mở lại"""
+        with self._lock:
+            for tid in ([tenant_id] if tenant_id else list(self._tenants)):
+                self._clients.pop(tid, None)
+                self._spreadsheets.pop(tid, None)
+                for key in [k for k in self._worksheets if k[0] == tid]:
+                    del self._worksheets[key]
+
+    # ---------- Quota ----------
+
+    def cooling_down(self, tenant_id, now=None):
+        """Số giây chi nhánh còn tạm nghỉ sau lỗi quota (0 nếu không)"""
+        now = now if now is not None else time.time()
+        return max(0.0, self._cooling_until.get(tenant_id, 0) - now)
+
+    def call(self, tenant_id, fn):
+        """
+        Gọi fn(tenant_id) (đọc qua spreadsheet/worksheet của registry) cho chi nhánh. Đang tạm
+        nghỉ thì báo TenantCoolingDown ngay; lỗi quota thì tạm nghỉ chi nhánh (lâu dần nếu lặp
+        lại) rồi báo lỗi.
+        """
+        remaining = self.cooling_down(tenant_id)
+        if remaining:
+            raise TenantCoolingDown(f"{self._tenants[tenant_id].name}: vượt quota, thử lại sau {remaining:.0f}s")
+        try:
+            result = fn(tenant_id)
+        except Exception as error:
+            if is_quota_error(error):
+                with self._lock:
+                    strikes = self._strikes[tenant_id] = self._strikes.get(tenant_id, 0) + 1
+                    self._cooling_until[tenant_id] = time.time() + min(self.max_cooldown, self.cooldown * 2 ** (strikes - 1))
+            raise
+        with self._lock:
+            self._strikes.pop(tenant_id, None)
+        return result
+
+    # ---------- Đọc nhiều chi nhánh ----------
+
+    def fan_out(self, fn, tenant_ids=None, timeout=None):
+        """
+        Gọi fn(tenant_id) song song cho các chi nhánh, chờ tối đa `timeout` giây.
+        Trả về (kết quả, lỗi) theo chi nhánh; chi nhánh quá hạn có lỗi TimeoutError.
+        """
+        tenant_ids = list(tenant_ids) if tenant_ids is not None else list(self._tenants)
+        futures = {tenant_id: self._executor.submit(self.call, tenant_id, fn) for tenant_id in tenant_ids}
+        wait(futures.values(), timeout=timeout)
+
+        results, errors = {}, {}
+        for tenant_id, future in futures.items():
+            if not future.done():
+                errors[tenant_id] = TimeoutError(f"{self._tenants[tenant_id].name}: quá {timeout:.0f}s")
+            elif future.exception() is not None:
+                errors[tenant_id] = future.exception()
+            else:
+                results[tenant_id] = future.result()
+        return results, errors
+
+    def gather(self, key, fn, tenant_ids=None, max_age=60.0, timeout=None):
+        """
+        Như fan_out nhưng giữ kết quả theo (chi nhánh, key) trong `max_age` giây: chỉ đọc lại
+        chi nhánh đã cũ. Chi nhánh lỗi dùng kết quả lần trước nếu có (vẫn báo trong lỗi).
+        """
+        tenant_ids = list(tenant_ids) if tenant_ids is not None else list(self._tenants)
+        now = time.time()
+        results = {}
+        for tenant_id in tenant_ids:
+            cached = self._gathered.get((tenant_id, key))
+            if cached is not None and now - cached[0] < max_age:
+                results[tenant_id] = cached[1]
+
+        fetched, errors = self.fan_out(fn, [t for t in tenant_ids if t not in results], timeout=timeout)
+        for tenant_id, result in fetched.items():
+            self._gathered[(tenant_id, key)] = (now, result)
+            results[tenant_id] = result
+        for tenant_id in errors:
+            cached = self._gathered.get((tenant_id, key))
+            if cached is not None:
+                results[tenant_id] = cached[1]
+        return results, errors
+
+    def forget(self, key=None, tenant_id=None):
+        """Bỏ kết quả gather đã giữ (theo key và/hoặc chi nhánh)"""
+        with self._lock:
+            for k in [k for k in self._gathered
+                      if (key is None or k[1] == key) and (tenant_id is None or k[0] == tenant_id)]:
+                del self._gathered[k]
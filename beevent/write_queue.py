@@ -0,0 +1,375 @@
+"""
+Hàng đợi ghi (write-behind) cho Google Sheets, lưu bền trong một journal SQLite.
+
+Form chỉ ghi thao tác vào journal rồi trả về ngay; worker nền gom các thao tác liên
+tiếp cùng worksheet thành một lệnh: nhiều dòng thêm -> một `append_rows`, nhiều sửa ô
+-> một `batch_update`, nhiều dòng xóa -> một request xóa, nhiều lần ghi đè cả sheet
+-> chỉ lần cuối. Lỗi thì thử lại với độ trễ tăng theo cấp số nhân; lỗi quota (429)
+dừng lượt ghi của spreadsheet đó (các spreadsheet/chi nhánh khác vẫn ghi). Quá số lần thử thì thao tác chuyển sang 'failed' và vẫn nằm trong
+journal để thử lại/bỏ từ giao diện; các thao tác sau nó trên cùng worksheet chờ đến khi
+nó được thử lại hoặc bỏ, để giữ thứ tự ghi.
+
+Một process dùng chung một hàng đợi cho mỗi file journal (get_write_queue), kể cả khi
+nhiều trang Streamlit cùng ghi. Journal giả định chỉ một process server dùng.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+from datetime import datetime
+
+from beevent.lazy import lazy_import
+
+gspread = lazy_import('gspread')
+
+PENDING = 'pending'
+SENDING = 'sending'
+FAILED = 'failed'
+DEFAULT_JOURNAL_PATH = os.path.join('.beevent', 'write_queue.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    spreadsheet TEXT NOT NULL,
+    worksheet TEXT NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    label TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL
+)
+"""
+_COLUMNS = ['id', 'spreadsheet', 'worksheet', 'op', 'payload', 'label', 'status', 'attempts', 'next_attempt', 'last_error', 'created_at']
+
+
+def is_quota_error(error):
+    """Lỗi vượt quota/rate limit của Google API"""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status == 429 or 'RESOURCE_EXHAUSTED' in str(error) or 'Quota exceeded' in str(error)
+
+
+def _json_default(value):
+    """numpy/pandas scalar -> kiểu Python khi lưu payload"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class WriteQueue:
+    """Journal SQLite các thao tác ghi chờ gửi lên Google Sheets và worker gửi nền"""
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, max_attempts=6, base_delay=2.0, max_delay=300.0, interval=2.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.interval = interval
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(_SCHEMA)
+        # Lần chạy trước dừng giữa chừng: gửi lại các thao tác đang gửi dở
+        self._db.execute("UPDATE writes SET status = ? WHERE status = ?", (PENDING, SENDING))
+
+        self._db_lock = threading.Lock()      # giữ ngắn, chỉ quanh lệnh SQLite
+        self._flush_lock = threading.Lock()   # một lượt gửi tại một thời điểm
+        self._worker_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._spreadsheets = {}
+        self._listeners = {}
+        self._worker = None
+
+    # ---------- Đăng ký ----------
+
+    def register(self, spreadsheet):
+        """Spreadsheet mà worker dùng để gửi các thao tác có key = spreadsheet.id"""
+        self._spreadsheets[spreadsheet.id] = spreadsheet
+        self._wake.set()
+
+    def add_listener(self, callback, name=None):
+        """
+        callback(spreadsheet_id, worksheet) sau mỗi lần ghi thành công (vd. xóa cache).
+        Đăng ký lại cùng tên (mỗi lần script Streamlit chạy lại) thì thay callback cũ.
+        """
+        self._listeners[name or callback.__qualname__] = callback
+
+    # ---------- Đưa thao tác vào hàng đợi ----------
+
+    def _execute(self, sql, params=()):
+        with self._db_lock:
+            return self._db.execute(sql, params)
+
+    def _query(self, sql, params=()):
+        with self._db_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _executemany(self, sql, params):
+        with self._db_lock:
+            self._db.executemany(sql, params)
+
+    def _enqueue(self, spreadsheet, worksheet, op, payload, label=None):
+        cursor = self._execute(
+            "INSERT INTO writes (spreadsheet, worksheet, op, payload, label, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (spreadsheet.id, worksheet, op, json.dumps(payload, ensure_ascii=False, default=_json_default),
+             label, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        self._spreadsheets.setdefault(spreadsheet.id, spreadsheet)
+        self._wake.set()
+        return cursor.lastrowid
+
+    def append(self, spreadsheet, worksheet, row=None, record=None, headers=None, label=None):
+        """
+        Thêm một dòng: `row` theo vị trí cột, hoặc `record` {header: giá trị} ghi theo
+        header hiện có của sheet (thiếu cột thì thêm). `headers` dùng khi phải tạo sheet.
+        """
+        payload = {'row': list(row)} if row is not None else {'record': dict(record), 'headers': list(headers or record)}
+        return self._enqueue(spreadsheet, worksheet, 'append', payload, label)
+
+    def update(self, spreadsheet, worksheet, key, values, key_column='ID', label=None):
+        """Sửa các ô {header: giá trị} của dòng có `key_column` == key"""
+        payload = {'key': str(key), 'key_column': key_column, 'values': dict(values)}
+        return self._enqueue(spreadsheet, worksheet, 'update', payload, label)
+
+    def delete(self, spreadsheet, worksheet, key, key_column='ID', label=None):
+        """Xóa dòng có `key_column` == key"""
+        payload = {'key': str(key), 'key_column': key_column}
+        return self._enqueue(spreadsheet, worksheet, 'delete', payload, label)
+
+    def replace(self, spreadsheet, worksheet, rows, label=None):
+        """Ghi đè toàn bộ sheet bằng `rows` (gồm cả dòng header)"""
+        return self._enqueue(spreadsheet, worksheet, 'replace', {'rows': [list(r) for r in rows]}, label)
+
+    # ---------- Trạng thái ----------
+
+    def entries(self, spreadsheet=None, statuses=(PENDING, SENDING, FAILED)):
+        """Các thao tác còn trong journal (mới nhất cuối), payload đã parse"""
+        query = f"SELECT {', '.join(_COLUMNS)} FROM writes WHERE status IN ({', '.join('?' * len(statuses))})"
+        params = list(statuses)
+        if spreadsheet is not None:
+            query += " AND spreadsheet = ?"
+            params.append(getattr(spreadsheet, 'id', spreadsheet))
+        rows = self._query(query + " ORDER BY id", params)
+        entries = [dict(zip(_COLUMNS, row)) for row in rows]
+        for entry in entries:
+            entry['payload'] = json.loads(entry['payload'])
+        return entries
+
+    def counts(self, spreadsheet=None):
+        """Số thao tác đang chờ (pending + sending) và bị lỗi"""
+        entries = self.entries(spreadsheet)
+        failed = sum(e['status'] == FAILED for e in entries)
+        return {'pending': len(entries) - failed, 'failed': failed}
+
+    def pending_records(self, spreadsheet, worksheet):
+        """Các record đang chờ thêm vào worksheet (vd. để cấp ID không trùng)"""
+        return [e['payload']['record'] for e in self.entries(spreadsheet)
+                if e['worksheet'] == worksheet and e['op'] == 'append' and 'record' in e['payload']]
+
+    def retry(self, entry_id=None):
+        """Đưa thao tác lỗi (hoặc tất cả) về hàng chờ, gửi ngay ở lượt sau"""
+        if entry_id is None:
+            self._execute("UPDATE writes SET status = ?, attempts = 0, next_attempt = 0 WHERE status = ?", (PENDING, FAILED))
+        else:
+            self._execute("UPDATE writes SET status = ?, attempts = 0, next_attempt = 0 WHERE id = ?", (PENDING, entry_id))
+        self._wake.set()
+
+    def discard(self, entry_id):
+        """Bỏ một thao tác khỏi journal"""
+        self._execute("DELETE FROM writes WHERE id = ?", (entry_id,))
+
+    # ---------- Gửi ----------
+
+    def flush(self, now=None):
+        """
+        Gửi các thao tác đến hạn: gom theo worksheet, mỗi dãy thao tác liên tiếp cùng loại
+        là một lệnh API. Trả về số thao tác đã ghi xong.
+        """
+        now = now if now is not None else datetime.now().timestamp()
+        with self._flush_lock:
+            rows = self._query(
+                f"SELECT {', '.join(_COLUMNS)} FROM writes WHERE status IN (?, ?) ORDER BY id", (PENDING, FAILED))
+            groups = {}
+            blocked = set()
+            for row in rows:
+                entry = dict(zip(_COLUMNS, row))
+                key = (entry['spreadsheet'], entry['worksheet'])
+                # Thao tác sau một thao tác lỗi cùng worksheet chờ nó được thử lại/bỏ (vd. sửa
+                # một dòng mà lệnh thêm dòng đó còn lỗi), không gửi vượt lên trước
+                if entry['status'] == FAILED:
+                    blocked.add(key)
+                if key in blocked:
+                    continue
+                entry['payload'] = json.loads(entry['payload'])
+                groups.setdefault(key, []).append(entry)
+
+            written = 0
+            throttled = set()
+            for (spreadsheet_id, worksheet), entries in groups.items():
+                spreadsheet = self._spreadsheets.get(spreadsheet_id)
+                # Giữ thứ tự theo worksheet: thao tác đầu còn chờ thử lại thì các thao tác sau cũng chờ
+                if spreadsheet is None or spreadsheet_id in throttled or entries[0]['next_attempt'] > now:
+                    continue
+                done, quota_hit = self._flush_worksheet(spreadsheet, worksheet, entries, now)
+                if done:
+                    written += done
+                    self._notify(spreadsheet_id, worksheet)
+                if quota_hit:
+                    # Chỉ dừng spreadsheet vượt quota, spreadsheet của chi nhánh khác vẫn ghi
+                    throttled.add(spreadsheet_id)
+            return written
+
+    def _flush_worksheet(self, spreadsheet, worksheet, entries, now):
+        """Gửi lần lượt các dãy thao tác của một worksheet, dừng ở dãy lỗi đầu tiên"""
+        written = 0
+        for run in self._runs(entries):
+            ids = [e['id'] for e in run]
+            self._set_status(ids, SENDING)
+            try:
+                missing = self._send(spreadsheet, worksheet, run[0]['op'], run)
+            except Exception as error:
+                self._fail(run, error, now)
+                return written, is_quota_error(error)
+            self._executemany("DELETE FROM writes WHERE id = ?", [(i,) for i in ids if i not in missing])
+            for entry in run:
+                if entry['id'] in missing:
+                    self._fail([entry], KeyError(missing[entry['id']]), now, permanent=True)
+            written += len(ids) - len(missing)
+            if missing:
+                # Các dãy sau chờ thao tác vừa lỗi (xem flush)
+                break
+        return written, False
+
+    def _notify(self, spreadsheet_id, worksheet):
+        for callback in list(self._listeners.values()):
+            try:
+                callback(spreadsheet_id, worksheet)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _runs(entries):
+        """Chia các thao tác (đã theo thứ tự) thành các dãy liên tiếp cùng loại"""
+        runs = []
+        for entry in entries:
+            if runs and runs[-1][0]['op'] == entry['op']:
+                runs[-1].append(entry)
+            else:
+                runs.append([entry])
+        return runs
+
+    def _set_status(self, ids, status):
+        self._executemany("UPDATE writes SET status = ? WHERE id = ?", [(status, i) for i in ids])
+
+    def _fail(self, run, error, now, permanent=False):
+        for entry in run:
+            attempts = entry['attempts'] + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** entry['attempts']) * random.uniform(0.5, 1.0)
+            status = FAILED if permanent or attempts >= self.max_attempts else PENDING
+            self._execute(
+                "UPDATE writes SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                (status, attempts, now + delay, str(error)[:500], entry['id']))
+
+    def _worksheet(self, spreadsheet, name, headers=None):
+        try:
+            return spreadsheet.worksheet(name)
+        except gspread.exceptions.WorksheetNotFound:
+            ws = spreadsheet.add_worksheet(title=name, rows="1000", cols="20")
+            if headers:
+                ws.append_row(headers)
+            return ws
+
+    def _header(self, ws, columns):
+        """Header hiện có của sheet, bổ sung (một lệnh) các cột còn thiếu"""
+        header = ws.row_values(1)
+        missing = [c for c in dict.fromkeys(columns) if c not in header]
+        if missing:
+            header = header + missing
+            ws.update([header], 'A1')
+        return header
+
+    def _send(self, spreadsheet, worksheet, op, run):
+        """Gửi một dãy thao tác cùng loại bằng một lệnh; trả về {id: lỗi} các thao tác không áp dụng được"""
+        payloads = [e['payload'] for e in run]
+        ws = self._worksheet(spreadsheet, worksheet, payloads[0].get('headers'))
+
+        if op == 'append':
+            records = [p['record'] for p in payloads if 'record' in p]
+            header = self._header(ws, [c for r in records for c in r]) if records else []
+            rows = [p['row'] if 'row' in p else [p['record'].get(h, '') for h in header] for p in payloads]
+            ws.append_rows(rows)
+            return {}
+
+        if op == 'replace':
+            ws.clear()
+            ws.update(payloads[-1]['rows'], 'A1')
+            return {}
+
+        if op in ('update', 'delete'):
+            header = self._header(ws, [c for p in payloads for c in list(p.get('values', ())) + [p['key_column']]])
+            keys = {}
+            for p in payloads:
+                if p['key_column'] not in keys:
+                    column = ws.col_values(header.index(p['key_column']) + 1)
+                    keys[p['key_column']] = {str(k): i for i, k in enumerate(column, start=1)}
+            found, missing = [], {}
+            for entry, p in zip(run, payloads):
+                row = keys[p['key_column']].get(p['key'])
+                if row is None or row == 1:
+                    missing[entry['id']] = f"Không tìm thấy {p['key_column']} = {p['key']}"
+                else:
+                    found.append((row, p))
+
+            if op == 'update' and found:
+                # Như update_cell: giá trị được Sheets diễn giải (ngày, số) như khi gõ tay
+                ws.batch_update([{'range': gspread.utils.rowcol_to_a1(row, header.index(c) + 1), 'values': [[v]]}
+                                 for row, p in found for c, v in p['values'].items()], raw=False)
+            if op == 'delete' and found:
+                # Một request xóa nhiều dòng, từ dưới lên để chỉ số dòng không bị lệch
+                spreadsheet.batch_update({'requests': [
+                    {'deleteDimension': {'range': {'sheetId': ws.id, 'dimension': 'ROWS', 'startIndex': row - 1, 'endIndex': row}}}
+                    for row in sorted({row for row, _ in found}, reverse=True)
+                ]})
+            return missing
+
+        raise ValueError(f"Thao tác không hỗ trợ: {op}")
+
+    # ---------- Worker ----------
+
+    def start(self):
+        """Chạy worker nền (một lần cho mỗi hàng đợi)"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='beevent-write-queue', daemon=True)
+                self._worker.start()
+        return self
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Lỗi ngoài dự kiến (vd. journal bị khóa): thử lại ở vòng sau
+                pass
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(path=DEFAULT_JOURNAL_PATH):
+    """Hàng đợi ghi dùng chung trong process cho mỗi file journal, worker đã chạy"""
+    with _queues_lock:
+        queue = _queues.get(path)
+        if queue is None:
+            queue = _queues[path] = WriteQueue(path).start()
+        return queue
@@ -0,0 +1 @@
+"""Phần dùng chung của các trang app2 (Streamlit): truy cập dữ liệu, dashboard, giao diện"""
@@ -0,0 +1,39 @@
+"""
+Người dùng đăng nhập (st.login) của các app Streamlit.
+
+`st.user` chỉ có từ Streamlit 1.42; bản cũ hơn (hoặc app chưa bật đăng nhập) thì coi như
+chưa đăng nhập và chỉ thấy các chi nhánh không giới hạn người dùng.
+"""
+import streamlit as st
+
+
+def current_user():
+    """Email người dùng đăng nhập (st.login), None nếu chưa đăng nhập hoặc Streamlit chưa hỗ trợ"""
+    user = getattr(st, "user", None)
+    return user.get("email") if user is not None else None
+
+
+def login_available():
+    """App bật đăng nhập: Streamlit có st.login và secrets có mục [auth]"""
+    return hasattr(st, "login") and "auth" in st.secrets
+
+
+def user_tenants(registry):
+    """
+    Chi nhánh người dùng được xem (dừng trang nếu không có). Chi nhánh có `users` chỉ hiện
+    với người đã đăng nhập: chưa đăng nhập thì hiện nút đăng nhập ở sidebar.
+    """
+    user = current_user()
+    tenants = registry.for_user(user)
+    restricted = user is None and any(t.users for t in registry.tenants)
+    if restricted and login_available() and st.sidebar.button("🔐 Đăng nhập"):
+        st.login()
+    if not tenants:
+        if not restricted:
+            st.error("⚠️ Tài khoản chưa được gán chi nhánh nào!")
+        elif login_available():
+            st.warning("🔐 Vui lòng đăng nhập để xem dữ liệu chi nhánh.")
+        else:
+            st.error("⚠️ Chi nhánh giới hạn người dùng (users) nhưng app chưa bật đăng nhập: khai báo [auth] trong secrets.")
+        st.stop()
+    return tenants
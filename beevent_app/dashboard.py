@@ -0,0 +1,174 @@
+"""
+Dữ liệu trang Dashboard & Báo cáo: cube doanh thu, kế hoạch theo kỳ, đồ thị tính lười
+theo dashboard được chọn và tổng hợp các chi nhánh.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from beevent.compute_graph import ComputeGraph
+from beevent.figure_cache import FigureCache
+from beevent.periods import period_months, slice_sorted, sort_by_start
+from beevent.reconciliation import reconcile
+from beevent.revenue_cube import classify_channel
+from beevent.targets import ESTIMATE_SUFFIX, default_targets, plan_vs_actual
+
+from beevent_app.data import (
+    get_funnel_engine, get_revenue_cube, get_tenant_registry, load_finance,
+    load_status_history, load_targets
+)
+
+# ==================== DASHBOARD DATA PROCESSING ====================
+
+def get_targets_table(sheet, start, end):
+    """Bảng kế hoạch từ sheet Targets; sheet còn trống thì dùng KH mặc định cho các năm trong kỳ"""
+    targets_df = load_targets(sheet)
+    if len(targets_df) == 0:
+        years = range(pd.Timestamp(start).year, pd.Timestamp(end).year + 1)
+        targets_df = pd.concat([default_targets(year) for year in years], ignore_index=True)
+    return targets_df
+
+@st.cache_resource
+def get_figure_cache():
+    """Cache figure Plotly (LRU) dùng chung cho các dashboard"""
+    return FigureCache(max_entries=64)
+
+def prepare_dashboard_projects(projects_df, start=None, end=None, channels=None):
+    """
+    Chuẩn hóa kiểu dữ liệu dự án (trên bản mới, không sửa bảng đầu vào) và chỉ giữ dự án
+    bắt đầu trong kỳ [start, end]: sắp theo ngày bắt đầu rồi cắt bằng searchsorted.
+    `channels`: chỉ giữ dự án thuộc các kênh này (None: mọi kênh).
+    """
+    if len(projects_df) == 0:
+        return projects_df
+    
+    projects_df = projects_df.assign(**{
+        'Doanh thu': pd.to_numeric(projects_df['Doanh thu'], errors='coerce').fillna(0),
+        'Chi phí': pd.to_numeric(projects_df['Chi phí'], errors='coerce').fillna(0),
+        'Lợi nhuận %': pd.to_numeric(projects_df['Lợi nhuận %'], errors='coerce').fillna(0),
+        'Ngày bắt đầu': pd.to_datetime(projects_df['Ngày bắt đầu'], errors='coerce'),
+        'Ngày kết thúc': pd.to_datetime(projects_df['Ngày kết thúc'], errors='coerce'),
+        'Kênh': classify_channel(projects_df),
+        # CSAT và số khách nhập theo dự án (trống nếu chưa có khảo sát)
+        'CSAT': pd.to_numeric(projects_df.get('CSAT', np.nan), errors='coerce'),
+        'Số khách': pd.to_numeric(projects_df.get('Số khách', np.nan), errors='coerce'),
+    })
+    projects_df = slice_sorted(sort_by_start(projects_df), start, end)
+    if channels is not None:
+        projects_df = projects_df[projects_df['Kênh'].isin(channels)]
+    return projects_df
+
+def sync_revenue_cube(sheet, projects_df):
+    """Revenue cube dùng chung, đồng bộ với bảng Projects hiện tại"""
+    cube = get_revenue_cube(sheet.id)
+    cube.sync(projects_df)
+    return cube
+
+def period_revenue_by_channel(cube, start, end):
+    """Doanh thu theo tháng và kênh, đủ các tháng trong kỳ"""
+    revenue_data = cube.revenue_by_channel(start=start, end=end)
+    return (revenue_data.set_index('Tháng')
+            .reindex(period_months(start, end), fill_value=0)
+            .rename_axis('Tháng').reset_index())
+
+def sync_funnel(sheet, status_history_df):
+    """Funnel engine dùng chung, mở rộng với các sự kiện mới của log"""
+    funnel = get_funnel_engine(sheet.id)
+    funnel.extend(status_history_df)
+    return funnel
+
+def build_plan_vs_actual(cube, targets_df, start, end, channels):
+    """
+    KH vs TH theo tháng của kỳ, ghép bằng một phép join theo tháng.
+    TH doanh thu/giá vốn/số dự án/CSAT lấy từ cube (tiền tệ theo triệu VNĐ).
+    Chi phí vận hành chưa theo dõi thực tế (giao dịch Finance đều gắn dự án, đã nằm trong
+    giá vốn) nên chỉ có số ước tính bằng KH của các tháng đã qua: cột 'Chi phí VH ước tính'
+    và 'LNTT ước tính', không phải TH.
+    """
+    cells = cube.slice(start=start, end=end, Kênh=channels)
+    monthly = cells.groupby(level='Tháng').sum()
+    actual = pd.DataFrame({
+        'Doanh thu': monthly['Doanh thu'] / 1_000_000,
+        'COGS': monthly['Chi phí'] / 1_000_000,
+        'Số dự án': monthly['Số dự án'],
+        'CSAT TB': monthly['Tổng CSAT'] / monthly['Số CSAT'].replace(0, np.nan),
+    })
+    actual['Lãi gộp'] = actual['Doanh thu'] - actual['COGS']
+    
+    pva = plan_vs_actual(targets_df, actual, start, end, channels)
+    elapsed = pva.index <= pd.Timestamp(datetime.now())
+    pva[f'Chi phí VH {ESTIMATE_SUFFIX}'] = pva.get('Chi phí VH KH', 0) * elapsed
+    pva[f'LNTT {ESTIMATE_SUFFIX}'] = pva['Lãi gộp TH'] - pva[f'Chi phí VH {ESTIMATE_SUFFIX}']
+    return pva
+
+@st.cache_data(max_entries=8)
+def reconciliation_report(projects_df, finance_df):
+    """Đối soát Finance với Projects; chỉ tính lại khi dữ liệu đầu vào thay đổi"""
+    return reconcile(projects_df, finance_df)
+
+# Dữ liệu mỗi dashboard cần (tên node trong build_dashboard_graph)
+DASHBOARD_INPUTS = {
+    "🎯 CEO/CCO - Tổng quan": ['projects', 'cube', 'revenue_data', 'pipeline_data', 'pva', 'cumulative_target'],
+    "💼 Kênh bán": ['projects', 'pipeline_data', 'sales_perf', 'funnel'],
+    "📋 Dự án": ['projects', 'reconciliation'],
+    "📈 So sánh kế hoạch": ['projects', 'pva', 'cumulative_target'],
+    "🌐 Tổng hợp chi nhánh": ['projects'],
+}
+
+def build_dashboard_graph(sheet, projects_df, targets_df, start, end, channels):
+    """
+    Đồ thị dữ liệu lười của trang Dashboard trong kỳ [start, end].
+    Chỉ các node mà dashboard đang chọn yêu cầu (DASHBOARD_INPUTS) mới được load/tính;
+    node dùng chung như cube chỉ tính một lần.
+    """
+    graph = ComputeGraph()
+    graph.add('projects_raw', lambda: projects_df)
+    graph.add('targets', lambda: targets_df)
+    graph.add('status_history', lambda: load_status_history(sheet))
+    
+    graph.add('projects', lambda df: prepare_dashboard_projects(df, start, end, channels), ['projects_raw'])
+    graph.add('cube', lambda df: sync_revenue_cube(sheet, df), ['projects_raw'])
+    graph.add('revenue_data', lambda cube: period_revenue_by_channel(cube, start, end), ['cube'])
+    graph.add('pipeline_data', lambda cube: cube.pipeline(start=start, end=end, Kênh=channels), ['cube'])
+    graph.add('sales_perf', lambda cube: cube.pic_summary(start=start, end=end, Kênh=channels), ['cube'])
+    graph.add('pva', lambda cube, targets: build_plan_vs_actual(cube, targets, start, end, channels), ['cube', 'targets'])
+    graph.add('cumulative_target',
+              lambda pva: pva['Doanh thu KH'].cumsum().tolist() if 'Doanh thu KH' in pva.columns else [0] * len(pva),
+              ['pva'])
+    graph.add('funnel', lambda df: sync_funnel(sheet, df), ['status_history'])
+    graph.add('finance', lambda: load_finance(sheet))
+    graph.add('reconciliation',
+              lambda df, finance: reconciliation_report(df.reindex(columns=['ID', 'Tên dự án', 'Doanh thu', 'Chi phí', 'Lợi nhuận %']), finance),
+              ['projects_raw', 'finance'])
+    return graph
+
+# --- CHI NHÁNH ---
+BRANCH_FETCH_TIMEOUT = 20  # giây chờ tối đa mỗi lượt đọc các chi nhánh
+
+def load_branch_projects(tenant_ids):
+    """
+    Bảng Projects của nhiều chi nhánh, đọc song song từ Google Sheets (giữ 60s). Chi nhánh
+    lỗi quota/quá hạn không làm chậm chi nhánh khác: báo trong lỗi, kèm dữ liệu lần trước nếu có.
+    """
+    registry = get_tenant_registry()
+    def fetch(tenant_id):
+        return pd.DataFrame(registry.worksheet(tenant_id, "Projects").get_all_records())
+    return registry.gather("Projects", fetch, tenant_ids, max_age=60, timeout=BRANCH_FETCH_TIMEOUT)
+
+def branch_summary(branch_projects, start, end, channels):
+    """Số dự án, doanh thu, chi phí, lãi gộp theo chi nhánh và kênh của các dự án bắt đầu trong kỳ"""
+    registry = get_tenant_registry()
+    frames = []
+    for tenant_id, projects_df in branch_projects.items():
+        projects_df = prepare_dashboard_projects(projects_df, start, end, channels)
+        if len(projects_df) > 0:
+            frames.append(projects_df[['Kênh', 'Doanh thu', 'Chi phí']]
+                          .assign(**{'Chi nhánh': registry.get(tenant_id).name}))
+    if not frames:
+        return pd.DataFrame(columns=['Chi nhánh', 'Kênh', 'Số dự án', 'Doanh thu', 'Chi phí', 'Lãi gộp'])
+    summary = (pd.concat(frames, ignore_index=True)
+               .groupby(['Chi nhánh', 'Kênh'], as_index=False)
+               .agg(**{'Số dự án': ('Doanh thu', 'size'), 'Doanh thu': ('Doanh thu', 'sum'), 'Chi phí': ('Chi phí', 'sum')}))
+    summary['Lãi gộp'] = summary['Doanh thu'] - summary['Chi phí']
+    return summary
@@ -0,0 +1,495 @@
+"""
+Truy cập dữ liệu dùng chung của các trang app2 (pages/app2): chi nhánh và kết nối, bảng
+đã tải dùng chung mọi phiên, hàng đợi ghi và các hàm load/lưu từng bảng.
+
+Module chỉ chạy một lần mỗi process (các hàm cache được định nghĩa một lần); mỗi lượt
+chạy, trang đang mở import những gì nó cần từ đây.
+"""
+import streamlit as st
+import pandas as pd
+import functools
+from datetime import datetime
+
+from beevent.funnel import STATUS_EVENT_COLUMNS, FunnelEngine, baseline_events, status_event
+from beevent.importer import IMPORT_SCHEMAS, allocate_ids
+from beevent.lazy import lazy_import
+from beevent.ledger import FinanceLedger
+from beevent.mutations import MutationLog
+from beevent.rate_limit import LOW, priority
+from beevent.revenue_cube import RevenueCube
+from beevent.scheduling import ScheduleEngine
+from beevent.shared_tables import SharedTables, freeze
+from beevent.storage import SQLiteRepository, SheetsRepository
+from beevent.sync import SyncEngine
+from beevent.targets import TARGET_COLUMNS, normalize_targets
+from beevent.tenants import DEFAULT_TENANT, TenantRegistry, tenants_from_config
+from beevent.write_queue import FAILED, get_write_queue
+
+from beevent_app.auth import current_user
+
+# gspread chỉ import khi mở kết nối đầu tiên (xem beevent.lazy)
+gspread = lazy_import("gspread")
+
+# Copy-on-write: bảng lọc/assign từ bảng dùng chung không chép các cột không đổi,
+# và không thể sửa ngược vào bảng gốc (xem beevent.shared_tables)
+pd.set_option("mode.copy_on_write", True)
+
+# ==================== GOOGLE SHEETS CONNECTION ====================
+def authorize_client(tenant):
+    """Client gspread của chi nhánh trên kết nối dùng chung của service account `credentials`"""
+    # beevent.connection kéo theo gspread/google-auth: chỉ import khi mở kết nối đầu tiên
+    from beevent.connection import authorize
+    return authorize(st.secrets[tenant.credentials], rate_limits=st.secrets.get("rate_limits"))
+
+@st.cache_resource
+def get_tenant_registry():
+    """Các chi nhánh ([tenants] trong secrets), kết nối của mỗi chi nhánh dùng chung mọi phiên"""
+    return TenantRegistry(tenants_from_config(st.secrets), authorize_client)
+
+def init_google_sheets(tenant_id=DEFAULT_TENANT):
+    """Kết nối Google Sheets của chi nhánh"""
+    try:
+        return get_tenant_registry().spreadsheet(tenant_id)
+    except Exception as e:
+        st.error(f"❌ Lỗi kết nối Google Sheets: {e}")
+        return None
+
+# Cache theo spreadsheet: mỗi chi nhánh một bản, khóa bằng ID thay vì băm cả đối tượng kết nối
+# (khai báo kiểu bằng tên đầy đủ để không phải import gspread)
+SHEET_HASH_FUNCS = {"gspread.spreadsheet.Spreadsheet": lambda sheet: sheet.id}
+
+def get_worksheet(sheet, worksheet_name, headers):
+    """Lấy hoặc tạo worksheet"""
+    try:
+        ws = sheet.worksheet(worksheet_name)
+    except:
+        ws = sheet.add_worksheet(title=worksheet_name, rows="1000", cols="20")
+        ws.append_row(headers)
+    return ws
+
+# ==================== WRITE QUEUE ====================
+# Bảng có cột ID: thêm/sửa/xóa áp ngay lên bảng đã cache (xem cached_table)
+MUTABLE_SHEETS = ["Projects", "Customers", "Staff", "Finance", "Timeline"]
+
+def get_sheet_queue(sheet):
+    """Hàng đợi ghi nền (journal SQLite) đã gắn với spreadsheet hiện tại"""
+    queue = get_write_queue()
+    queue.register(sheet)
+    queue.add_listener(on_sheet_written, name="app2")
+    return queue
+
+def on_sheet_written(spreadsheet_id, worksheet_name):
+    """
+    Worker đã ghi xong một sheet. Bảng có thay đổi cục bộ: đánh dấu các thay đổi đã lên
+    sheet (bảng cache cộng thay đổi đã đúng, không cần tải lại); bảng khác: xóa cache.
+    """
+    if worksheet_name in MUTABLE_SHEETS:
+        pending = [e['id'] for e in get_write_queue().entries(spreadsheet_id) if e['worksheet'] == worksheet_name]
+        get_mutation_log(spreadsheet_id).confirm(worksheet_name, pending)
+    elif worksheet_name in SHEET_LOADERS:
+        SHEET_LOADERS[worksheet_name].clear()
+
+@st.cache_resource
+def get_mutation_log(spreadsheet_id):
+    """Các thêm/sửa/xóa cục bộ chưa có trong bảng đã cache của spreadsheet (dùng chung mọi phiên)"""
+    return MutationLog()
+
+@st.cache_resource
+def get_shared_tables():
+    """Bảng đã tải dùng chung mọi phiên: các phiên load cùng bảng cùng lúc chỉ đọc sheet một lần"""
+    return SharedTables(ttl=60)
+
+def shared_table(worksheet_name):
+    """
+    Thay cho @st.cache_data(ttl=60) ở loader của một worksheet: mọi phiên nhận cùng một
+    DataFrame (chuỗi Arrow, chỉ đọc: lọc/assign thay vì sửa tại chỗ), lệnh đọc đồng thời
+    được gộp làm một.
+    loader.clear() tăng version của bảng ở mọi spreadsheet.
+    """
+    def decorate(fetch):
+        @functools.wraps(fetch)
+        def fetch_stamped(sheet):
+            fetched_at = datetime.now().timestamp()
+            df = freeze(fetch(sheet))
+            df.attrs['fetched_at'] = fetched_at
+            return df
+
+        @functools.wraps(fetch)
+        def load(sheet):
+            return get_shared_tables().get(sheet.id, worksheet_name, lambda: fetch_stamped(sheet))
+
+        load.clear = lambda: get_shared_tables().invalidate(worksheet=worksheet_name)
+        return load
+    return decorate
+
+def cached_table(worksheet_name):
+    """
+    Bảng dùng chung (shared_table) của bảng có cột ID, cộng các thay đổi cục bộ vừa đưa
+    vào hàng đợi, nên sau khi lưu/xóa không phải tải lại sheet.
+    """
+    def decorate(fetch):
+        shared = shared_table(worksheet_name)(fetch)
+
+        @functools.wraps(fetch)
+        def load(sheet):
+            df = shared(sheet)
+            return get_mutation_log(sheet.id).apply(worksheet_name, df, df.attrs.get('fetched_at', 0))
+
+        load.clear = shared.clear
+        return load
+    return decorate
+
+@st.cache_resource(hash_funcs=SHEET_HASH_FUNCS)
+def get_repository(sheet):
+    """
+    Kho dữ liệu các bảng chính theo `storage_backend` trong secrets ("sheets" mặc định, hoặc
+    "sqlite": mỗi chi nhánh một file SQLite)
+    """
+    if st.secrets.get("storage_backend", "sheets") == "sqlite":
+        return SQLiteRepository(get_tenant_registry().find(sheet.id).sqlite_path,
+                                track_changes=bool(st.secrets.get("sync_with_sheets", False)))
+    return SheetsRepository(sheet, get_sheet_queue(sheet))
+
+@st.cache_resource(hash_funcs=SHEET_HASH_FUNCS)
+def get_sync_engine(sheet):
+    """Đồng bộ hai chiều SQLite <-> Google Sheets (bật bằng `sync_with_sheets` khi dùng SQLite), None nếu tắt"""
+    repository = get_repository(sheet)
+    if not (isinstance(repository, SQLiteRepository) and repository.track_changes):
+        return None
+    engine = SyncEngine(sheet, repository, state_path=get_tenant_registry().find(sheet.id).sync_state_path,
+                        interval=float(st.secrets.get("sync_interval", 60)))
+    engine.add_listener(on_synced, name="app2")
+    return engine.start()
+
+def on_synced(report):
+    """Đồng bộ kéo dữ liệu mới từ sheet về: xóa cache các bảng có thay đổi"""
+    for table, counts in report.items():
+        if counts['pulled'] and table in SHEET_LOADERS:
+            SHEET_LOADERS[table].clear()
+
+def after_record_write(sheet, table, record_mutation):
+    """Google Sheets (ghi nền): áp ngay thay đổi lên bảng đã cache; SQLite (ghi ngay): xóa cache để đọc lại"""
+    if get_repository(sheet).deferred:
+        record_mutation(get_mutation_log(sheet.id))
+    else:
+        SHEET_LOADERS[table].clear()
+        sync_engine = get_sync_engine(sheet)
+        if sync_engine is not None:
+            sync_engine.request_sync()
+
+def insert_record(sheet, table, record, label):
+    """Thêm bản ghi qua kho dữ liệu"""
+    entry_id = get_repository(sheet).insert(table, record, label=label)
+    after_record_write(sheet, table, lambda log: log.create(table, record, entry_id))
+
+def update_record(sheet, table, key, values, label):
+    """Sửa các ô của bản ghi `key` qua kho dữ liệu"""
+    entry_id = get_repository(sheet).update(table, key, values, label=label)
+    after_record_write(sheet, table, lambda log: log.update(table, key, values, entry_id))
+
+def delete_record(sheet, table, key, label):
+    """Xóa bản ghi `key` qua kho dữ liệu"""
+    entry_id = get_repository(sheet).delete(table, key, label=label)
+    after_record_write(sheet, table, lambda log: log.delete(table, key, entry_id))
+
+def next_record_id(sheet, worksheet_name, prefix, df):
+    """ID mới sau số lớn nhất trong bảng đã load và các bản ghi còn chờ ghi"""
+    existing = df['ID'].astype(str).tolist() if 'ID' in df.columns else []
+    pending = [r.get('ID', '') for r in get_sheet_queue(sheet).pending_records(sheet, worksheet_name)]
+    return allocate_ids(prefix, existing + pending, 1)[0]
+
+# ==================== DATA FUNCTIONS ====================
+
+# --- PROJECTS ---
+PROJECT_STATUSES = ["Lead", "Đang đàm phán", "Đã ký HĐ", "Đang thực hiện", "Hoàn thành", "Hủy"]
+
+@cached_table("Projects")
+def load_projects(sheet):
+    """Load dữ liệu dự án"""
+    return get_repository(sheet).load("Projects")
+
+def save_project(sheet, project_data):
+    """Lưu dự án mới (ghi nền qua hàng đợi)"""
+    project_data["ID"] = next_record_id(sheet, "Projects", "PRJ", load_projects(sheet))
+    project_data["Ngày tạo"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    insert_record(sheet, "Projects", project_data, f"Thêm dự án {project_data['ID']}")
+    get_revenue_cube(sheet.id).upsert(project_data)
+    log_status_change(sheet, project_data["ID"], "", project_data.get("Trạng thái", ""))
+    return True
+
+def update_project(sheet, project_id, updated_data):
+    """Cập nhật dự án (ghi nền theo tên cột, cập nhật được một phần các trường)"""
+    # Bảng đã cache gồm cả các dự án vừa thêm còn chờ ghi
+    projects_df = load_projects(sheet)
+    records = projects_df[projects_df['ID'] == project_id].to_dict('records') if 'ID' in projects_df.columns else []
+    if not records:
+        return False
+    
+    record = records[-1]
+    update_record(sheet, "Projects", project_id, updated_data, f"Sửa dự án {project_id}")
+    get_revenue_cube(sheet.id).upsert({**record, **updated_data, 'ID': project_id})
+    
+    old_status = record.get('Trạng thái', '')
+    new_status = updated_data.get('Trạng thái', old_status)
+    if new_status != old_status:
+        log_status_change(sheet, project_id, old_status, new_status)
+    return True
+
+def delete_project(sheet, project_id):
+    """Xóa dự án (ghi nền, bỏ ngay khỏi bảng đã cache)"""
+    delete_record(sheet, "Projects", project_id, f"Xóa dự án {project_id}")
+    get_revenue_cube(sheet.id).remove(project_id)
+    return True
+
+@st.cache_resource
+def get_revenue_cube(spreadsheet_id):
+    """Cube doanh thu (Tháng x Kênh x Loại x PIC x Trạng thái) dùng chung của spreadsheet, cập nhật tăng dần"""
+    return RevenueCube()
+
+# --- STATUS HISTORY ---
+def get_status_history_ws(sheet):
+    """Worksheet StatusHistory (log đổi trạng thái, chỉ ghi thêm); lần đầu tạo thì ghi mốc trạng thái hiện tại của các dự án"""
+    try:
+        return sheet.worksheet("StatusHistory")
+    except gspread.exceptions.WorksheetNotFound:
+        ws = get_worksheet(sheet, "StatusHistory", STATUS_EVENT_COLUMNS)
+        projects_df = load_projects(sheet)
+        if len(projects_df) > 0:
+            ws.append_rows(baseline_events(projects_df).values.tolist())
+        return ws
+
+@st.cache_resource(hash_funcs=SHEET_HASH_FUNCS)
+def ensure_status_history(sheet):
+    """Tạo (và ghi mốc) sheet StatusHistory một lần trước khi ghi sự kiện qua hàng đợi"""
+    get_status_history_ws(sheet)
+    return True
+
+@shared_table("StatusHistory")
+def load_status_history(sheet):
+    """Load log đổi trạng thái dự án"""
+    data = get_status_history_ws(sheet).get_all_records()
+    return pd.DataFrame(data, columns=STATUS_EVENT_COLUMNS) if data else pd.DataFrame(columns=STATUS_EVENT_COLUMNS)
+
+def log_status_change(sheet, project_id, old_status, new_status):
+    """Ghi thêm một sự kiện đổi trạng thái (qua hàng đợi ghi)"""
+    ensure_status_history(sheet)
+    get_sheet_queue(sheet).append(sheet, "StatusHistory", row=status_event(project_id, old_status, new_status),
+                                  label=f"Trạng thái {project_id}: {new_status}")
+
+@st.cache_resource
+def get_funnel_engine(spreadsheet_id):
+    """Funnel engine dùng chung của spreadsheet, mở rộng tăng dần theo log StatusHistory"""
+    return FunnelEngine()
+
+# --- TARGETS ---
+@shared_table("Targets")
+def load_targets(sheet):
+    """Load bảng kế hoạch (Tháng, Kênh, Chỉ tiêu, Giá trị)"""
+    ws = get_worksheet(sheet, "Targets", TARGET_COLUMNS)
+    data = ws.get_all_records()
+    return normalize_targets(pd.DataFrame(data, columns=TARGET_COLUMNS) if data else pd.DataFrame(columns=TARGET_COLUMNS))
+
+def save_targets(sheet, targets_df):
+    """Ghi đè bảng kế hoạch bằng một lần update cả bảng"""
+    ws = get_worksheet(sheet, "Targets", TARGET_COLUMNS)
+    rows = targets_df[TARGET_COLUMNS].assign(**{'Tháng': targets_df['Tháng'].dt.strftime('%Y-%m')})
+    values = [TARGET_COLUMNS] + rows.values.tolist()
+    
+    ws.clear()
+    if len(values) > ws.row_count:
+        ws.add_rows(len(values) - ws.row_count)
+    ws.update(values, 'A1')
+    load_targets.clear()
+    return True
+
+# --- STAFF ---
+@cached_table("Staff")
+def load_staff(sheet):
+    """Load danh sách nhân sự"""
+    return get_repository(sheet).load("Staff")
+
+def save_staff(sheet, staff_data):
+    """Lưu nhân sự mới (ghi nền qua hàng đợi)"""
+    staff_data["ID"] = next_record_id(sheet, "Staff", "STF", load_staff(sheet))
+    staff_data["Ngày tạo"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    insert_record(sheet, "Staff", staff_data, f"Thêm nhân sự {staff_data['ID']}")
+    return True
+
+def update_staff(sheet, staff_id, updated_data):
+    """Cập nhật nhân sự (ghi nền theo tên cột)"""
+    update_record(sheet, "Staff", staff_id, updated_data, f"Sửa nhân sự {staff_id}")
+    return True
+
+def delete_staff(sheet, staff_id):
+    """Xóa nhân sự (ghi nền, bỏ ngay khỏi bảng đã cache)"""
+    delete_record(sheet, "Staff", staff_id, f"Xóa nhân sự {staff_id}")
+    return True
+
+# --- TIMELINE ---
+@cached_table("Timeline")
+def load_timeline(sheet):
+    """Load timeline dự án"""
+    return get_repository(sheet).load("Timeline")
+
+def save_timeline(sheet, timeline_data):
+    """Lưu timeline mới (ghi nền qua hàng đợi)"""
+    timeline_data["ID"] = next_record_id(sheet, "Timeline", "TML", load_timeline(sheet))
+    timeline_data["Ngày tạo"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    insert_record(sheet, "Timeline", timeline_data, f"Thêm công việc {timeline_data['ID']}")
+    return True
+
+@st.cache_data(ttl=60)
+def build_schedule(timeline_df):
+    """Tính lịch CPM (ES/LS, slack, critical path) cho toàn bộ Timeline"""
+    return ScheduleEngine(timeline_df)
+
+def load_members(sheet):
+    """Load danh sách thành viên (Members), bảng chưa có thì tạo"""
+    try:
+        return get_repository(sheet).load("Members")
+    except Exception:
+        return pd.DataFrame(columns=['ID', 'Họ và tên', 'Chức vụ', 'Email', 'Số điện thoại'])
+
+# --- CUSTOMERS ---
+@cached_table("Customers")
+def load_customers(sheet):
+    """Load danh sách khách hàng"""
+    return get_repository(sheet).load("Customers")
+
+def save_customer(sheet, customer_data):
+    """Lưu khách hàng mới (ghi nền qua hàng đợi)"""
+    customer_data["ID"] = next_record_id(sheet, "Customers", "CUS", load_customers(sheet))
+    customer_data["Ngày tạo"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    insert_record(sheet, "Customers", customer_data, f"Thêm khách hàng {customer_data['ID']}")
+    return True
+
+def update_customer(sheet, customer_id, updated_data):
+    """Cập nhật khách hàng (ghi nền theo tên cột)"""
+    update_record(sheet, "Customers", customer_id, updated_data, f"Sửa khách hàng {customer_id}")
+    return True
+
+def delete_customer(sheet, customer_id):
+    """Xóa khách hàng (ghi nền, bỏ ngay khỏi bảng đã cache)"""
+    delete_record(sheet, "Customers", customer_id, f"Xóa khách hàng {customer_id}")
+    return True
+
+# --- FINANCE ---
+@cached_table("Finance")
+def load_finance(sheet):
+    """Load dữ liệu tài chính"""
+    return get_repository(sheet).load("Finance")
+
+def save_finance(sheet, finance_data):
+    """Lưu giao dịch tài chính (ghi nền qua hàng đợi)"""
+    finance_data["ID"] = next_record_id(sheet, "Finance", "FIN", load_finance(sheet))
+    finance_data["Ngày tạo"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    insert_record(sheet, "Finance", finance_data, f"Thêm giao dịch {finance_data['ID']}")
+    get_finance_ledger(sheet.id).append(finance_data)
+    return True
+
+# Loader cache theo tên sheet (xóa sau khi ghi)
+SHEET_LOADERS = {
+    "Projects": load_projects, "StatusHistory": load_status_history, "Customers": load_customers,
+    "Staff": load_staff, "Finance": load_finance, "Timeline": load_timeline, "Targets": load_targets,
+}
+
+@st.cache_data(ttl=60, hash_funcs=SHEET_HASH_FUNCS)
+def count_records(sheet, tables):
+    """Số bản ghi các bảng (một lệnh đọc, ưu tiên thấp) cho trang thông tin"""
+    with priority(LOW):
+        return get_repository(sheet).counts(list(tables))
+
+# --- EXPORT ---
+EXPORT_SOURCES = {
+    "Dự án": ("Projects", load_projects),
+    "Khách hàng": ("Customers", load_customers),
+    "Nhân sự": ("Staff", load_staff),
+    "Tài chính": ("Finance", load_finance),
+    "Timeline": ("Timeline", load_timeline),
+    "Kế hoạch": ("Targets", load_targets),
+}
+
+# --- IMPORT ---
+IMPORT_SHEETS = {"Dự án": "Projects", "Khách hàng": "Customers", "Nhân sự": "Staff", "Tài chính": "Finance", "Timeline": "Timeline"}
+
+def import_records(sheet, sheet_name, valid_df, progress=None):
+    """Import hàng loạt các dòng đã kiểm tra: cấp ID theo khối rồi ghi theo lô qua kho dữ liệu"""
+    schema = IMPORT_SCHEMAS[sheet_name]
+    repository = get_repository(sheet)
+    # Tránh trùng ID với các bản ghi từ form còn nằm trong hàng đợi ghi
+    pending = [r.get("ID", "") for r in get_sheet_queue(sheet).pending_records(sheet, sheet_name)]
+    ids = allocate_ids(schema["prefix"], repository.ids(sheet_name) + pending, len(valid_df))
+    
+    if sheet_name == "Projects":
+        # Lấy sheet log trước khi ghi để lần tạo đầu không ghi mốc trùng cho dự án vừa import
+        history_ws = get_status_history_ws(sheet)
+    
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    records = valid_df.assign(**{"ID": ids, "Ngày tạo": created_at}).to_dict('records')
+    repository.insert_many(sheet_name, records, progress=progress)
+    
+    if sheet_name == "Projects":
+        history_ws.append_rows([status_event(pid, "", status) for pid, status in zip(ids, valid_df["Trạng thái"])])
+        load_status_history.clear()
+    SHEET_LOADERS[sheet_name].clear()
+    return ids
+
+@st.cache_resource
+def get_finance_ledger(spreadsheet_id):
+    """Sổ cái tài chính dùng chung của spreadsheet, cập nhật tăng dần khi có giao dịch mới"""
+    return FinanceLedger()
+
+def sync_finance_ledger(sheet, finance_df):
+    """Đồng bộ sổ cái với bảng Finance vừa load (chỉ thêm giao dịch mới nếu không có dòng bị sửa/xóa)"""
+    ledger = get_finance_ledger(sheet.id)
+    ledger.sync(finance_df)
+    return ledger
+
+# ==================== TRANG ====================
+def current_tenant():
+    """Chi nhánh đang chọn ở sidebar (chi nhánh đầu tiên người dùng được xem nếu chưa chọn)"""
+    tenants = get_tenant_registry().for_user(current_user())
+    if not tenants:
+        st.error("⚠️ Tài khoản chưa được gán chi nhánh nào!")
+        st.stop()
+    selected = st.session_state.get("tenant_id")
+    return next((t for t in tenants if t.id == selected), tenants[0])
+
+def connect(tenant):
+    """
+    Spreadsheet của chi nhánh, mở khi trang cần dữ liệu (sidebar và header đã vẽ trước).
+    Không kết nối được thì dừng trang; khởi động đồng bộ SQLite <-> Sheets nếu bật
+    và hiện trạng thái hàng đợi ghi ở sidebar.
+    """
+    sheet = init_google_sheets(tenant.id)
+    if sheet is None:
+        st.error("⚠️ Không thể kết nối Google Sheets!")
+        st.stop()
+    get_sync_engine(sheet)
+    show_write_queue(sheet)
+    return sheet
+
+def show_write_queue(sheet):
+    """Trạng thái hàng đợi ghi của spreadsheet ở sidebar: thử lại/bỏ thao tác lỗi"""
+    write_queue = get_sheet_queue(sheet)
+    queued = write_queue.entries(sheet)
+    if not queued:
+        return
+    failed = [e for e in queued if e['status'] == FAILED]
+    with st.sidebar.expander(f"🔄 Đang đồng bộ: {len(queued) - len(failed)} chờ, {len(failed)} lỗi", expanded=bool(failed)):
+        for entry in queued:
+            if entry['status'] != FAILED:
+                st.caption(f"⏳ {entry['label'] or entry['worksheet']}")
+                continue
+            st.markdown(f"❌ **{entry['label'] or entry['worksheet']}**")
+            st.caption(entry['last_error'] or "")
+            col1, col2 = st.columns(2)
+            if col1.button("Thử lại", key=f"queue_retry_{entry['id']}"):
+                write_queue.retry(entry['id'])
+                st.rerun()
+            if col2.button("Bỏ", key=f"queue_discard_{entry['id']}"):
+                write_queue.discard(entry['id'])
+                get_mutation_log(sheet.id).forget(entry['id'])
+                st.rerun()
+        if st.button("🔄 Làm mới", key="queue_refresh"):
+            st.rerun()
@@ -0,0 +1,125 @@
+"""
+CSS dùng chung của app2: gửi một lần ở entrypoint cho mọi trang, Gantt CSS là hằng số
+(số cột theo số ngày của tháng truyền qua biến CSS `--gantt-days`).
+"""
+
+APP_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .stButton>button {
+        width: 100%;
+        background-color: #1f77b4;
+        color: white;
+        border-radius: 5px;
+        padding: 0.5rem 1rem;
+        font-weight: bold;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+    .timeline-item {
+        border-left: 3px solid #1f77b4;
+        padding-left: 1rem;
+        margin-bottom: 1rem;
+        position: relative;
+    }
+    .staff-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        margin-bottom: 1rem;
+    }
+</style>
+"""
+
+# Lưới Gantt: cột tên task + một cột 40px cho mỗi ngày (style="--gantt-days: N;")
+GANTT_CSS = """
+<style>
+    .gantt-container {
+        overflow-x: auto;
+        border: 1px solid #ddd;
+        border-radius: 8px;
+        background: white;
+        margin-bottom: 20px;
+    }
+    .gantt-header {
+        display: grid;
+        grid-template-columns: 250px repeat(var(--gantt-days), 40px);
+        background: #f8f9fa;
+        border-bottom: 2px solid #dee2e6;
+        position: sticky;
+        top: 0;
+        z-index: 10;
+    }
+    .gantt-header-cell {
+        padding: 8px 4px;
+        text-align: center;
+        border-right: 1px solid #dee2e6;
+        font-size: 11px;
+    }
+    .gantt-header-cell.weekend {
+        background: #ffe5e5;
+    }
+    .gantt-row {
+        display: grid;
+        grid-template-columns: 250px repeat(var(--gantt-days), 40px);
+        border-bottom: 1px solid #eee;
+        min-height: 50px;
+        align-items: center;
+    }
+    .gantt-row:hover {
+        background: #f8f9fa;
+    }
+    .gantt-task-name {
+        padding: 8px;
+        border-right: 2px solid #dee2e6;
+        font-size: 12px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+    .gantt-cell {
+        border-right: 1px solid #f0f0f0;
+        position: relative;
+        height: 100%;
+    }
+    .gantt-cell.weekend {
+        background: #fafafa;
+    }
+    .gantt-bar {
+        position: absolute;
+        height: 30px;
+        top: 50%;
+        transform: translateY(-50%);
+        border-radius: 4px;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 10px;
+        font-weight: bold;
+        color: white;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        cursor: pointer;
+        transition: all 0.2s;
+    }
+    .gantt-bar:hover {
+        transform: translateY(-50%) scale(1.05);
+        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+    }
+    .status-chua-bat-dau { background: #ff6b6b; }
+    .status-dang-thuc-hien { background: #51cf66; }
+    .status-hoan-thanh { background: #1f77b4; }
+    .status-tre-han { background: #ff0000; }
+</style>
+"""
@@ -1,9 +1,10 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 
+from beevent.connection import authorize
+from beevent.write_queue import get_write_queue
+
 st.set_page_config(page_title="Beevent - Nhập liệu", page_icon="✍️", layout="wide")
 
 st.title("✍️ BEEVENT - HỆ THỐNG NHẬP LIỆU")
@@ -12,13 +13,7 @@ st.title("✍️ BEEVENT - HỆ THỐNG NHẬP LIỆU")
 @st.cache_resource
 def init_gsheet_connection():
     try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scopes)
-        return gspread.authorize(credentials)
+        return authorize(st.secrets["gcp_service_account"], rate_limits=st.secrets.get("rate_limits"))
     except Exception as e:
         st.error(f"❌ Lỗi kết nối: {str(e)}")
         return None
@@ -35,6 +30,16 @@ if sheet_id:
             spreadsheet = client.open_by_key(sheet_id)
             st.sidebar.success("✅ Kết nối thành công!")
             
+            # Form ghi vào hàng đợi, worker nền gửi lên Google Sheets
+            write_queue = get_write_queue()
+            write_queue.register(spreadsheet)
+            queue_counts = write_queue.counts(spreadsheet)
+            if queue_counts['pending'] or queue_counts['failed']:
+                st.sidebar.info(f"🔄 Đang đồng bộ: {queue_counts['pending']} chờ, {queue_counts['failed']} lỗi")
+            if queue_counts['failed'] and st.sidebar.button("🔁 Thử lại thao tác lỗi"):
+                write_queue.retry()
+                st.rerun()
+            
             # Chọn loại dữ liệu nhập
             data_type = st.sidebar.selectbox(
                 "Chọn loại dữ liệu:",
@@ -62,8 +67,6 @@ if sheet_id:
                         
                         if submitted:
                             try:
-                                worksheet = spreadsheet.worksheet('revenue_monthly')
-                                
                                 # Thêm dòng mới
                                 new_row = [
                                     month.strftime("%Y-%m-01"),
@@ -72,7 +75,7 @@ if sheet_id:
                                     int(corporate)
                                 ]
                                 
-                                worksheet.append_row(new_row)
+                                get_write_queue().append(spreadsheet, 'revenue_monthly', row=new_row, label=f"Doanh thu {new_row[0]}")
                                 st.success("✅ Đã lưu dữ liệu thành công!")
                                 st.balloons()
                                 
@@ -140,19 +143,14 @@ if sheet_id:
                     
                     if submitted:
                         try:
-                            worksheet = spreadsheet.worksheet('sales_pipeline')
-                            
-                            # Xóa dữ liệu cũ (giữ header)
-                            worksheet.clear()
-                            worksheet.append_row(['Stage', 'Count', 'Value'])
-                            
-                            # Thêm dữ liệu mới
-                            worksheet.append_rows([
+                            # Ghi đè cả bảng: nhiều lần cập nhật liên tiếp chỉ gửi lần cuối
+                            get_write_queue().replace(spreadsheet, 'sales_pipeline', [
+                                ['Stage', 'Count', 'Value'],
                                 ['Lead', lead_count, lead_value],
                                 ['Qualified', qualified_count, qualified_value],
                                 ['Proposal', proposal_count, proposal_value],
-                                ['Won', won_count, won_value]
-                            ])
+                                ['Won', won_count, won_value],
+                            ], label="Sales pipeline")
                             
                             st.success("✅ Đã cập nhật pipeline!")
                             st.balloons()
@@ -196,8 +194,6 @@ if sheet_id:
                     if submitted:
                         if project_name:
                             try:
-                                worksheet = spreadsheet.worksheet('projects')
-                                
                                 new_row = [
                                     project_name,
                                     int(revenue),
@@ -207,7 +203,7 @@ if sheet_id:
                                     float(csat)
                                 ]
                                 
-                                worksheet.append_row(new_row)
+                                get_write_queue().append(spreadsheet, 'projects', row=new_row, label=f"Dự án {project_name}")
                                 st.success(f"✅ Đã lưu dự án: {project_name}")
                                 st.balloons()
                                 
@@ -255,8 +251,6 @@ if sheet_id:
                     if submitted:
                         if sales_name:
                             try:
-                                worksheet = spreadsheet.worksheet('sales_performance')
-                                
                                 new_row = [
                                     sales_name,
                                     int(revenue),
@@ -265,7 +259,7 @@ if sheet_id:
                                     channel
                                 ]
                                 
-                                worksheet.append_row(new_row)
+                                get_write_queue().append(spreadsheet, 'sales_performance', row=new_row, label=f"Sales {sales_name}")
                                 st.success(f"✅ Đã lưu dữ liệu cho: {sales_name}")
                                 st.balloons()
                                 
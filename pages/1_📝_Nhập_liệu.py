@@ -1,36 +1,58 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 
+from beevent.connection import authorize
+from beevent.tenants import TenantRegistry, tenants_from_config
+from beevent.write_queue import get_write_queue
+
+from beevent_app.auth import user_tenants
+
 st.set_page_config(page_title="Beevent - Nhập liệu", page_icon="✍️", layout="wide")
 
 st.title("✍️ BEEVENT - HỆ THỐNG NHẬP LIỆU")
 
+# Spreadsheet báo cáo khi secrets chưa khai báo [dashboard_tenants] (mỗi chi nhánh một spreadsheet)
 SHEET_ID = "1xSvsEPHV1MzHa9UumzJtyzAY4LXaiSVKb8tmMcUZPeM"
 
+def authorize_client(tenant):
+    return authorize(st.secrets[tenant.credentials], rate_limits=st.secrets.get("rate_limits"))
+
 @st.cache_resource
 def init_gsheet_connection():
     try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scopes)
-        return gspread.authorize(credentials)
+        tenants = tenants_from_config(st.secrets, section="dashboard_tenants",
+                                      default={"spreadsheet_key": st.secrets.get("dashboard_spreadsheet_key", SHEET_ID)})
+        return TenantRegistry(tenants, authorize_client)
     except Exception as e:
         st.error(f"❌ Lỗi kết nối: {str(e)}")
         return None
 
-client = init_gsheet_connection()
+registry = init_gsheet_connection()
 
-if client:
+if registry:
     try:
-        spreadsheet = client.open_by_key(SHEET_ID)
+        # Nhập liệu cho chi nhánh người dùng được xem
+        tenants = user_tenants(registry)
+        tenant = tenants[0]
+        if len(tenants) > 1:
+            tenant = registry.get(st.sidebar.selectbox("🏢 Chi nhánh:", [t.id for t in tenants],
+                                                       format_func=lambda tenant_id: registry.get(tenant_id).name))
+        spreadsheet = registry.spreadsheet(tenant.id)
         st.sidebar.success("✅ Kết nối Google Sheets thành công!")
         
+        # Form ghi vào hàng đợi, worker nền gửi lên Google Sheets
+        write_queue = get_write_queue()
+        write_queue.register(spreadsheet)
+        # Ghi xong thì xóa cache để các trang dashboard đọc lại dữ liệu mới
+        write_queue.add_listener(lambda spreadsheet_id, worksheet: st.cache_data.clear(), name="nhap_lieu")
+        queue_counts = write_queue.counts(spreadsheet)
+        if queue_counts['pending'] or queue_counts['failed']:
+            st.sidebar.info(f"🔄 Đang đồng bộ: {queue_counts['pending']} chờ, {queue_counts['failed']} lỗi")
+        if queue_counts['failed'] and st.sidebar.button("🔁 Thử lại thao tác lỗi"):
+            write_queue.retry()
+            st.rerun()
+        
         data_type = st.sidebar.selectbox(
             "Chọn loại dữ liệu:",
             ["📊 Doanh thu tháng", "🎯 Sales Pipeline", "📋 Dự án", "👤 Sales Performance"]
@@ -103,8 +125,6 @@ if client:
                 
                 if submitted:
                     try:
-                        worksheet = spreadsheet.worksheet('revenue_monthly')
-                        
                         new_row = [
                             month.strftime("%Y-%m-01"),
                             int(noi_bo),
@@ -119,10 +139,9 @@ if client:
                             float(net_margin)
                         ]
                         
-                        worksheet.append_row(new_row)
+                        get_write_queue().append(spreadsheet, 'revenue_monthly', row=new_row, label=f"Doanh thu {new_row[0]}")
                         st.success("✅ Đã lưu dữ liệu thành công!")
                         st.balloons()
-                        st.cache_data.clear()
                         
                     except Exception as e:
                         st.error(f"❌ Lỗi: {str(e)}")
@@ -154,21 +173,17 @@ if client:
                 
                 if submitted:
                     try:
-                        worksheet = spreadsheet.worksheet('sales_pipeline')
-                        
-                        worksheet.clear()
-                        worksheet.append_row(['Stage', 'Count', 'Value'])
-                        
-                        worksheet.append_rows([
+                        # Ghi đè cả bảng: nhiều lần cập nhật liên tiếp chỉ gửi lần cuối
+                        get_write_queue().replace(spreadsheet, 'sales_pipeline', [
+                            ['Stage', 'Count', 'Value'],
                             ['Lead', int(lead_count), int(lead_value)],
                             ['Qualified', int(qualified_count), int(qualified_value)],
                             ['Proposal', int(proposal_count), int(proposal_value)],
-                            ['Won', int(won_count), int(won_value)]
-                        ])
+                            ['Won', int(won_count), int(won_value)],
+                        ], label="Sales pipeline")
                         
                         st.success("✅ Đã cập nhật pipeline!")
                         st.balloons()
-                        st.cache_data.clear()
                         
                     except Exception as e:
                         st.error(f"❌ Lỗi: {str(e)}")
@@ -208,8 +223,6 @@ if client:
                 if submitted:
                     if project_name:
                         try:
-                            worksheet = spreadsheet.worksheet('projects')
-                            
                             new_row = [
                                 project_name,
                                 int(revenue),
@@ -219,10 +232,9 @@ if client:
                                 float(csat)
                             ]
                             
-                            worksheet.append_row(new_row)
+                            get_write_queue().append(spreadsheet, 'projects', row=new_row, label=f"Dự án {project_name}")
                             st.success(f"✅ Đã lưu dự án: {project_name}")
                             st.balloons()
-                            st.cache_data.clear()
                             
                         except Exception as e:
                             st.error(f"❌ Lỗi: {str(e)}")
@@ -268,8 +280,6 @@ if client:
                 if submitted:
                     if sales_name:
                         try:
-                            worksheet = spreadsheet.worksheet('sales_performance')
-                            
                             new_row = [
                                 sales_name,
                                 int(revenue),
@@ -278,10 +288,9 @@ if client:
                                 channel
                             ]
                             
-                            worksheet.append_row(new_row)
+                            get_write_queue().append(spreadsheet, 'sales_performance', row=new_row, label=f"Sales {sales_name}")
                             st.success(f"✅ Đã lưu dữ liệu cho: {sales_name}")
                             st.balloons()
-                            st.cache_data.clear()
                             
                         except Exception as e:
                             st.error(f"❌ Lỗi: {str(e)}")
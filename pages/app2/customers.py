@@ -0,0 +1,130 @@
+import streamlit as st
+import plotly.express as px
+
+from beevent_app.data import connect, current_tenant, delete_customer, load_customers, save_customer
+
+# ==================== PAGE 4: QUẢN LÝ KHÁCH HÀNG ====================
+st.markdown('<div class="main-header">👥 QUẢN LÝ KHÁCH HÀNG</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+tab1, tab2, tab3 = st.tabs(["📋 Danh sách", "➕ Thêm mới", "📊 Phân tích"])
+
+# TAB 1: Danh sách khách hàng (fragment: tìm kiếm chỉ chạy lại danh sách)
+@st.fragment
+def customer_list(sheet):
+    customers_df = load_customers(sheet)
+    
+    if len(customers_df) > 0:
+        # Search
+        search_term = st.text_input("🔍 Tìm kiếm:", placeholder="Tên, công ty, email...")
+        
+        if search_term:
+            customers_df = customers_df[
+                customers_df['Tên khách hàng'].str.contains(search_term, case=False, na=False) |
+                customers_df['Công ty'].str.contains(search_term, case=False, na=False) |
+                customers_df['Email'].str.contains(search_term, case=False, na=False)
+            ]
+        
+        st.markdown(f"**Tìm thấy {len(customers_df)} khách hàng**")
+        
+        # Display customers
+        for idx, row in customers_df.iterrows():
+            with st.expander(f"👤 {row['Tên khách hàng']} - {row['Công ty']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.write(f"**ID:** {row['ID']}")
+                    st.write(f"**Email:** {row['Email']}")
+                    st.write(f"**Điện thoại:** {row['Điện thoại']}")
+                
+                with col2:
+                    st.write(f"**Địa chỉ:** {row.get('Địa chỉ', 'N/A')}")
+                    st.write(f"**Loại:** {row.get('Loại', 'N/A')}")
+                    st.write(f"**Nguồn:** {row.get('Nguồn', 'N/A')}")
+                
+                with col3:
+                    st.write(f"**Trạng thái:** {row['Trạng thái']}")
+                    st.write(f"**Ngày tạo:** {row.get('Ngày tạo', 'N/A')}")
+                
+                st.write(f"**Ghi chú:** {row.get('Ghi chú', 'Không có')}")
+                
+                # Actions
+                col1, col2 = st.columns([1, 5])
+                with col1:
+                    if st.button("🗑️ Xóa", key=f"delete_cus_{row['ID']}"):
+                        if delete_customer(sheet, row['ID']):
+                            st.success("Đã xóa khách hàng!")
+                            st.rerun()
+    else:
+        st.info("📭 Chưa có khách hàng nào.")
+
+with tab1:
+    customer_list(sheet)
+
+# TAB 2: Thêm khách hàng
+with tab2:
+    st.subheader("➕ Thêm khách hàng mới")
+    
+    with st.form("add_customer_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ten_kh = st.text_input("Tên khách hàng *", placeholder="Nguyễn Văn A")
+            cong_ty = st.text_input("Công ty *", placeholder="ABC Corp")
+            email = st.text_input("Email *", placeholder="example@company.com")
+            dien_thoai = st.text_input("Điện thoại *", placeholder="0901234567")
+        
+        with col2:
+            dia_chi = st.text_input("Địa chỉ", placeholder="123 Đường ABC, Quận 1, TP.HCM")
+            loai = st.selectbox("Loại khách hàng", ["Cá nhân", "Doanh nghiệp", "Tổ chức", "Chính phủ"])
+            nguon = st.selectbox("Nguồn", ["Website", "Giới thiệu", "Facebook", "Email", "Sự kiện", "Khác"])
+            trang_thai = st.selectbox("Trạng thái", ["Tiềm năng", "Đang tư vấn", "Đã chốt", "Khách hàng thân thiết"])
+        
+        ghi_chu = st.text_area("Ghi chú", placeholder="Thông tin bổ sung...")
+        
+        submitted = st.form_submit_button("💾 Lưu khách hàng", use_container_width=True)
+        
+        if submitted:
+            if not ten_kh or not cong_ty or not email:
+                st.error("❌ Vui lòng điền đầy đủ thông tin bắt buộc (*)")
+            else:
+                customer_data = {
+                    "ID": "",
+                    "Tên khách hàng": ten_kh,
+                    "Công ty": cong_ty,
+                    "Email": email,
+                    "Điện thoại": dien_thoai,
+                    "Địa chỉ": dia_chi,
+                    "Loại": loai,
+                    "Nguồn": nguon,
+                    "Trạng thái": trang_thai,
+                    "Ghi chú": ghi_chu,
+                    "Ngày tạo": ""
+                }
+                
+                if save_customer(sheet, customer_data):
+                    st.success("✅ Đã thêm khách hàng thành công!")
+                    st.balloons()
+                    st.rerun()
+
+# TAB 3: Phân tích
+with tab3:
+    customers_df = load_customers(sheet)
+    
+    if len(customers_df) > 0:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Khách hàng theo loại")
+            type_dist = customers_df['Loại'].value_counts()
+            fig = px.pie(values=type_dist.values, names=type_dist.index)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("📈 Khách hàng theo nguồn")
+            source_dist = customers_df['Nguồn'].value_counts()
+            fig = px.bar(x=source_dist.index, y=source_dist.values)
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Chưa có dữ liệu để phân tích")
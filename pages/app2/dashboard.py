@@ -0,0 +1,661 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+
+from beevent.figure_cache import fingerprint
+from beevent.funnel import FUNNEL_STAGES, LOST_STAGE
+from beevent.periods import fiscal_year_of, fiscal_year_range, fiscal_years, month_ceil, month_floor
+from beevent.targets import ESTIMATE_SUFFIX, period_comparison, targets_for_period
+
+from beevent_app.auth import current_user
+from beevent_app.dashboard import (
+    DASHBOARD_INPUTS, branch_summary, build_dashboard_graph, get_figure_cache,
+    get_targets_table, load_branch_projects
+)
+from beevent_app.data import connect, current_tenant, get_tenant_registry, load_projects
+
+# Năm tài chính bắt đầu từ tháng (1 = năm dương lịch)
+FISCAL_YEAR_START_MONTH = int(st.secrets.get("fiscal_year_start_month", 1))
+
+# ==================== PAGE 7: DASHBOARD & BÁO CÁO ====================
+st.markdown('<div class="main-header">📊 DASHBOARD & BÁO CÁO</div>', unsafe_allow_html=True)
+registry = get_tenant_registry()
+tenants = registry.for_user(current_user())
+tenant = current_tenant()
+sheet = connect(tenant)
+
+# Load data từ Google Sheets (các dữ liệu khác load theo dashboard được chọn)
+projects_df = load_projects(sheet)
+
+# Dashboard selection
+dashboard_type = st.radio(
+    "Chọn Dashboard:",
+    ["🎯 CEO/CCO - Tổng quan", "💼 Kênh bán", "📋 Dự án", "📈 So sánh kế hoạch"]
+    + (["🌐 Tổng hợp chi nhánh"] if len(tenants) > 1 else []),
+    horizontal=True
+)
+
+st.markdown("---")
+
+# Bộ lọc kỳ/kênh và các biểu đồ phụ thuộc chạy lại riêng (đổi bộ lọc không chạy lại cả trang)
+@st.fragment
+def dashboard_view(sheet, projects_df, dashboard_type):
+    # Filters
+    current_fiscal_year = fiscal_year_of(datetime.now(), FISCAL_YEAR_START_MONTH)
+
+    with st.expander("⚙️ Bộ lọc", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            channel_filter = st.multiselect(
+                "Kênh bán:",
+                ["Nội bộ", "Gov-Hiệp hội", "Corporate"],
+                default=["Nội bộ", "Gov-Hiệp hội", "Corporate"]
+            )
+        with col2:
+            period_mode = st.radio("Kỳ báo cáo:", ["Năm tài chính", "Khoảng thời gian"], horizontal=True)
+        
+            if period_mode == "Năm tài chính":
+                years = fiscal_years(
+                    projects_df['Ngày bắt đầu'] if len(projects_df) > 0 else [],
+                    FISCAL_YEAR_START_MONTH, include=[current_fiscal_year]
+                )
+                fiscal_year = st.selectbox("Năm tài chính:", years, index=years.index(current_fiscal_year))
+                period_start, period_end = fiscal_year_range(fiscal_year, FISCAL_YEAR_START_MONTH)
+                period_label = str(fiscal_year) if FISCAL_YEAR_START_MONTH == 1 else f"FY{fiscal_year}"
+            else:
+                default_start, default_end = fiscal_year_range(current_fiscal_year, FISCAL_YEAR_START_MONTH)
+                date_range = st.date_input("Từ tháng - đến tháng:", value=(default_start.date(), default_end.date()))
+                if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+                    period_start, period_end = month_floor(date_range[0]), month_ceil(date_range[1])
+                else:
+                    period_start, period_end = default_start, default_end
+                period_label = f"{period_start.strftime('%m/%Y')} - {period_end.strftime('%m/%Y')}"
+    
+        # Kế hoạch của kỳ đang xem
+        targets_df = get_targets_table(sheet, period_start, period_end)
+        period_targets = targets_for_period(targets_df, period_start, period_end, channel_filter)
+    
+        with col3:
+            st.info(f"💡 **Mục tiêu {period_label}**\n- DT: {period_targets.get('Doanh thu', 0)/1000:,.2f} tỷ | Lãi gộp: {period_targets.get('Lãi gộp', 0)/1000:,.2f} tỷ")
+
+    # Chỉ load/tính dữ liệu mà dashboard đang chọn cần (trong kỳ đã chọn)
+    graph = build_dashboard_graph(sheet, projects_df, targets_df, period_start, period_end, channel_filter)
+    data = graph.resolve(DASHBOARD_INPUTS[dashboard_type])
+    projects = data['projects']
+
+    # Cache figure: khóa theo fingerprint dữ liệu đầu vào của từng biểu đồ và bộ lọc kỳ/kênh
+    figures = get_figure_cache()
+    filter_state = (period_start, period_end, channel_filter)
+
+    # Hiển thị trạng thái dữ liệu
+    if len(projects_df) == 0:
+        st.warning("⚠️ **Chưa có dữ liệu dự án!** Vui lòng thêm dự án ở tab 'Quản lý Dự án' để xem dashboard đầy đủ.")
+        st.info("💡 Dashboard đang hiển thị với dữ liệu mẫu (0 VNĐ)")
+    else:
+        st.success(f"✅ Đang hiển thị dữ liệu thật từ Google Sheets: **{len(projects)} dự án** trong kỳ {period_label}")
+
+    st.markdown("---")
+
+    # ==================== DASHBOARD 1: CEO/CCO ====================
+    if dashboard_type == "🎯 CEO/CCO - Tổng quan":
+        cube, revenue_data, pipeline_data = data['cube'], data['revenue_data'], data['pipeline_data']
+        pva, cumulative_target = data['pva'], data['cumulative_target']
+    
+        # KPI Cards
+        col1, col2, col3, col4 = st.columns(4)
+    
+        total_revenue = pva['Doanh thu TH'].sum()
+        gross_profit = pva['Lãi gộp TH'].sum()
+        target_revenue = period_targets.get('Doanh thu', 0)
+        target_gross_profit = period_targets.get('Lãi gộp', 0)
+        revenue_achievement = (total_revenue / target_revenue) * 100 if total_revenue > 0 and target_revenue > 0 else 0
+    
+        with col1:
+            st.metric("💰 Doanh thu tích lũy", f"{total_revenue:,.0f}M", f"{revenue_achievement:.1f}% target")
+    
+        with col2:
+            st.metric("📊 Lãi gộp", f"{gross_profit:,.0f}M", f"{(gross_profit/target_gross_profit)*100:.1f}% target" if gross_profit > 0 and target_gross_profit > 0 else "0%")
+    
+        with col3:
+            # Tính tỷ lệ khách ngoài từ cube (số dự án theo Loại)
+            projects_by_type = cube.by('Loại', 'Số dự án', start=period_start, end=period_end, Kênh=channel_filter)
+            total_project_count = projects_by_type.sum()
+            internal_project_count = projects_by_type[projects_by_type.index.str.contains('Nội bộ', case=False)].sum()
+            external_rate = ((total_project_count - internal_project_count) / total_project_count * 100) if total_project_count > 0 else 0
+            st.metric("🎯 Khách ngoài", f"{external_rate:.1f}%", f"Target: 45%")
+    
+        with col4:
+            # Pipeline coverage từ dữ liệu thật
+            total_pipeline = pipeline_data['Count'].sum()
+            won_count = pipeline_data[pipeline_data['Stage'] == 'Won']['Count'].values[0] if len(pipeline_data) > 0 else 0
+            pipeline_coverage = (total_pipeline / won_count) if won_count > 0 else 0
+            st.metric("📈 Pipeline Coverage", f"{pipeline_coverage:.1f}x", "Healthy" if pipeline_coverage >= 3 else "Low")
+    
+        st.markdown("---")
+    
+        # Revenue Chart
+        col1, col2 = st.columns([3, 2])
+    
+        with col1:
+            st.subheader("📊 Doanh thu theo kênh (Tích lũy)")
+        
+            def build_revenue_chart():
+                fig_revenue = go.Figure()
+        
+                for channel in ['Nội bộ', 'Gov-Hiệp hội', 'Corporate']:
+                    if channel in channel_filter:
+                        fig_revenue.add_trace(go.Bar(
+                            name=channel,
+                            x=revenue_data['Tháng'],
+                            y=revenue_data[channel] / 1_000_000,
+                            text=[f"{val/1_000_000:.0f}M" if val > 0 else "" for val in revenue_data[channel]],
+                            textposition='inside'
+                        ))
+        
+                # Target line
+                fig_revenue.add_trace(go.Scatter(
+                    name='Target',
+                    x=revenue_data['Tháng'],
+                    y=cumulative_target,
+                    mode='lines+markers',
+                    line=dict(color='red', width=3, dash='dash')
+                ))
+        
+                fig_revenue.update_layout(
+                    barmode='stack', 
+                    height=400, 
+                    hovermode='x unified',
+                    yaxis_title="Doanh thu (M VNĐ)"
+                )
+                return fig_revenue
+        
+            fig_revenue = figures.get('ceo_revenue', fingerprint(revenue_data, cumulative_target), filter_state, build_revenue_chart)
+            st.plotly_chart(fig_revenue, use_container_width=True)
+    
+        with col2:
+            st.subheader("💧 Biên lợi nhuận")
+        
+            cogs = pva['COGS TH'].sum()
+            # Chi phí VH chưa theo dõi thực tế: ước tính theo KH các tháng đã qua
+            operating_cost = pva[f'Chi phí VH {ESTIMATE_SUFFIX}'].sum()
+            net_profit = pva[f'LNTT {ESTIMATE_SUFFIX}'].sum()
+        
+            def build_waterfall_chart():
+                fig_waterfall = go.Figure(go.Waterfall(
+                    orientation="v",
+                    measure=["relative", "relative", "total", "relative", "total"],
+                    x=["Doanh thu", "COGS", "Lãi gộp", f"Chi phí VH ({ESTIMATE_SUFFIX})", f"LNTT ({ESTIMATE_SUFFIX})"],
+                    y=[total_revenue, -cogs, 0, -operating_cost, 0],
+                    text=[f"{total_revenue:,.0f}M", f"{-cogs:,.0f}M", f"{gross_profit:,.0f}M", 
+                          f"{-operating_cost:,.0f}M", f"{net_profit:,.0f}M"],
+                    textposition="outside",
+                    decreasing={"marker": {"color": "#ff6b6b"}},
+                    increasing={"marker": {"color": "#51cf66"}},
+                    totals={"marker": {"color": "#1f77b4"}}
+                ))
+        
+                fig_waterfall.update_layout(height=400, showlegend=False)
+                return fig_waterfall
+        
+            fig_waterfall = figures.get('ceo_waterfall', (total_revenue, cogs, gross_profit, operating_cost, net_profit), filter_state, build_waterfall_chart)
+            st.plotly_chart(fig_waterfall, use_container_width=True)
+            st.caption("Chi phí VH và LNTT là số ước tính: chi phí VH lấy theo KH của các tháng đã qua (chưa theo dõi thực tế).")
+    
+        st.markdown("---")
+    
+        # Pipeline & Customer Mix
+        col1, col2 = st.columns(2)
+    
+        with col1:
+            st.subheader("🎯 Pipeline Coverage")
+        
+            if pipeline_data['Count'].sum() > 0:
+                def build_pipeline_chart():
+                    fig_funnel = go.Figure(go.Funnel(
+                        y=pipeline_data['Stage'],
+                        x=pipeline_data['Count'],
+                        textposition="inside",
+                        textinfo="value+percent initial",
+                        marker=dict(color=["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"])
+                    ))
+            
+                    fig_funnel.update_layout(height=400)
+                    return fig_funnel
+            
+                fig_funnel = figures.get('ceo_pipeline', fingerprint(pipeline_data), filter_state, build_pipeline_chart)
+                st.plotly_chart(fig_funnel, use_container_width=True)
+            
+                conversion_rate = (pipeline_data.iloc[-1]['Count'] / pipeline_data.iloc[0]['Count'] * 100) if pipeline_data.iloc[0]['Count'] > 0 else 0
+                st.info(f"📊 **Conversion Rate:** {conversion_rate:.1f}% | **Won Projects:** {pipeline_data.iloc[-1]['Count']}")
+            else:
+                st.info("Chưa có dữ liệu pipeline")
+    
+        with col2:
+            st.subheader("🥧 Cơ cấu khách hàng")
+        
+            # Tính tỷ lệ nội bộ vs bên ngoài từ cube
+            if total_project_count > 0:
+                internal_pct = internal_project_count / total_project_count * 100
+                external_pct = 100 - internal_pct
+            else:
+                internal_pct, external_pct = 0, 0
+        
+            def build_customer_mix_chart():
+                fig_donut = go.Figure(data=[go.Pie(
+                    labels=['Nội bộ', 'Bên ngoài'],
+                    values=[internal_pct, external_pct],
+                    hole=0.5,
+                    marker=dict(colors=['#1f77b4', '#ff7f0e']),
+                    textinfo='label+percent',
+                    textfont_size=14
+                )])
+        
+                fig_donut.update_layout(
+                    height=400,
+                    annotations=[dict(text='Customer<br>Mix', x=0.5, y=0.5, font_size=16, showarrow=False)]
+                )
+        
+                return fig_donut
+        
+            fig_donut = figures.get('ceo_customer_mix', (internal_pct, external_pct), filter_state, build_customer_mix_chart)
+            st.plotly_chart(fig_donut, use_container_width=True)
+        
+            if external_pct >= 45:
+                st.success(f"✅ Đạt mục tiêu cơ cấu khách hàng ({external_pct:.0f}% >= 45%)")
+            else:
+                st.warning(f"⚠️ Chưa đạt mục tiêu ({external_pct:.0f}% < 45%)")
+
+    # ==================== DASHBOARD 2: KÊNH BÁN ====================
+    elif dashboard_type == "💼 Kênh bán":
+        col1, col2, col3, col4 = st.columns(4)
+    
+        pipeline_data, sales_perf = data['pipeline_data'], data['sales_perf']
+    
+        # Funnel thật từ log đổi trạng thái của các dự án trong kỳ
+        funnel = data['funnel']
+        period_ids = projects['ID'] if len(projects) > 0 else []
+        funnel_summary = funnel.stage_summary(period_ids)
+    
+        total_leads = pipeline_data['Count'].sum()
+        win_rate = funnel.win_rate(period_ids)
+        close_time = funnel.close_time(period_ids)
+    
+        with col1:
+            st.metric("🎯 Tổng Lead", int(total_leads), f"+{int(total_leads * 0.08)}")
+        with col2:
+            st.metric("✅ Win Rate", f"{win_rate:.1f}%", f"+{win_rate * 0.1:.1f}%")
+        with col3:
+            avg_deal = (sales_perf['Doanh thu'].sum() / sales_perf['Số deal'].sum() / 1000) if len(sales_perf) > 0 and sales_perf['Số deal'].sum() > 0 else 0
+            st.metric("💵 AOV", f"{avg_deal:.0f}M", "+15%")
+        with col4:
+            st.metric("⏱️ Close Time", f"{close_time:.0f} ngày" if not np.isnan(close_time) else "N/A")
+    
+        st.markdown("---")
+    
+        col1, col2 = st.columns([3, 2])
+    
+        with col1:
+            st.subheader("🔄 Lead Flow (Sankey)")
+        
+            transitions = funnel.transitions(period_ids)
+            if len(transitions) > 0:
+                # Các bước chuyển thật giữa các giai đoạn (kể cả Lost) từ log StatusHistory
+                def build_sankey_chart():
+                    nodes = FUNNEL_STAGES + [LOST_STAGE]
+                    node_index = {stage: i for i, stage in enumerate(nodes)}
+                    link_colors = ["rgba(127,127,127,0.3)" if stage == LOST_STAGE else "rgba(31,119,180,0.3)"
+                                   for stage in transitions['Stage']]
+            
+                    fig_sankey = go.Figure(data=[go.Sankey(
+                        node=dict(
+                            pad=15,
+                            thickness=20,
+                            label=nodes,
+                            color=["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#7f7f7f"]
+                        ),
+                        link=dict(
+                            source=transitions['Từ stage'].map(node_index).tolist(),
+                            target=transitions['Stage'].map(node_index).tolist(),
+                            value=transitions['Số dự án'].tolist(),
+                            color=link_colors
+                        )
+                    )])
+            
+                    fig_sankey.update_layout(height=400)
+                    return fig_sankey
+            
+                fig_sankey = figures.get('sales_sankey', fingerprint(transitions), filter_state, build_sankey_chart)
+                st.plotly_chart(fig_sankey, use_container_width=True)
+            
+                st.dataframe(funnel_summary, hide_index=True, use_container_width=True)
+            else:
+                st.info("Chưa có dữ liệu chuyển trạng thái (log StatusHistory)")
+    
+        with col2:
+            st.subheader("📊 Phân bố giá trị Deal")
+        
+            if len(projects) > 0 and 'Doanh thu' in projects.columns:
+                deal_values = pd.to_numeric(projects['Doanh thu'], errors='coerce').dropna() / 1000
+            
+                if len(deal_values) > 0:
+                    def build_deal_box_chart():
+                        fig_box = go.Figure()
+                        fig_box.add_trace(go.Box(
+                            y=deal_values,
+                            boxmean='sd',
+                            marker_color='#1f77b4'
+                        ))
+                
+                        fig_box.update_layout(
+                            height=400,
+                            yaxis_title="Giá trị (M VNĐ)",
+                            showlegend=False
+                        )
+                
+                        return fig_box
+                
+                    fig_box = figures.get('sales_deal_box', fingerprint(deal_values), filter_state, build_deal_box_chart)
+                    st.plotly_chart(fig_box, use_container_width=True)
+                    st.info(f"📊 **Median:** {deal_values.median():.1f}M | **Mean:** {deal_values.mean():.1f}M")
+                else:
+                    st.info("Chưa có dữ liệu doanh thu")
+            else:
+                st.info("Chưa có dữ liệu")
+    
+        st.markdown("---")
+    
+        st.subheader("🏆 Sales Performance")
+    
+        if len(sales_perf) > 0:
+            sales_perf_sorted = sales_perf.sort_values('Doanh thu', ascending=False).reset_index(drop=True)
+        
+            col1, col2 = st.columns([2, 3])
+        
+            with col1:
+                top_5 = sales_perf_sorted.head(5)[['Nhân viên', 'Doanh thu', 'Số deal']]
+                top_5 = top_5.assign(**{'Doanh thu': top_5['Doanh thu'].apply(lambda x: f"{x/1000:.0f}M")})
+                st.dataframe(top_5, hide_index=True, use_container_width=True, height=250)
+        
+            with col2:
+                def build_sales_scatter():
+                    fig_scatter = px.scatter(
+                        sales_perf,
+                        x='Số deal',
+                        y='Doanh thu',
+                        size=sales_perf['Conversion %'].clip(lower=1),
+                        color='Kênh',
+                        hover_data=['Nhân viên', 'Số thắng', 'Conversion %', 'CSAT TB'],
+                        title="Hiệu suất theo Số deal vs Doanh thu"
+                    )
+            
+                    fig_scatter.update_layout(height=300)
+                    return fig_scatter
+            
+                fig_scatter = figures.get('sales_performance', fingerprint(sales_perf), filter_state, build_sales_scatter)
+                st.plotly_chart(fig_scatter, use_container_width=True)
+        else:
+            st.info("Chưa có dữ liệu sales performance")
+
+    # ==================== DASHBOARD 3: DỰ ÁN ====================
+    elif dashboard_type == "📋 Dự án":
+        reconciliation = data['reconciliation']
+        period_ids = projects['ID'] if len(projects) > 0 else []
+        cost_variance = reconciliation.cost_variance(period_ids)
+        period_reconciliation = reconciliation.projects[reconciliation.projects['Project_ID'].isin(pd.Index(period_ids).astype(str))]
+        n_overruns = int(period_reconciliation['Vượt chi phí'].sum())
+    
+        col1, col2, col3, col4 = st.columns(4)
+    
+        active_projects = len(projects[projects['Trạng thái'] == 'Đang thực hiện']) if len(projects) > 0 else 0
+        avg_profit = projects['Lợi nhuận %'].mean() if len(projects) > 0 else 0
+        avg_csat = projects['CSAT'].mean() if len(projects) > 0 else np.nan
+    
+        with col1:
+            st.metric("📋 Dự án đang chạy", active_projects, f"+{int(active_projects * 0.25)}")
+        with col2:
+            st.metric("💰 Biên LN TB", f"{avg_profit:.1f}%", "+2.3%")
+        with col3:
+            st.metric("⭐ CSAT TB", f"{avg_csat:.2f}/5" if pd.notna(avg_csat) else "N/A",
+                      f"{projects['CSAT'].notna().sum()} khảo sát" if len(projects) > 0 else None)
+        with col4:
+            st.metric("📊 Cost Variance", f"{cost_variance:+.1f}%" if pd.notna(cost_variance) else "N/A",
+                      f"{n_overruns} dự án vượt" if n_overruns > 0 else "OK",
+                      delta_color="inverse" if n_overruns > 0 else "off")
+    
+        st.markdown("---")
+    
+        if len(projects) > 0:
+            st.subheader("💎 Ma trận Doanh thu - Lợi nhuận")
+        
+            def build_project_matrix():
+                # Dự án chưa nhập số khách vẽ với kích thước nhỏ nhất
+                has_guests = projects['Số khách'].notna().any()
+                fig_scatter = px.scatter(
+                    projects.assign(**{'Số khách': projects['Số khách'].fillna(0).clip(lower=1)}) if has_guests else projects,
+                    x='Doanh thu',
+                    y='Lợi nhuận %',
+                    size='Số khách' if has_guests else None,
+                    color='Loại',
+                    hover_data=['Tên dự án', 'CSAT'],
+                    title="Bubble size = Số lượng khách"
+                )
+        
+                fig_scatter.add_hline(y=projects['Lợi nhuận %'].median(), line_dash="dash", line_color="gray")
+                fig_scatter.add_vline(x=projects['Doanh thu'].median(), line_dash="dash", line_color="gray")
+                fig_scatter.update_layout(height=450)
+                return fig_scatter
+        
+            fig_scatter = figures.get('project_matrix', fingerprint(projects[['Tên dự án', 'Loại', 'Doanh thu', 'Lợi nhuận %', 'CSAT', 'Số khách']]), filter_state, build_project_matrix)
+            st.plotly_chart(fig_scatter, use_container_width=True)
+        
+            st.info("💡 **Insight:** Tập trung nhân rộng các event ở góc phải trên (DT cao + LN cao)")
+        
+            st.markdown("---")
+        
+            # Đối soát ngân sách dự án với giao dịch Finance
+            st.subheader("🧾 Đối soát ngân sách vs thực tế")
+            reconciled = period_reconciliation[period_reconciliation['Có giao dịch']]
+        
+            if len(reconciled) > 0:
+                overruns = reconciled[reconciled['Vượt chi phí']].sort_values('Chênh lệch CP', ascending=False)
+                if len(overruns) > 0:
+                    st.warning(f"⚠️ {len(overruns)} dự án có chi phí thực tế vượt ngân sách")
+            
+                money_columns = ['Doanh thu KH', 'Doanh thu TT', 'Chênh lệch DT', 'Chi phí KH', 'Chi phí TT', 'Chênh lệch CP']
+                st.dataframe(
+                    reconciled.drop(columns='Có giao dịch').sort_values('Chênh lệch CP', ascending=False)
+                    .style.format({**{c: "{:,.0f}" for c in money_columns},
+                                   'Chênh lệch CP %': "{:.1f}", 'Lợi nhuận % KH': "{:.1f}", 'Lợi nhuận % TT': "{:.1f}"}),
+                    hide_index=True, use_container_width=True
+                )
+            
+                with st.expander("📂 Chi tiết theo hạng mục"):
+                    categories = reconciliation.categories
+                    st.dataframe(categories[categories['Project_ID'].isin(reconciled['Project_ID'])]
+                                 .style.format({'Số tiền': "{:,.0f}", '% ngân sách': "{:.1f}"}),
+                                 hide_index=True, use_container_width=True)
+            else:
+                st.info("Chưa có giao dịch tài chính cho các dự án trong kỳ")
+        
+            if len(reconciliation.unmatched) > 0:
+                st.caption(f"{reconciliation.unmatched['Project_ID'].nunique()} mã dự án trong Finance không có trong Projects")
+        
+            st.markdown("---")
+        
+            # CSAT Distribution
+            if projects['CSAT'].notna().any():
+                st.subheader("⭐ Phân bố CSAT & Chi tiết dự án")
+            
+                col1, col2 = st.columns([2, 3])
+            
+                with col1:
+                    def build_csat_chart():
+                        csat_bins = pd.cut(projects['CSAT'], bins=[0, 3, 3.5, 4, 4.5, 5], labels=['1-3', '3-3.5', '3.5-4', '4-4.5', '4.5-5'])
+                        csat_dist = csat_bins.value_counts().sort_index()
+                
+                        fig_csat = go.Figure(data=[go.Bar(
+                            x=csat_dist.index.astype(str),
+                            y=csat_dist.values,
+                            marker_color=['#ff6b6b', '#ffa94d', '#ffd43b', '#51cf66', '#37b24d']
+                        )])
+                
+                        fig_csat.update_layout(height=300, xaxis_title="Điểm CSAT", yaxis_title="Số lượng event")
+                        return fig_csat
+                
+                    fig_csat = figures.get('project_csat', fingerprint(projects['CSAT']), filter_state, build_csat_chart)
+                    st.plotly_chart(fig_csat, use_container_width=True)
+            
+                with col2:
+                    low_csat = projects[projects['CSAT'] < 4.0][['Tên dự án', 'Loại', 'Doanh thu', 'CSAT']].sort_values('CSAT')
+                
+                    if len(low_csat) > 0:
+                        low_csat = low_csat.assign(**{'Doanh thu': low_csat['Doanh thu'].apply(lambda x: f"{x/1000:.0f}M")})
+                        st.dataframe(low_csat, hide_index=True, use_container_width=True, height=300)
+                    else:
+                        st.success("🎉 Không có dự án nào có CSAT < 4.0!")
+            else:
+                st.info("Chưa có dữ liệu CSAT - nhập CSAT cho dự án ở tab 'Quản lý Dự án'")
+        else:
+            st.info("Chưa có dữ liệu dự án")
+
+    # ==================== DASHBOARD 4: SO SÁNH ====================
+    elif dashboard_type == "📈 So sánh kế hoạch":
+        pva, cumulative_target = data['pva'], data['cumulative_target']
+    
+        total_revenue = pva['Doanh thu TH'].sum()
+    
+        plan_column = f'KH {period_label}'
+        kpis = ['Doanh thu', 'Lãi gộp', 'LNTT', 'Số dự án', 'CSAT TB']
+        comparison = period_comparison(pva, kpis, plan_column)
+    
+        col1, col2 = st.columns([3, 2])
+    
+        with col1:
+            st.subheader("📊 Bảng so sánh chi tiết")
+            st.dataframe(comparison, hide_index=True, use_container_width=True, height=250)
+    
+        with col2:
+            st.subheader("🎯 Tỷ lệ hoàn thành")
+        
+            target_revenue = period_targets.get('Doanh thu', 0)
+            revenue_achievement = (total_revenue / target_revenue) * 100 if total_revenue > 0 and target_revenue > 0 else 0
+        
+            def build_gauge_chart():
+                fig_gauge = go.Figure(go.Indicator(
+                    mode="gauge+number+delta",
+                    value=revenue_achievement,
+                    domain={'x': [0, 1], 'y': [0, 1]},
+                    title={'text': "Doanh thu", 'font': {'size': 24}},
+                    delta={'reference': 100, 'suffix': "%"},
+                    gauge={
+                        'axis': {'range': [None, 120]},
+                        'bar': {'color': "darkblue"},
+                        'steps': [
+                            {'range': [0, 50], 'color': '#ff6b6b'},
+                            {'range': [50, 80], 'color': '#ffd43b'},
+                            {'range': [80, 100], 'color': '#51cf66'},
+                            {'range': [100, 120], 'color': '#37b24d'}
+                        ],
+                        'threshold': {
+                            'line': {'color': "red", 'width': 4},
+                            'thickness': 0.75,
+                            'value': 100
+                        }
+                    }
+                ))
+        
+                fig_gauge.update_layout(height=300)
+                return fig_gauge
+        
+            fig_gauge = figures.get('plan_gauge', round(revenue_achievement, 4), filter_state, build_gauge_chart)
+            st.plotly_chart(fig_gauge, use_container_width=True)
+    
+        st.markdown("---")
+    
+        # Monthly trend
+        st.subheader("📈 Xu hướng theo tháng: KH vs TH")
+    
+        monthly_comparison = pd.DataFrame({
+            'Tháng': pva.index,
+            'KH tích lũy': cumulative_target,
+            'TH tích lũy': pva['Doanh thu TH'].cumsum().to_numpy()
+        })
+    
+        def build_trend_chart():
+            fig_trend = go.Figure()
+    
+            fig_trend.add_trace(go.Scatter(
+                x=monthly_comparison['Tháng'],
+                y=monthly_comparison['KH tích lũy'],
+                mode='lines+markers',
+                name='Kế hoạch',
+                line=dict(color='red', width=3, dash='dash'),
+                marker=dict(size=8)
+            ))
+    
+            fig_trend.add_trace(go.Scatter(
+                x=monthly_comparison['Tháng'],
+                y=monthly_comparison['TH tích lũy'],
+                mode='lines+markers',
+                name='Thực hiện',
+                line=dict(color='blue', width=3),
+                marker=dict(size=8),
+                fill='tonexty',
+                fillcolor='rgba(31, 119, 180, 0.1)'
+            ))
+    
+            fig_trend.update_layout(
+                height=400, 
+                hovermode='x unified', 
+                yaxis_title="Doanh thu tích lũy (M VNĐ)"
+            )
+            return fig_trend
+    
+        fig_trend = figures.get('plan_trend', fingerprint(monthly_comparison), filter_state, build_trend_chart)
+        st.plotly_chart(fig_trend, use_container_width=True)
+
+    # ==================== DASHBOARD 5: TỔNG HỢP CHI NHÁNH ====================
+    else:
+        # Đọc song song các chi nhánh; chi nhánh vượt quota/chậm chỉ thiếu phần của nó
+        with st.spinner("⏳ Đang tải dữ liệu các chi nhánh..."):
+            branch_projects, branch_errors = load_branch_projects([t.id for t in tenants])
+        for tenant_id, error in branch_errors.items():
+            stale = " (đang hiển thị dữ liệu lần trước)" if tenant_id in branch_projects else ""
+            st.warning(f"⚠️ {registry.get(tenant_id).name}: {error}{stale}")
+    
+        summary = branch_summary(branch_projects, period_start, period_end, channel_filter)
+        by_branch = summary.groupby('Chi nhánh')[['Số dự án', 'Doanh thu', 'Chi phí', 'Lãi gộp']].sum()
+    
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🏢 Chi nhánh", f"{len(branch_projects)}/{len(tenants)}")
+        with col2:
+            st.metric("📋 Số dự án", int(by_branch['Số dự án'].sum()))
+        with col3:
+            st.metric("💰 Doanh thu", f"{by_branch['Doanh thu'].sum() / 1_000_000:,.0f}M")
+        with col4:
+            st.metric("📊 Lãi gộp", f"{by_branch['Lãi gộp'].sum() / 1_000_000:,.0f}M")
+    
+        if len(summary) > 0:
+            col1, col2 = st.columns([3, 2])
+            with col1:
+                st.subheader("📊 Doanh thu theo chi nhánh và kênh")
+                fig_branch = px.bar(summary.assign(**{'Doanh thu (M)': summary['Doanh thu'] / 1_000_000}),
+                                    x='Chi nhánh', y='Doanh thu (M)', color='Kênh', barmode='stack')
+                fig_branch.update_layout(height=400)
+                st.plotly_chart(fig_branch, use_container_width=True)
+            with col2:
+                st.subheader("📋 Bảng tổng hợp")
+                table = by_branch.assign(**{'Tỷ lệ lãi gộp (%)': (by_branch['Lãi gộp'] / by_branch['Doanh thu'].replace(0, np.nan) * 100).round(1)})
+                st.dataframe(table, use_container_width=True)
+        else:
+            st.info(f"Chưa có dự án nào của các chi nhánh trong kỳ {period_label}")
+    
+        if st.button("🔄 Làm mới dữ liệu chi nhánh"):
+            registry.forget("Projects")
+            st.rerun()
+
+dashboard_view(sheet, projects_df, dashboard_type)
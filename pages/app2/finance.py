@@ -0,0 +1,234 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+
+from beevent_app.data import (
+    connect, current_tenant, load_finance, load_projects, save_finance, sync_finance_ledger
+)
+
+# ==================== PAGE 6: QUẢN LÝ TÀI CHÍNH ====================
+st.markdown('<div class="main-header">💰 QUẢN LÝ TÀI CHÍNH</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+projects_df = load_projects(sheet)
+finance_df = load_finance(sheet)
+
+tab1, tab2, tab3 = st.tabs(["📋 Giao dịch", "➕ Thêm giao dịch", "📊 Báo cáo tài chính"])
+
+# TAB 1: Danh sách giao dịch (fragment: lọc chỉ chạy lại danh sách)
+@st.fragment
+def transaction_list(sheet):
+    projects_df = load_projects(sheet)
+    finance_df = load_finance(sheet)
+    
+    if len(finance_df) > 0:
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            type_filter = st.multiselect(
+                "Loại giao dịch:",
+                options=finance_df['Loại'].unique().tolist(),
+                default=finance_df['Loại'].unique().tolist()
+            )
+        
+        with col2:
+            status_filter = st.multiselect(
+                "Trạng thái:",
+                options=finance_df['Trạng thái'].unique().tolist(),
+                default=finance_df['Trạng thái'].unique().tolist()
+            )
+        
+        with col3:
+            if len(projects_df) > 0:
+                project_filter = st.selectbox(
+                    "Dự án:",
+                    options=['Tất cả'] + projects_df['ID'].tolist()
+                )
+            else:
+                project_filter = 'Tất cả'
+        
+        # Apply filters
+        filtered_df = finance_df[
+            (finance_df['Loại'].isin(type_filter)) &
+            (finance_df['Trạng thái'].isin(status_filter))
+        ]
+        
+        if project_filter != 'Tất cả':
+            filtered_df = filtered_df[filtered_df['Project_ID'] == project_filter]
+        
+        st.markdown(f"**Tìm thấy {len(filtered_df)} giao dịch**")
+        
+        # Display transactions
+        for idx, row in filtered_df.iterrows():
+            with st.expander(f"💵 {row['Hạng mục']} - {row['Loại']} - {pd.to_numeric(row['Số tiền'], errors='coerce'):,.0f} VNĐ"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.write(f"**ID:** {row['ID']}")
+                    st.write(f"**Dự án:** {row['Project_ID']}")
+                    st.write(f"**Loại:** {row['Loại']}")
+                
+                with col2:
+                    st.write(f"**Hạng mục:** {row['Hạng mục']}")
+                    st.write(f"**Số tiền:** {pd.to_numeric(row['Số tiền'], errors='coerce'):,.0f} VNĐ")
+                    st.write(f"**Ngày:** {row['Ngày']}")
+                
+                with col3:
+                    st.write(f"**Người thanh toán:** {row['Người thanh toán']}")
+                    st.write(f"**Trạng thái:** {row['Trạng thái']}")
+                
+                st.write(f"**Ghi chú:** {row.get('Ghi chú', 'Không có')}")
+    else:
+        st.info("📭 Chưa có giao dịch nào.")
+
+with tab1:
+    transaction_list(sheet)
+
+# TAB 2: Thêm giao dịch
+with tab2:
+    if len(projects_df) > 0:
+        st.subheader("➕ Thêm giao dịch mới")
+        
+        with st.form("add_finance_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                project_id = st.selectbox(
+                    "Chọn dự án *",
+                    options=projects_df['ID'].tolist(),
+                    format_func=lambda x: f"{x} - {projects_df[projects_df['ID']==x]['Tên dự án'].values[0]}"
+                )
+                loai = st.selectbox("Loại giao dịch *", ["Thu", "Chi"])
+                hang_muc = st.text_input("Hạng mục *", placeholder="Ví dụ: Thanh toán venue")
+                so_tien = st.number_input("Số tiền (VNĐ) *", min_value=0, step=100000, format="%d")
+            
+            with col2:
+                ngay = st.date_input("Ngày giao dịch *")
+                nguoi_thanh_toan = st.text_input("Người thanh toán *", placeholder="Nguyễn Văn A")
+                trang_thai = st.selectbox("Trạng thái *", ["Chờ duyệt", "Đã duyệt", "Đã thanh toán", "Từ chối"])
+            
+            ghi_chu = st.text_area("Ghi chú", placeholder="Thông tin bổ sung...")
+            
+            submitted = st.form_submit_button("💾 Lưu giao dịch", use_container_width=True)
+            
+            if submitted:
+                if not hang_muc or not nguoi_thanh_toan:
+                    st.error("❌ Vui lòng điền đầy đủ thông tin bắt buộc (*)")
+                else:
+                    finance_data = {
+                        "ID": "",
+                        "Project_ID": project_id,
+                        "Loại": loai,
+                        "Hạng mục": hang_muc,
+                        "Số tiền": so_tien,
+                        "Ngày": ngay.strftime("%Y-%m-%d"),
+                        "Người thanh toán": nguoi_thanh_toan,
+                        "Trạng thái": trang_thai,
+                        "Ghi chú": ghi_chu,
+                        "Ngày tạo": ""
+                    }
+                    
+                    if save_finance(sheet, finance_data):
+                        st.success("✅ Đã thêm giao dịch thành công!")
+                        st.rerun()
+    else:
+        st.warning("⚠️ Chưa có dự án nào. Vui lòng tạo dự án trước!")
+
+# Tra số dư (fragment: đổi ngày/dự án không vẽ lại các biểu đồ của báo cáo)
+@st.fragment
+def balance_lookup(sheet):
+    ledger = sync_finance_ledger(sheet, load_finance(sheet))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        balance_date = st.date_input("Số dư tại ngày:", value=datetime.now().date(), key="ledger_balance_date")
+    with col2:
+        balance_project = st.selectbox("Dự án:", ['Tất cả'] + sorted(ledger.project_pnl().index.tolist()),
+                                       key="ledger_balance_project")
+    with col3:
+        if balance_project == 'Tất cả':
+            st.metric("💼 Số dư sổ sách", f"{ledger.balance(balance_date)/1_000_000:,.1f}M")
+            st.caption(f"Đã thanh toán: {ledger.balance(balance_date, cash=True)/1_000_000:,.1f}M")
+        else:
+            st.metric("💼 Số dư dự án", f"{ledger.balance(balance_date, balance_project)/1_000_000:,.1f}M")
+
+# TAB 3: Báo cáo tài chính
+with tab3:
+    if len(finance_df) > 0:
+        ledger = sync_finance_ledger(sheet, finance_df)
+        totals = ledger.totals()
+        
+        # Summary metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            total_revenue = totals['Thu']
+            st.metric("💰 Tổng thu", f"{total_revenue/1_000_000:,.1f}M")
+        
+        with col2:
+            total_expense = totals['Chi']
+            st.metric("💸 Tổng chi", f"{total_expense/1_000_000:,.1f}M")
+        
+        with col3:
+            net_profit = total_revenue - total_expense
+            st.metric("📊 Lãi/Lỗ", f"{net_profit/1_000_000:,.1f}M", 
+                     delta=f"{(net_profit/total_revenue*100):.1f}%" if total_revenue > 0 else "0%")
+        
+        with col4:
+            pending = len(finance_df[finance_df['Trạng thái'] == 'Chờ duyệt'])
+            st.metric("⏳ Chờ duyệt", pending)
+        
+        st.caption("Không tính các giao dịch bị từ chối.")
+        st.markdown("---")
+        
+        # Charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Thu/Chi theo hạng mục")
+            category_summary = ledger.category_summary()
+            fig = px.bar(category_summary, x='Hạng mục', y='Số tiền', color='Loại', barmode='group')
+            fig.update_layout(yaxis_title="Số tiền (VNĐ)")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("🥧 Phân bổ chi phí")
+            expense_data = category_summary[category_summary['Loại'] == 'Chi']
+            if len(expense_data) > 0:
+                fig = px.pie(values=expense_data['Số tiền'], names=expense_data['Hạng mục'])
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Chưa có dữ liệu chi phí")
+        
+        # Monthly cash flow + running balance
+        st.subheader("📈 Dòng tiền theo tháng")
+        cashflow = ledger.monthly_cashflow()
+        if len(cashflow) > 0:
+            fig = go.Figure()
+            fig.add_trace(go.Bar(x=cashflow.index, y=cashflow['Thu'], name='Thu', marker_color='#2ecc71'))
+            fig.add_trace(go.Bar(x=cashflow.index, y=-cashflow['Chi'], name='Chi', marker_color='#e74c3c'))
+            fig.add_trace(go.Scatter(x=cashflow.index, y=cashflow['Số dư lũy kế'], name='Số dư lũy kế',
+                                     mode='lines+markers', line=dict(color='#3498db', width=3)))
+            fig.update_layout(barmode='relative', height=400, yaxis_title="Số tiền (VNĐ)", hovermode='x unified')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Balance lookup
+        balance_lookup(sheet)
+        
+        # Cash flow by project
+        st.subheader("💵 Dòng tiền theo dự án")
+        project_cashflow = ledger.project_pnl()
+        
+        if len(project_cashflow) > 0:
+            st.dataframe(project_cashflow.style.format("{:,.0f}"), use_container_width=True)
+        else:
+            st.info("Chưa đủ dữ liệu để hiển thị dòng tiền")
+        
+        # AR/AP ageing
+        st.subheader("⏳ Tuổi công nợ (chưa thanh toán)")
+        st.dataframe(ledger.ageing().style.format("{:,.0f}"), use_container_width=True)
+    else:
+        st.info("Chưa có dữ liệu tài chính để báo cáo")
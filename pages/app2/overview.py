@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from beevent_app.data import connect, current_tenant, load_customers, load_projects, load_staff
+
+# ==================== PAGE 1: TỔNG QUAN ====================
+st.markdown('<div class="main-header">🏠 TỔNG QUAN HỆ THỐNG</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+projects_df = load_projects(sheet)
+customers_df = load_customers(sheet)
+staff_df = load_staff(sheet)
+
+# KPI Cards
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    total_projects = len(projects_df)
+    active_projects = len(projects_df[projects_df['Trạng thái'] == 'Đang thực hiện']) if len(projects_df) > 0 else 0
+    st.metric("📋 Tổng dự án", total_projects, f"{active_projects} đang chạy")
+
+with col2:
+    total_customers = len(customers_df)
+    st.metric("👥 Khách hàng", total_customers, "+5 tháng này")
+
+with col3:
+    total_staff = len(staff_df)
+    active_staff = len(staff_df[staff_df['Trạng thái'] == 'Đang làm']) if len(staff_df) > 0 else 0
+    st.metric("👨‍💼 Nhân sự", total_staff, f"{active_staff} active")
+
+with col4:
+    if len(projects_df) > 0 and 'Doanh thu' in projects_df.columns:
+        total_revenue = pd.to_numeric(projects_df['Doanh thu'], errors='coerce').sum() / 1_000_000
+        st.metric("💰 Doanh thu", f"{total_revenue:.1f}M", "+12%")
+    else:
+        st.metric("💰 Doanh thu", "0M", "Chưa có dữ liệu")
+
+st.markdown("---")
+
+# Recent activities
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("📋 Dự án gần đây")
+    if len(projects_df) > 0:
+        recent_projects = projects_df.tail(5)[['Tên dự án', 'Khách hàng', 'Trạng thái', 'PIC']]
+        st.dataframe(recent_projects, hide_index=True, use_container_width=True)
+    else:
+        st.info("Chưa có dự án nào. Hãy tạo dự án đầu tiên!")
+
+with col2:
+    st.subheader("👨‍💼 Nhân sự theo phòng ban")
+    if len(staff_df) > 0 and 'Phòng ban' in staff_df.columns:
+        dept_dist = staff_df['Phòng ban'].value_counts()
+        fig = px.pie(values=dept_dist.values, names=dept_dist.index, hole=0.4)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Chưa có dữ liệu nhân sự")
@@ -0,0 +1,231 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from beevent_app.data import (
+    PROJECT_STATUSES, connect, current_tenant, delete_project, load_projects, save_project,
+    update_project
+)
+
+# ==================== PAGE 2: QUẢN LÝ DỰ ÁN ====================
+st.markdown('<div class="main-header">📝 QUẢN LÝ DỰ ÁN</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+tab1, tab2, tab3 = st.tabs(["📋 Danh sách", "➕ Thêm mới", "📊 Thống kê"])
+
+# TAB 1: Danh sách dự án (fragment: lọc/tìm kiếm/mở form sửa chỉ chạy lại danh sách)
+@st.fragment
+def project_list(sheet):
+    projects_df = load_projects(sheet)
+    
+    if len(projects_df) > 0:
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            status_filter = st.multiselect(
+                "Lọc theo trạng thái:",
+                options=projects_df['Trạng thái'].unique().tolist(),
+                default=projects_df['Trạng thái'].unique().tolist()
+            )
+        
+        with col2:
+            if 'Loại' in projects_df.columns:
+                type_filter = st.multiselect(
+                    "Lọc theo loại:",
+                    options=projects_df['Loại'].unique().tolist(),
+                    default=projects_df['Loại'].unique().tolist()
+                )
+            else:
+                type_filter = []
+        
+        with col3:
+            search_term = st.text_input("🔍 Tìm kiếm:", placeholder="Tên dự án, khách hàng...")
+        
+        # Apply filters
+        filtered_df = projects_df[projects_df['Trạng thái'].isin(status_filter)]
+        
+        if type_filter and 'Loại' in projects_df.columns:
+            filtered_df = filtered_df[filtered_df['Loại'].isin(type_filter)]
+        
+        if search_term:
+            filtered_df = filtered_df[
+                filtered_df['Tên dự án'].str.contains(search_term, case=False, na=False) |
+                filtered_df['Khách hàng'].str.contains(search_term, case=False, na=False)
+            ]
+        
+        st.markdown(f"**Tìm thấy {len(filtered_df)} dự án**")
+        
+        # Display projects
+        for idx, row in filtered_df.iterrows():
+            with st.expander(f"🎯 {row['Tên dự án']} - {row['Khách hàng']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.write(f"**ID:** {row['ID']}")
+                    st.write(f"**Loại:** {row.get('Loại', 'N/A')}")
+                    st.write(f"**Trạng thái:** {row['Trạng thái']}")
+                
+                with col2:
+                    st.write(f"**Ngày bắt đầu:** {row.get('Ngày bắt đầu', 'N/A')}")
+                    st.write(f"**Ngày kết thúc:** {row.get('Ngày kết thúc', 'N/A')}")
+                    st.write(f"**PIC:** {row.get('PIC', 'N/A')}")
+                
+                with col3:
+                    doanh_thu = pd.to_numeric(row.get('Doanh thu', 0), errors='coerce')
+                    chi_phi = pd.to_numeric(row.get('Chi phí', 0), errors='coerce')
+                    st.write(f"**Doanh thu:** {doanh_thu:,.0f} VNĐ")
+                    st.write(f"**Chi phí:** {chi_phi:,.0f} VNĐ")
+                    st.write(f"**Lợi nhuận:** {row.get('Lợi nhuận %', 0)}%")
+                
+                st.write(f"**Ghi chú:** {row.get('Ghi chú', 'Không có')}")
+                
+                # Actions
+                col1, col2, col3 = st.columns([1, 1, 4])
+                with col1:
+                    if st.button("✏️ Sửa", key=f"edit_{row['ID']}"):
+                        st.session_state[f'editing_{row["ID"]}'] = True
+                with col2:
+                    if st.button("🗑️ Xóa", key=f"delete_{row['ID']}"):
+                        if delete_project(sheet, row['ID']):
+                            st.success("Đã xóa dự án!")
+                            st.rerun()
+                
+                # Đổi trạng thái (ghi vào log StatusHistory), CSAT và số khách thực tế
+                if st.session_state.get(f'editing_{row["ID"]}'):
+                    with st.form(f"status_form_{row['ID']}"):
+                        current_status = row.get('Trạng thái', '')
+                        current_csat = pd.to_numeric(row.get('CSAT', ''), errors='coerce')
+                        current_guests = pd.to_numeric(row.get('Số khách', ''), errors='coerce')
+                        
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            new_status = st.selectbox(
+                                "Trạng thái mới",
+                                PROJECT_STATUSES,
+                                index=PROJECT_STATUSES.index(current_status) if current_status in PROJECT_STATUSES else 0
+                            )
+                        with col2:
+                            new_csat = st.number_input("CSAT (1-5, 0 = chưa có)", min_value=0.0, max_value=5.0, step=0.1,
+                                                       value=float(current_csat) if pd.notna(current_csat) else 0.0)
+                        with col3:
+                            new_guests = st.number_input("Số khách thực tế", min_value=0, step=10, format="%d",
+                                                         value=int(current_guests) if pd.notna(current_guests) else 0)
+                        
+                        if st.form_submit_button("💾 Lưu"):
+                            try:
+                                updates = {
+                                    'Trạng thái': new_status,
+                                    'CSAT': round(new_csat, 1) if new_csat > 0 else "",
+                                    'Số khách': new_guests if new_guests > 0 else ""
+                                }
+                                if update_project(sheet, row['ID'], updates):
+                                    st.session_state[f'editing_{row["ID"]}'] = False
+                                    st.success("✅ Đã cập nhật dự án!")
+                                    st.rerun()
+                            except Exception as e:
+                                st.error(f"❌ Lỗi: {e}")
+    else:
+        st.info("📭 Chưa có dự án nào. Hãy thêm dự án đầu tiên!")
+
+with tab1:
+    project_list(sheet)
+
+# TAB 2: Thêm dự án mới
+with tab2:
+    st.subheader("➕ Thêm dự án mới")
+    
+    with st.form("add_project_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ten_du_an = st.text_input("Tên dự án *", placeholder="Ví dụ: Year End Party 2026")
+            khach_hang = st.text_input("Khách hàng *", placeholder="Tên công ty/tổ chức")
+            loai = st.selectbox("Loại dự án *", ["Teambuilding", "Gala Dinner", "Conference", "Festival", "Workshop", "Nội bộ", "Gov", "Corporate"])
+            ngay_bat_dau = st.date_input("Ngày bắt đầu *")
+            ngay_ket_thuc = st.date_input("Ngày kết thúc *")
+        
+        with col2:
+            doanh_thu = st.number_input("Doanh thu (VNĐ) *", min_value=0, step=1000000, format="%d")
+            chi_phi = st.number_input("Chi phí (VNĐ) *", min_value=0, step=1000000, format="%d")
+            loi_nhuan = ((doanh_thu - chi_phi) / doanh_thu * 100) if doanh_thu > 0 else 0
+            st.metric("Lợi nhuận %", f"{loi_nhuan:.2f}%")
+            trang_thai = st.selectbox("Trạng thái *", PROJECT_STATUSES)
+            pic = st.text_input("PIC (Người phụ trách)", placeholder="Nguyễn Văn A")
+        
+        team = st.text_input("Team", placeholder="Ví dụ: Team A, Team B")
+        so_khach = st.number_input("Số khách (dự kiến)", min_value=0, step=10, format="%d", help="Để 0 nếu chưa rõ")
+        ghi_chu = st.text_area("Ghi chú", placeholder="Thông tin bổ sung...")
+        
+        submitted = st.form_submit_button("💾 Lưu dự án", use_container_width=True)
+        
+        if submitted:
+            if not ten_du_an or not khach_hang:
+                st.error("❌ Vui lòng điền đầy đủ thông tin bắt buộc (*)")
+            else:
+                project_data = {
+                    "ID": "",  # Will be auto-generated
+                    "Tên dự án": ten_du_an,
+                    "Khách hàng": khach_hang,
+                    "Loại": loai,
+                    "Ngày bắt đầu": ngay_bat_dau.strftime("%Y-%m-%d"),
+                    "Ngày kết thúc": ngay_ket_thuc.strftime("%Y-%m-%d"),
+                    "Doanh thu": doanh_thu,
+                    "Chi phí": chi_phi,
+                    "Lợi nhuận %": round(loi_nhuan, 2),
+                    "Trạng thái": trang_thai,
+                    "PIC": pic,
+                    "Team": team,
+                    "Ghi chú": ghi_chu,
+                    "Ngày tạo": "",  # Will be auto-generated
+                    "CSAT": "",  # Nhập sau khi có khảo sát
+                    "Số khách": so_khach if so_khach > 0 else ""
+                }
+                
+                if save_project(sheet, project_data):
+                    st.success("✅ Đã thêm dự án thành công!")
+                    st.balloons()
+                    st.rerun()
+                else:
+                    st.error("❌ Có lỗi xảy ra. Vui lòng thử lại!")
+
+# TAB 3: Thống kê
+with tab3:
+    projects_df = load_projects(sheet)
+    
+    if len(projects_df) > 0:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            total_revenue = pd.to_numeric(projects_df['Doanh thu'], errors='coerce').sum()
+            st.metric("💰 Tổng doanh thu", f"{total_revenue/1_000_000:,.1f}M VNĐ")
+        
+        with col2:
+            total_cost = pd.to_numeric(projects_df['Chi phí'], errors='coerce').sum()
+            st.metric("💸 Tổng chi phí", f"{total_cost/1_000_000:,.1f}M VNĐ")
+        
+        with col3:
+            avg_profit = pd.to_numeric(projects_df['Lợi nhuận %'], errors='coerce').mean()
+            st.metric("📊 Lợi nhuận TB", f"{avg_profit:.1f}%")
+        
+        st.markdown("---")
+        
+        # Charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Dự án theo trạng thái")
+            status_dist = projects_df['Trạng thái'].value_counts()
+            fig = px.pie(values=status_dist.values, names=status_dist.index)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("💰 Doanh thu theo loại")
+            if 'Loại' in projects_df.columns:
+                revenue_by_type = projects_df.groupby('Loại')['Doanh thu'].sum().sort_values(ascending=False)
+                fig = px.bar(x=revenue_by_type.index, y=revenue_by_type.values/1_000_000)
+                fig.update_layout(xaxis_title="Loại dự án", yaxis_title="Doanh thu (M VNĐ)")
+                st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Chưa có dữ liệu để thống kê")
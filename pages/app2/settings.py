@@ -0,0 +1,237 @@
+import streamlit as st
+from datetime import datetime
+
+from beevent.exporter import EXPORT_FORMATS, export_archive
+from beevent.importer import IMPORT_SCHEMAS, read_upload, validate_import
+from beevent.rate_limit import READ, WRITE
+from beevent.revenue_cube import CHANNELS
+from beevent.storage import SQLiteRepository, SheetsRepository, copy_tables
+from beevent.targets import ALL_CHANNELS, from_wide, replace_year, to_wide
+
+from beevent_app.data import (
+    EXPORT_SOURCES, IMPORT_SHEETS, SHEET_LOADERS, connect, count_records, current_tenant,
+    get_repository, get_shared_tables, get_sheet_queue, get_sync_engine, import_records,
+    load_targets, save_targets
+)
+
+# ==================== PAGE 8: CÀI ĐẶT ====================
+st.markdown('<div class="main-header">⚙️ CÀI ĐẶT HỆ THỐNG</div>', unsafe_allow_html=True)
+
+tab1, tab2, tab3 = st.tabs(["🔧 Cấu hình", "📤 Export/Import", "ℹ️ Thông tin"])
+
+# Phần tĩnh của tab thông tin vẽ trước khi kết nối
+with tab3:
+    st.subheader("ℹ️ Thông tin hệ thống")
+    
+    st.markdown("""
+    ### 🎯 Beevent Management System v2.0
+    
+    **Tính năng chính:**
+    - ✅ Quản lý dự án (CRUD)
+    - ✅ Timeline & Gantt Chart
+    - ✅ Quản lý khách hàng
+    - ✅ Quản lý nhân sự
+    - ✅ Quản lý tài chính
+    - ✅ Dashboard & Báo cáo (4 loại)
+    - ✅ Kết nối Google Sheets hoặc SQLite cục bộ
+    - ✅ Export CSV/Parquet/Excel (zip)
+    - ✅ Import CSV/Excel hàng loạt
+    
+    **Công nghệ:**
+    - Streamlit 1.40+
+    - Google Sheets API
+    - Plotly Charts
+    - Pandas
+    
+    **Phát triển bởi:** Beevent Team
+    
+    **Liên hệ:** support@beevent.vn
+    """)
+    
+    st.markdown("---")
+
+tenant = current_tenant()
+sheet = connect(tenant)
+
+with tab1:
+    st.subheader("🔧 Cấu hình hệ thống")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Google Sheets**")
+        st.info(f"✅ Đã kết nối: {sheet.title if sheet else 'Chưa kết nối'}")
+        
+        if st.button("🔄 Làm mới kết nối"):
+            st.cache_resource.clear()
+            st.cache_data.clear()
+            st.success("Đã làm mới!")
+            st.rerun()
+        
+        st.write("**Kho dữ liệu**")
+        repository = get_repository(sheet)
+        if isinstance(repository, SQLiteRepository):
+            st.info(f"🗄️ SQLite: `{repository.path}` (Projects, Staff, Timeline, Customers, Finance, Members)")
+            if st.button("📥 Chép dữ liệu từ Google Sheets sang SQLite"):
+                try:
+                    with st.spinner("Đang chép..."):
+                        copied = copy_tables(SheetsRepository(sheet, get_sheet_queue(sheet)), repository)
+                    for loader in SHEET_LOADERS.values():
+                        loader.clear()
+                    st.success("✅ Đã chép: " + ", ".join(f"{table} {count}" for table, count in copied.items()))
+                except Exception as e:
+                    st.error(f"❌ Lỗi chép dữ liệu: {e}")
+            
+            sync_engine = get_sync_engine(sheet)
+            if sync_engine is None:
+                st.caption("Đồng bộ với Google Sheets: tắt (`sync_with_sheets = true` trong secrets để bật)")
+            else:
+                last = (datetime.fromtimestamp(sync_engine.last_synced_at).strftime('%d/%m/%Y %H:%M:%S')
+                        if sync_engine.last_synced_at else "chưa chạy")
+                st.caption(f"🔁 Đồng bộ hai chiều với Google Sheets mỗi {sync_engine.interval:.0f}s, lần cuối: {last}")
+                if sync_engine.last_error:
+                    st.warning(f"⚠️ Lỗi đồng bộ gần nhất: {sync_engine.last_error}")
+                if st.button("🔄 Đồng bộ ngay"):
+                    try:
+                        with st.spinner("Đang đồng bộ..."):
+                            report = sync_engine.sync(force=True)
+                        for loader in SHEET_LOADERS.values():
+                            loader.clear()
+                        st.success("✅ " + ", ".join(
+                            f"{table}: ↓{c['pulled']} ↑{c['pushed']}" + (f" ⚠️{c['conflicts']} xung đột" if c['conflicts'] else "")
+                            for table, c in report.items()))
+                    except Exception as e:
+                        st.error(f"❌ Lỗi đồng bộ: {e}")
+        else:
+            st.caption("Google Sheets (đặt `storage_backend = \"sqlite\"` trong secrets để dùng SQLite cục bộ)")
+        
+        with st.expander("🛡️ Quota Google Sheets API"):
+            # Số lệnh trong 60s gần nhất so với giới hạn ([rate_limits] trong secrets)
+            from beevent.connection import connections
+            for connection in connections():
+                usage = connection.limiter.snapshot()
+                st.caption(f"🔑 {connection.service_account}")
+                for kind, label in ((READ, "Đọc"), (WRITE, "Ghi")):
+                    bucket = usage[kind]
+                    status = f"{label}: {bucket['used_last_minute']}/{bucket['capacity']:.0f} lệnh/phút | chờ {bucket['waited']:.1f}s | 429: {bucket['throttled']}"
+                    if bucket['deferred']:
+                        status += f" | nhường {bucket['deferred']} lệnh nền"
+                    if bucket['blocked_for']:
+                        status += f" | tạm chặn {bucket['blocked_for']:.0f}s"
+                    st.progress(min(1.0, bucket['used_last_minute'] / bucket['capacity']), text=status)
+            tables = get_shared_tables().stats()
+            st.caption(f"📦 Bảng dùng chung: {tables['tables']} bảng | đọc sheet {tables['fetches']} lần | "
+                       f"dùng lại {tables['hits']} | gộp {tables['coalesced']} lệnh đồng thời")
+            if st.button("🔄 Cập nhật", key="quota_refresh"):
+                st.rerun()
+    
+    with col2:
+        st.write("**Kế hoạch theo tháng (sheet Targets)**")
+        targets_df = load_targets(sheet)
+        current_year = datetime.now().year
+        plan_years = list(range(current_year - 1, current_year + 3))
+        plan_year = st.selectbox("Năm kế hoạch", plan_years, index=plan_years.index(current_year))
+        
+        if not (targets_df['Tháng'].dt.year == plan_year).any():
+            st.caption("Chưa có kế hoạch năm này, đang hiển thị KH mặc định chia đều 12 tháng.")
+        
+        plan_editor = st.data_editor(
+            to_wide(targets_df, plan_year),
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            key=f"targets_editor_{plan_year}",
+            column_config={
+                "Tháng": st.column_config.TextColumn("Tháng", help="Định dạng YYYY-MM"),
+                "Kênh": st.column_config.SelectboxColumn("Kênh", options=[ALL_CHANNELS] + CHANNELS)
+            }
+        )
+        st.caption(f"Tổng năm: DT {plan_editor['Doanh thu'].sum():,.0f}M | Lãi gộp {plan_editor['Lãi gộp'].sum():,.0f}M"
+                   if {'Doanh thu', 'Lãi gộp'} <= set(plan_editor.columns) else "")
+        
+        if st.button("💾 Lưu mục tiêu"):
+            try:
+                year_targets = from_wide(plan_editor)
+                if (year_targets['Tháng'].dt.year != plan_year).any():
+                    st.error(f"❌ Có dòng không thuộc năm {plan_year} (cột Tháng phải dạng {plan_year}-MM)")
+                else:
+                    save_targets(sheet, replace_year(targets_df, plan_year, year_targets))
+                    st.success(f"✅ Đã lưu kế hoạch {plan_year}!")
+            except Exception as e:
+                st.error(f"❌ Lỗi lưu mục tiêu: {e}")
+
+with tab2:
+    st.subheader("📤 Export/Import dữ liệu")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Export dữ liệu**")
+        
+        export_type = st.selectbox("Chọn loại dữ liệu:", ["Tất cả"] + list(EXPORT_SOURCES))
+        export_format = st.radio("Định dạng:", list(EXPORT_FORMATS), horizontal=True)
+        
+        if st.button("📥 Tạo file export"):
+            sources = EXPORT_SOURCES if export_type == "Tất cả" else {export_type: EXPORT_SOURCES[export_type]}
+            try:
+                # Đọc từ các bảng đã cache, không tải lại sheet
+                frames = {sheet_name: loader(sheet) for sheet_name, loader in sources.values()}
+                archive = export_archive(frames, EXPORT_FORMATS[export_format])
+                st.download_button(
+                    label="⬇️ Tải xuống (.zip)",
+                    data=archive,
+                    file_name=f"Beevent_{export_type}_{datetime.now().strftime('%Y%m%d')}.zip",
+                    mime="application/zip"
+                )
+            except Exception as e:
+                st.error(f"❌ Lỗi export: {e}")
+    
+    with col2:
+        st.write("**Import dữ liệu**")
+        
+        import_label = st.selectbox("Import vào:", list(IMPORT_SHEETS), key="import_type")
+        import_sheet = IMPORT_SHEETS[import_label]
+        st.caption(f"Cột bắt buộc: {', '.join(IMPORT_SCHEMAS[import_sheet]['required'])}. ID và Ngày tạo do hệ thống tự cấp.")
+        
+        uploaded_file = st.file_uploader("Chọn file CSV/Excel", type=["csv", "xlsx", "xls"], key="import_file")
+        
+        if uploaded_file is not None:
+            try:
+                valid_df, errors_df = validate_import(read_upload(uploaded_file), import_sheet)
+            except Exception as e:
+                st.error(f"❌ Lỗi đọc file: {e}")
+                valid_df = None
+            
+            if valid_df is not None:
+                st.write(f"✅ **{len(valid_df)}** dòng hợp lệ · ❌ **{errors_df['Dòng'].nunique()}** dòng lỗi")
+                
+                if len(errors_df) > 0:
+                    st.dataframe(errors_df, hide_index=True, use_container_width=True, height=200)
+                
+                if len(valid_df) > 0:
+                    st.dataframe(valid_df.head(20), hide_index=True, use_container_width=True)
+                    
+                    if st.button(f"📥 Import {len(valid_df)} dòng hợp lệ", key="import_submit"):
+                        progress_bar = st.progress(0.0, text="Đang ghi dữ liệu...")
+                        try:
+                            ids = import_records(
+                                sheet, import_sheet, valid_df,
+                                progress=lambda done, total: progress_bar.progress(done / total, text=f"Đã ghi {done}/{total} dòng")
+                            )
+                            st.success(f"✅ Đã import {len(ids)} dòng ({ids[0]} → {ids[-1]})")
+                        except Exception as e:
+                            st.error(f"❌ Lỗi import: {e}")
+
+with tab3:
+    # Chỉ cần số bản ghi: đếm bằng một lệnh đọc ưu tiên thấp thay vì tải cả ba bảng
+    record_counts = count_records(sheet, ("Projects", "Customers", "Staff"))
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("📋 Dự án", record_counts["Projects"])
+    
+    with col2:
+        st.metric("👥 Khách hàng", record_counts["Customers"])
+    
+    with col3:
+        st.metric("👨‍💼 Nhân sự", record_counts["Staff"])
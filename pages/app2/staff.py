@@ -0,0 +1,167 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from beevent_app.data import connect, current_tenant, delete_staff, load_staff, save_staff
+
+# ==================== PAGE 5: QUẢN LÝ NHÂN SỰ ====================
+st.markdown('<div class="main-header">👨‍💼 QUẢN LÝ NHÂN SỰ</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+tab1, tab2, tab3 = st.tabs(["📋 Danh sách", "➕ Thêm mới", "📊 Thống kê"])
+
+# TAB 1: Danh sách nhân sự (fragment: lọc/tìm kiếm chỉ chạy lại danh sách)
+@st.fragment
+def staff_list(sheet):
+    staff_df = load_staff(sheet)
+    
+    if len(staff_df) > 0:
+        # Filters
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            dept_filter = st.multiselect(
+                "Lọc theo phòng ban:",
+                options=staff_df['Phòng ban'].unique().tolist(),
+                default=staff_df['Phòng ban'].unique().tolist()
+            )
+        
+        with col2:
+            status_filter = st.multiselect(
+                "Lọc theo trạng thái:",
+                options=staff_df['Trạng thái'].unique().tolist(),
+                default=staff_df['Trạng thái'].unique().tolist()
+            )
+        
+        with col3:
+            search_term = st.text_input("🔍 Tìm kiếm:", placeholder="Tên, email...")
+        
+        # Apply filters
+        filtered_df = staff_df[
+            (staff_df['Phòng ban'].isin(dept_filter)) &
+            (staff_df['Trạng thái'].isin(status_filter))
+        ]
+        
+        if search_term:
+            filtered_df = filtered_df[
+                filtered_df['Họ tên'].str.contains(search_term, case=False, na=False) |
+                filtered_df['Email'].str.contains(search_term, case=False, na=False)
+            ]
+        
+        st.markdown(f"**Tìm thấy {len(filtered_df)} nhân viên**")
+        
+        # Display staff cards
+        cols = st.columns(3)
+        for idx, row in filtered_df.iterrows():
+            with cols[idx % 3]:
+                st.markdown(f"""
+                <div class="staff-card">
+                    <h3>👤 {row['Họ tên']}</h3>
+                    <p><strong>Chức vụ:</strong> {row['Chức vụ']}</p>
+                    <p><strong>Phòng ban:</strong> {row['Phòng ban']}</p>
+                    <p><strong>Email:</strong> {row['Email']}</p>
+                    <p><strong>Điện thoại:</strong> {row['Điện thoại']}</p>
+                    <p><strong>Trạng thái:</strong> {row['Trạng thái']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                if st.button("🗑️ Xóa", key=f"delete_staff_{row['ID']}"):
+                    if delete_staff(sheet, row['ID']):
+                        st.success("Đã xóa nhân viên!")
+                        st.rerun()
+    else:
+        st.info("📭 Chưa có nhân viên nào.")
+
+with tab1:
+    staff_list(sheet)
+
+# TAB 2: Thêm nhân viên
+with tab2:
+    st.subheader("➕ Thêm nhân viên mới")
+    
+    with st.form("add_staff_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ho_ten = st.text_input("Họ tên *", placeholder="Nguyễn Văn A")
+            chuc_vu = st.text_input("Chức vụ *", placeholder="Event Manager")
+            phong_ban = st.selectbox("Phòng ban *", ["Operations", "Sales", "Marketing", "Finance", "HR", "IT"])
+            email = st.text_input("Email *", placeholder="nguyenvana@beevent.vn")
+        
+        with col2:
+            dien_thoai = st.text_input("Điện thoại *", placeholder="0901234567")
+            ngay_vao = st.date_input("Ngày vào làm *")
+            luong = st.number_input("Lương (VNĐ)", min_value=0, step=1000000, format="%d")
+            trang_thai = st.selectbox("Trạng thái *", ["Đang làm", "Nghỉ phép", "Đã nghỉ việc"])
+        
+        ky_nang = st.text_input("Kỹ năng", placeholder="Event Planning, Project Management...")
+        ghi_chu = st.text_area("Ghi chú", placeholder="Thông tin bổ sung...")
+        
+        submitted = st.form_submit_button("💾 Lưu nhân viên", use_container_width=True)
+        
+        if submitted:
+            if not ho_ten or not chuc_vu or not email:
+                st.error("❌ Vui lòng điền đầy đủ thông tin bắt buộc (*)")
+            else:
+                staff_data = {
+                    "ID": "",
+                    "Họ tên": ho_ten,
+                    "Chức vụ": chuc_vu,
+                    "Phòng ban": phong_ban,
+                    "Email": email,
+                    "Điện thoại": dien_thoai,
+                    "Ngày vào": ngay_vao.strftime("%Y-%m-%d"),
+                    "Lương": luong,
+                    "Trạng thái": trang_thai,
+                    "Kỹ năng": ky_nang,
+                    "Ghi chú": ghi_chu,
+                    "Ngày tạo": ""
+                }
+                
+                if save_staff(sheet, staff_data):
+                    st.success("✅ Đã thêm nhân viên thành công!")
+                    st.balloons()
+                    st.rerun()
+
+# TAB 3: Thống kê (tiếp tục)
+with tab3:
+    staff_df = load_staff(sheet)
+    
+    if len(staff_df) > 0:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            total_staff = len(staff_df)
+            active_staff = len(staff_df[staff_df['Trạng thái'] == 'Đang làm'])
+            st.metric("👥 Tổng nhân sự", total_staff, f"{active_staff} đang làm")
+        
+        with col2:
+            if 'Lương' in staff_df.columns:
+                avg_salary = pd.to_numeric(staff_df['Lương'], errors='coerce').mean()
+                st.metric("💰 Lương TB", f"{avg_salary/1_000_000:.1f}M VNĐ")
+            else:
+                st.metric("💰 Lương TB", "N/A")
+        
+        with col3:
+            dept_count = staff_df['Phòng ban'].nunique()
+            st.metric("🏢 Số phòng ban", dept_count)
+        
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📊 Nhân sự theo phòng ban")
+            dept_dist = staff_df['Phòng ban'].value_counts()
+            fig = px.bar(x=dept_dist.index, y=dept_dist.values)
+            fig.update_layout(xaxis_title="Phòng ban", yaxis_title="Số người")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("📈 Nhân sự theo trạng thái")
+            status_dist = staff_df['Trạng thái'].value_counts()
+            fig = px.pie(values=status_dist.values, names=status_dist.index)
+            st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Chưa có dữ liệu để thống kê")
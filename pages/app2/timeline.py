@@ -0,0 +1,622 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import time
+from datetime import datetime, timedelta
+
+from beevent.capacity import daily_load, overload_alerts, staff_names
+from beevent.scheduling import (
+    DEPENDENCY_COLUMN, CycleError, format_predecessors, parse_predecessors,
+    validate_dependencies
+)
+
+from beevent_app.data import (
+    build_schedule, connect, current_tenant, load_members, load_projects, load_staff,
+    load_timeline, save_timeline, update_record
+)
+from beevent_app.style import GANTT_CSS
+
+# ==================== PAGE 3: TIMELINE DỰ ÁN (CALENDAR GANTT + CLICK BAR) ====================
+st.markdown('<div class="main-header">📅 SƠ ĐỒ GANTT</div>', unsafe_allow_html=True)
+tenant = current_tenant()
+sheet = connect(tenant)
+
+def load_scheduled_timeline(sheet):
+    """Bảng Timeline (luôn có cột Phụ thuộc) và lịch CPM tính từ nó"""
+    timeline_df = load_timeline(sheet)
+    if DEPENDENCY_COLUMN not in timeline_df.columns:
+        timeline_df = timeline_df.assign(**{DEPENDENCY_COLUMN: ""})
+    return timeline_df, build_schedule(timeline_df)
+
+# Nút trong fragment đổi state qua callback (chạy trước lần chạy lại), không cần st.rerun
+def shift_month(days):
+    st.session_state.current_month = st.session_state.current_month + timedelta(days=days)
+
+def open_task_modal(task_id):
+    st.session_state[f'show_modal_{task_id}'] = True
+
+projects_df = load_projects(sheet)
+timeline_df = load_timeline(sheet)
+members_df = load_members(sheet)
+
+tab1, tab2, tab3, tab4 = st.tabs(["📊 Gantt Chart", "➕ Thêm giai đoạn", "🧮 Critical Path", "👥 Tải nhân sự"])
+
+# Mỗi tab tương tác là một fragment tự load dữ liệu (từ cache): đổi tháng, chọn dự án, mở
+# task, lọc... chỉ chạy lại tab đó; lưu thay đổi thì chạy lại cả trang
+
+# TAB 1: CALENDAR GANTT CHART
+@st.fragment
+def gantt_calendar(sheet):
+    projects_df = load_projects(sheet)
+    members_df = load_members(sheet)
+    timeline_df, schedule = load_scheduled_timeline(sheet)
+    schedule_df = schedule.to_frame()
+    late_task_ids = set(schedule_df.loc[schedule_df['Trễ hạn'], 'ID'])
+
+    if len(projects_df) > 0:
+        # Month navigation
+        col1, col2, col3 = st.columns([1, 3, 1])
+        
+        with col1:
+            if 'current_month' not in st.session_state:
+                st.session_state.current_month = datetime.now()
+            
+            st.button("◀️ Tháng trước", use_container_width=True, on_click=shift_month, args=(-30,))
+        
+        with col2:
+            current_month = st.session_state.current_month
+            st.markdown(f"<h3 style='text-align: center;'>📅 Tháng {current_month.month} năm {current_month.year}</h3>", unsafe_allow_html=True)
+        
+        with col3:
+            st.button("Tháng sau ▶️", use_container_width=True, on_click=shift_month, args=(30,))
+        
+        # Project filter
+        col1, col2 = st.columns([4, 1])
+        
+        with col1:
+            selected_project = st.selectbox(
+                "Chọn dự án:",
+                options=['Tất cả'] + projects_df['ID'].tolist(),
+                format_func=lambda x: f"Tất cả dự án" if x == 'Tất cả' else f"{x} - {projects_df[projects_df['ID']==x]['Tên dự án'].values[0]}"
+            )
+        
+        with col2:
+            st.text("")
+            st.text("")
+            st.button("🔄 Làm mới", use_container_width=True)
+        
+        st.markdown("---")
+        
+        # Filter timeline
+        if selected_project == 'Tất cả':
+            filtered_timeline = timeline_df
+        else:
+            filtered_timeline = timeline_df[timeline_df['Project_ID'] == selected_project]
+        
+        if len(filtered_timeline) > 0:
+            # Convert dates (cột mới, bảng dùng chung không bị sửa)
+            filtered_timeline = filtered_timeline.assign(**{
+                'Ngày bắt đầu': pd.to_datetime(filtered_timeline['Ngày bắt đầu'], errors='coerce'),
+                'Ngày kết thúc': pd.to_datetime(filtered_timeline['Ngày kết thúc'], errors='coerce'),
+            })
+            
+            # Filter by current month
+            month_start = current_month.replace(day=1)
+            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            
+            # Get tasks that overlap with current month
+            month_timeline = filtered_timeline[
+                (filtered_timeline['Ngày bắt đầu'] <= month_end) &
+                (filtered_timeline['Ngày kết thúc'] >= month_start)
+            ]
+            
+            # Generate calendar days
+            days_in_month = (month_end - month_start).days + 1
+            calendar_days = [month_start + timedelta(days=i) for i in range(days_in_month)]
+            
+            # ============ PHẦN 1: CALENDAR GANTT VISUAL (HTML) ============
+            st.markdown("### 📅 Biểu đồ Gantt Calendar")
+            
+            # Start HTML
+            calendar_html = GANTT_CSS + f"""
+            <div class="gantt-container" style="--gantt-days: {days_in_month};">
+                <!-- Header -->
+                <div class="gantt-header">
+                    <div class="gantt-header-cell" style="text-align: left; padding-left: 16px;"><b>Tên task</b></div>
+            """
+            
+            # Add day headers
+            for day in calendar_days:
+                weekend_class = "weekend" if day.weekday() >= 5 else ""
+                day_name = ["Th 2", "Th 3", "Th 4", "Th 5", "Th 6", "Th 7", "CN"][day.weekday()]
+                calendar_html += f"""
+                    <div class="gantt-header-cell {weekend_class}">
+                        <div><b>{day.day}</b></div>
+                        <div style="font-size: 9px; color: #666;">{day_name}</div>
+                    </div>
+                """
+            
+            calendar_html += "</div>"
+            
+            # Add task rows
+            for idx, task in month_timeline.iterrows():
+                task_name = task['Giai đoạn']
+                task_status = task['Trạng thái']
+                task_progress = task['Tiến độ %']
+                task_person = task['Phụ trách']
+                task_priority = task.get('Độ ưu tiên', 'Trung bình')
+                
+                status_class = {
+                    'Chưa bắt đầu': 'status-chua-bat-dau',
+                    'Đang thực hiện': 'status-dang-thuc-hien',
+                    'Hoàn thành': 'status-hoan-thanh',
+                    'Trễ hạn': 'status-tre-han'
+                }.get(task_status, 'status-chua-bat-dau')
+                
+                # Trễ hạn do engine tính (dời bởi task trước hoặc quá hạn chưa xong)
+                if str(task['ID']) in late_task_ids:
+                    status_class = 'status-tre-han'
+                
+                priority_emoji = {'Cao': '🔴', 'Trung bình': '🟡', 'Thấp': '🟢'}.get(task_priority, '⚪')
+                
+                calendar_html += f"""
+                <div class="gantt-row">
+                    <div class="gantt-task-name">
+                        <div>
+                            <div><b>{task_name}</b> {priority_emoji}</div>
+                            <div style="font-size: 10px; color: #666;">{task_person} - {task_status}</div>
+                        </div>
+                    </div>
+                """
+                
+                # Calculate bar position
+                task_start = max(task['Ngày bắt đầu'], month_start)
+                task_end = min(task['Ngày kết thúc'], month_end)
+                
+                start_col = (task_start - month_start).days
+                duration = (task_end - task_start).days + 1
+                
+                # Add cells
+                for i, day in enumerate(calendar_days):
+                    weekend_class = "weekend" if day.weekday() >= 5 else ""
+                    
+                    if i == start_col:
+                        bar_width = duration * 40 - 4
+                        calendar_html += f"""
+                            <div class="gantt-cell {weekend_class}">
+                                <div class="gantt-bar {status_class}" 
+                                     style="width: {bar_width}px; left: 2px;"
+                                     title="{task_name} ({task_start.strftime('%d/%m')} - {task_end.strftime('%d/%m')})">
+                                    {task_progress}%
+                                </div>
+                            </div>
+                        """
+                    elif start_col < i < start_col + duration:
+                        calendar_html += f'<div class="gantt-cell {weekend_class}"></div>'
+                    else:
+                        calendar_html += f'<div class="gantt-cell {weekend_class}"></div>'
+                
+                calendar_html += "</div>"
+            
+            calendar_html += "</div>"
+            
+            # Display calendar
+            st.components.v1.html(calendar_html, height=max(400, len(month_timeline) * 60 + 100), scrolling=True)
+            
+            # Legend
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.markdown("🔴 **Chưa bắt đầu**")
+            with col2:
+                st.markdown("🟢 **Đang thực hiện**")
+            with col3:
+                st.markdown("🔵 **Hoàn thành**")
+            with col4:
+                st.markdown("⚠️ **Trễ hạn**")
+            
+            st.markdown("---")
+            
+            # ============ PHẦN 2: CLICKABLE TASK LIST ============
+            st.markdown("### 📋 Danh sách Task (Click để chỉnh sửa)")
+            
+            # Create task list for buttons
+            task_list = []
+            for idx, task in month_timeline.iterrows():
+                task_list.append({
+                    'id': task['ID'],
+                    'name': task['Giai đoạn'],
+                    'status': task['Trạng thái'],
+                    'progress': task['Tiến độ %'],
+                    'person': task['Phụ trách'],
+                    'priority': task.get('Độ ưu tiên', 'Trung bình'),
+                    'start': task['Ngày bắt đầu'],
+                    'end': task['Ngày kết thúc'],
+                    'desc': task.get('Mô tả', ''),
+                    'note': task.get('Ghi chú', ''),
+                    'project': task['Project_ID'],
+                    'preds': parse_predecessors(task.get(DEPENDENCY_COLUMN, ''))
+                })
+            
+            # Create clickable task rows
+            for task_info in task_list:
+                task_id = task_info['id']
+                task_name = task_info['name']
+                task_status = task_info['status']
+                task_progress = task_info['progress']
+                task_person = task_info['person']
+                task_priority = task_info['priority']
+                task_start = task_info['start']
+                task_end = task_info['end']
+                
+                # Priority emoji
+                priority_emoji = {'Cao': '🔴', 'Trung bình': '🟡', 'Thấp': '🟢'}.get(task_priority, '⚪')
+                
+                # Create clickable button
+                col1, col2 = st.columns([4, 1])
+                
+                with col1:
+                    st.markdown(f"{priority_emoji} **{task_name}**")
+                    st.caption(f"{task_person} - {task_status}")
+                
+                with col2:
+                    st.button(
+                        f"📊 {task_progress}% | {task_start.strftime('%d/%m')} → {task_end.strftime('%d/%m')}",
+                        key=f"task_btn_{task_id}",
+                        use_container_width=True,
+                        on_click=open_task_modal, args=(task_id,)
+                    )
+                
+                st.markdown("---")
+            
+            # ============ PHẦN 3: POPUP MODAL CHỈNH SỬA ============
+            for task_info in task_list:
+                task_id = task_info['id']
+                
+                # Check if modal should be shown
+                if st.session_state.get(f'show_modal_{task_id}', False):
+                    # Create modal using dialog
+                    @st.dialog(f"✏️ Chỉnh sửa Task: {task_info['name']}")
+                    def edit_task_modal():
+                        with st.form(f"modal_form_{task_id}"):
+                            st.markdown("### 📝 Thông tin cơ bản")
+                            
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                new_name = st.text_input("Tên task", value=task_info['name'])
+                                new_start = st.date_input("Ngày bắt đầu", value=task_info['start'])
+                                new_status = st.selectbox(
+                                    "Trạng thái",
+                                    ["Chưa bắt đầu", "Đang thực hiện", "Hoàn thành", "Trễ hạn"],
+                                    index=["Chưa bắt đầu", "Đang thực hiện", "Hoàn thành", "Trễ hạn"].index(task_info['status'])
+                                )
+                            
+                            with col2:
+                                # Load danh sách nhân sự
+                                if len(members_df) > 0:
+                                    member_names = members_df['Họ và tên'].tolist()
+                                    current_person_idx = member_names.index(task_info['person']) if task_info['person'] in member_names else 0
+                                    new_person = st.selectbox("Phụ trách", member_names, index=current_person_idx)
+                                else:
+                                    new_person = st.text_input("Phụ trách", value=task_info['person'])
+                                
+                                new_end = st.date_input("Ngày kết thúc", value=task_info['end'])
+                                new_priority = st.selectbox(
+                                    "Độ ưu tiên",
+                                    ["Cao", "Trung bình", "Thấp"],
+                                    index=["Cao", "Trung bình", "Thấp"].index(task_info['priority'])
+                                )
+                            
+                            project_tasks = timeline_df[
+                                (timeline_df['Project_ID'] == task_info['project']) &
+                                (timeline_df['ID'] != task_id)
+                            ]
+                            pred_options = project_tasks['ID'].astype(str).tolist()
+                            new_preds = st.multiselect(
+                                "Phụ thuộc (task phải xong trước)",
+                                options=pred_options,
+                                default=[p for p in task_info['preds'] if p in pred_options],
+                                format_func=lambda x: f"{x} - {project_tasks[project_tasks['ID'].astype(str) == x]['Giai đoạn'].values[0]}"
+                            )
+                            
+                            new_progress = st.slider("Tiến độ (%)", 0, 100, int(task_info['progress']))
+                            new_desc = st.text_area("Mô tả", value=task_info['desc'], height=100)
+                            new_note = st.text_area("Ghi chú cập nhật", placeholder="Thêm ghi chú về thay đổi...")
+                            
+                            st.markdown("---")
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                submit = st.form_submit_button("💾 Lưu thay đổi", use_container_width=True, type="primary")
+                            
+                            with col2:
+                                cancel = st.form_submit_button("❌ Hủy", use_container_width=True)
+                            
+                            if submit:
+                                if not new_name or not new_person:
+                                    st.error("❌ Vui lòng điền đầy đủ thông tin!")
+                                elif new_end < new_start:
+                                    st.error("❌ Ngày kết thúc phải sau ngày bắt đầu!")
+                                else:
+                                    try:
+                                        validate_dependencies(timeline_df, task_id, task_info['project'], new_preds)
+                                        # Ghi chú cộng dồn lên ghi chú hiện tại của công việc
+                                        current_note = str(timeline_df.loc[timeline_df['ID'] == task_id, 'Ghi chú'].iloc[0]) if 'Ghi chú' in timeline_df.columns else ""
+                                        updated_note = f"{current_note}\n[{datetime.now().strftime('%d/%m/%Y %H:%M')}] {new_note}" if new_note else current_note
+                                        update_record(sheet, "Timeline", task_id, {
+                                            "Giai đoạn": new_name,
+                                            "Mô tả": new_desc,
+                                            "Ngày bắt đầu": new_start.strftime("%Y-%m-%d"),
+                                            "Ngày kết thúc": new_end.strftime("%Y-%m-%d"),
+                                            "Phụ trách": new_person,
+                                            "Trạng thái": new_status,
+                                            "Tiến độ %": new_progress,
+                                            "Độ ưu tiên": new_priority,
+                                            "Ghi chú": updated_note,
+                                            DEPENDENCY_COLUMN: format_predecessors(new_preds),
+                                        }, f"Sửa công việc {task_id}")
+                                        
+                                        st.success("✅ Đã lưu, đang đồng bộ lên Google Sheets...")
+                                        st.session_state[f'show_modal_{task_id}'] = False
+                                        time.sleep(1)
+                                        st.rerun()
+                                    except (CycleError, ValueError) as e:
+                                        st.error(f"❌ Phụ thuộc không hợp lệ: {e}")
+                                    except Exception as e:
+                                        st.error(f"❌ Lỗi: {str(e)}")
+                            
+                            if cancel:
+                                st.session_state[f'show_modal_{task_id}'] = False
+                                st.rerun()
+                    
+                    # Show modal
+                    edit_task_modal()
+            
+            # Summary
+            st.markdown("---")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("📋 Tổng task", len(month_timeline))
+            with col2:
+                completed = len(month_timeline[month_timeline['Trạng thái'] == 'Hoàn thành'])
+                st.metric("✅ Hoàn thành", completed)
+            with col3:
+                in_progress = len(month_timeline[month_timeline['Trạng thái'] == 'Đang thực hiện'])
+                st.metric("▶️ Đang làm", in_progress)
+            with col4:
+                avg_progress = month_timeline['Tiến độ %'].mean()
+                st.metric("📊 Tiến độ TB", f"{avg_progress:.0f}%")
+            
+        else:
+            st.info("📭 Không có task nào trong tháng này.")
+    else:
+        st.warning("⚠️ Chưa có dự án nào. Vui lòng tạo dự án trước!")
+
+with tab1:
+    gantt_calendar(sheet)
+
+# TAB 2: Thêm giai đoạn 
+with tab2:
+    if len(projects_df) > 0:
+        st.subheader("➕ Thêm task/giai đoạn mới")
+        
+        # Chọn dự án ngoài form để danh sách phụ thuộc lọc ngay theo dự án
+        project_id = st.selectbox(
+            "Chọn dự án *",
+            options=projects_df['ID'].tolist(),
+            format_func=lambda x: f"{x} - {projects_df[projects_df['ID']==x]['Tên dự án'].values[0]}",
+            key="add_timeline_project"
+        )
+        project_tasks = timeline_df[timeline_df['Project_ID'] == project_id] if len(timeline_df) > 0 else timeline_df
+        
+        with st.form("add_timeline_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                giai_doan = st.text_input("Tên task *", placeholder="Ví dụ: Khảo sát địa điểm")
+                mo_ta = st.text_area("Mô tả", placeholder="Mô tả chi tiết công việc...")
+                ngay_bat_dau = st.date_input("Ngày bắt đầu *")
+                
+                if len(members_df) > 0:
+                    member_names = members_df['Họ và tên'].tolist()
+                    phu_trach = st.selectbox("Phụ trách *", member_names)
+                else:
+                    phu_trach = st.text_input("Phụ trách *", placeholder="Nguyễn Văn A")
+                    st.info("💡 Chưa có nhân sự nào. Vui lòng thêm nhân sự ở trang Quản lý nhân sự!")
+            
+            with col2:
+                ngay_ket_thuc = st.date_input("Ngày kết thúc *")
+                trang_thai = st.selectbox("Trạng thái *", ["Chưa bắt đầu", "Đang thực hiện", "Hoàn thành", "Trễ hạn"])
+                tien_do = st.slider("Tiến độ (%)", 0, 100, 0)
+                do_uu_tien = st.selectbox("Độ ưu tiên", ["Cao", "Trung bình", "Thấp"])
+            
+            phu_thuoc = st.multiselect(
+                "Phụ thuộc (task phải xong trước, cùng dự án)",
+                options=project_tasks['ID'].astype(str).tolist(),
+                format_func=lambda x: f"{x} - {project_tasks[project_tasks['ID'].astype(str) == x]['Giai đoạn'].values[0]}"
+            )
+            
+            ghi_chu = st.text_input("Ghi chú", placeholder="Thông tin bổ sung...")
+            
+            submitted = st.form_submit_button("💾 Lưu task", use_container_width=True)
+            
+            if submitted:
+                if not giai_doan or not phu_trach:
+                    st.error("❌ Vui lòng điền đầy đủ thông tin bắt buộc (*)")
+                elif ngay_ket_thuc < ngay_bat_dau:
+                    st.error("❌ Ngày kết thúc phải sau ngày bắt đầu!")
+                elif any(p not in set(project_tasks['ID'].astype(str)) for p in phu_thuoc):
+                    st.error("❌ Task phụ thuộc phải thuộc cùng dự án!")
+                else:
+                    timeline_data = {
+                        "ID": "",
+                        "Project_ID": project_id,
+                        "Giai đoạn": giai_doan,
+                        "Mô tả": mo_ta,
+                        "Ngày bắt đầu": ngay_bat_dau.strftime("%Y-%m-%d"),
+                        "Ngày kết thúc": ngay_ket_thuc.strftime("%Y-%m-%d"),
+                        "Phụ trách": phu_trach,
+                        "Trạng thái": trang_thai,
+                        "Tiến độ %": tien_do,
+                        "Độ ưu tiên": do_uu_tien,
+                        "Ghi chú": ghi_chu,
+                        "Ngày tạo": "",
+                        "Phụ thuộc": format_predecessors(phu_thuoc)
+                    }
+                    
+                    if save_timeline(sheet, timeline_data):
+                        st.success("✅ Đã thêm task thành công!")
+                        st.balloons()
+                        time.sleep(1)
+                        st.rerun()
+    else:
+        st.warning("⚠️ Chưa có dự án nào. Vui lòng tạo dự án trước!")
+
+# TAB 3: Critical Path
+@st.fragment
+def critical_path_view(sheet):
+    projects_df = load_projects(sheet)
+    timeline_df, schedule = load_scheduled_timeline(sheet)
+
+    for message in schedule.errors.values():
+        st.error(f"❌ {message}")
+
+    missing = schedule.missing_dependencies()
+    if missing:
+        st.warning("⚠️ Phụ thuộc không tìm thấy trong cùng dự án: " + ", ".join(f"{t} → {p}" for t, p in missing))
+
+    if len(schedule.projects) > 0:
+        project_names = dict(zip(projects_df['ID'], projects_df['Tên dự án'])) if len(projects_df) > 0 else {}
+        cpm_project = st.selectbox(
+            "Chọn dự án:",
+            options=list(schedule.projects.keys()),
+            format_func=lambda x: f"{x} - {project_names.get(x, '')}",
+            key="cpm_project"
+        )
+
+        task_names = timeline_df[['ID', 'Giai đoạn', 'Phụ trách']].astype({'ID': str})
+        cpm_df = schedule.to_frame(cpm_project).merge(task_names, on='ID', how='left')
+        critical_path = schedule.critical_path(cpm_project)
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("🏁 Ngày kết thúc dự kiến", schedule.projects[cpm_project].finish_date().strftime('%d/%m/%Y'))
+        with col2:
+            st.metric("🔴 Task critical", len(critical_path))
+        with col3:
+            st.metric("⚠️ Task trễ hạn", int(cpm_df['Trễ hạn'].sum()))
+
+        st.info("🧭 **Critical path:** " + " → ".join(critical_path))
+
+        chart_df = cpm_df.assign(Kết_thúc=cpm_df['EF'] + pd.Timedelta(days=1))
+        fig = px.timeline(
+            chart_df, x_start='ES', x_end='Kết_thúc', y='Giai đoạn',
+            color='Critical', color_discrete_map={True: '#d62728', False: '#1f77b4'},
+            hover_data=['ID', 'Phụ trách', 'Slack (ngày)']
+        )
+        fig.update_yaxes(autorange="reversed")
+        fig.update_layout(height=max(300, len(chart_df) * 35 + 100))
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(
+            cpm_df[['ID', 'Giai đoạn', 'Phụ trách', 'Thời lượng (ngày)', 'ES', 'EF', 'LS', 'LF', 'Slack (ngày)', 'Critical', 'Trễ hạn']],
+            hide_index=True, use_container_width=True
+        )
+
+        # Mô phỏng: dời một task và xem thay đổi lan truyền
+        st.markdown("### 🔀 Mô phỏng dời task")
+        with st.form("cpm_move_form"):
+            move_task_id = st.selectbox(
+                "Task:",
+                options=cpm_df['ID'].tolist(),
+                format_func=lambda x: f"{x} - {cpm_df[cpm_df['ID'] == x]['Giai đoạn'].values[0]}"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                move_start = st.date_input("Ngày bắt đầu mới")
+            with col2:
+                move_end = st.date_input("Ngày kết thúc mới")
+            simulate = st.form_submit_button("▶️ Tính lại lịch", use_container_width=True)
+
+        if simulate:
+            if move_end < move_start:
+                st.error("❌ Ngày kết thúc phải sau ngày bắt đầu!")
+            else:
+                old_finish = schedule.projects[cpm_project].finish_date()
+                changed = schedule.move_task(move_task_id, move_start, move_end)
+                new_finish = schedule.projects[cpm_project].finish_date()
+                st.info(f"📌 {len(changed)} task bị ảnh hưởng | Kết thúc dự án: {old_finish.strftime('%d/%m/%Y')} → {new_finish.strftime('%d/%m/%Y')}")
+                if changed:
+                    simulated_df = schedule.to_frame(cpm_project).merge(task_names, on='ID', how='left')
+                    st.dataframe(
+                        simulated_df[simulated_df['ID'].isin(changed)][['ID', 'Giai đoạn', 'ES', 'EF', 'Slack (ngày)', 'Critical']],
+                        hide_index=True, use_container_width=True
+                    )
+    else:
+        st.info("📭 Chưa có task nào để lập lịch.")
+
+with tab3:
+    critical_path_view(sheet)
+
+# TAB 4: Tải nhân sự (heatmap số task đồng thời mỗi người mỗi ngày)
+@st.fragment
+def staff_load_view(sheet):
+    timeline_df = load_timeline(sheet)
+    members_df = load_members(sheet)
+    staff_df = load_staff(sheet)
+
+    if len(timeline_df) > 0:
+        col1, col2, col3 = st.columns([2, 1, 1])
+
+        with col1:
+            today = datetime.now().date()
+            load_range = st.date_input(
+                "Khoảng thời gian:",
+                value=(today.replace(day=1), today.replace(day=1) + timedelta(days=89)),
+                key="load_range"
+            )
+        with col2:
+            capacity = st.number_input("Ngưỡng quá tải (task/ngày)", min_value=1, value=3, step=1)
+        with col3:
+            st.text("")
+            only_busy = st.checkbox("Chỉ hiện người có task", value=True)
+            include_done = st.checkbox("Tính cả task đã xong", value=False)
+
+        if isinstance(load_range, (list, tuple)) and len(load_range) == 2:
+            load_df = daily_load(
+                timeline_df, load_range[0], load_range[1],
+                people=staff_names(members_df, staff_df), include_done=include_done
+            )
+            if only_busy:
+                load_df = load_df[load_df.to_numpy().any(axis=1)]
+
+            alerts = overload_alerts(load_df, capacity)
+            if len(alerts) > 0:
+                st.warning(f"⚠️ {len(alerts)} người vượt {capacity} task/ngày trong khoảng đã chọn")
+                st.dataframe(alerts, hide_index=True, use_container_width=True)
+            else:
+                st.success("✅ Không có ai quá tải trong khoảng đã chọn")
+
+            if len(load_df) > 0:
+                fig = go.Figure(go.Heatmap(
+                    z=load_df.to_numpy(),
+                    x=load_df.columns,
+                    y=load_df.index,
+                    colorscale=[[0, '#f8f9fa'], [0.5, '#ffd43b'], [1, '#ff0000']],
+                    zmin=0,
+                    zmax=max(capacity + 1, int(load_df.to_numpy().max())),
+                    hovertemplate="%{y}<br>%{x|%d/%m/%Y}: %{z} task<extra></extra>"
+                ))
+                fig.update_layout(height=max(300, len(load_df) * 25 + 120), yaxis_autorange="reversed")
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("📭 Không có task nào trong khoảng đã chọn.")
+        else:
+            st.info("💡 Chọn ngày bắt đầu và ngày kết thúc.")
+    else:
+        st.info("📭 Chưa có task nào.")
+
+with tab4:
+    staff_load_view(sheet)